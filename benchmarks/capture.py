@@ -0,0 +1,101 @@
+""" capture.py
+
+Measures the latency the capture recorder adds to the UART send and receive path.
+Reports the cost of CaptureRecorder.record() for a single frame and for a full
+read chunk, and the time of UartHelper.send() over a pty with and without capture.
+
+Linux only, run from the repository root:
+    python -m benchmarks.capture
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import os
+import tty
+import time
+import tempfile
+from moduls.captureRecorder import CaptureRecorder, DIRECTION_RX
+from moduls.uartHelper import UartHelper
+from moduls.uartDefines import UART_Message, MSG_Type, MSG_INDEX_PARAM
+from moduls.dataClasses import UARTSignals
+
+
+def _percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    return f"mean {mean:8.0f} ns  p50 {p50:8.0f} ns  p99 {p99:8.0f} ns"
+
+
+def benchRecord(path: str, chunkSize: int, count: int = 100000) -> str:
+    """Measures the time of CaptureRecorder.record() per chunk.
+
+    Args:
+        path (str): The path of the capture file.
+        chunkSize (int): The size of every chunk in bytes.
+        count (int): The number of chunks.
+
+    Returns:
+        str: The formatted latency statistics.
+    """
+    recorder = CaptureRecorder(path, size=count * (chunkSize + 16) + 1024)
+    data = bytes(chunkSize)
+    samples = []
+    perf = time.perf_counter_ns
+    for _ in range(count):
+        start = perf()
+        recorder.record(DIRECTION_RX, data)
+        samples.append(perf() - start)
+    recorder.close()
+    return _percentiles(samples)
+
+
+def benchSend(path: str, capture: bool, count: int = 20000) -> str:
+    """Measures the time of UartHelper.send() over a pty.
+
+    Args:
+        path (str): The path of the capture file.
+        capture (bool): Record the sent frames.
+        count (int): The number of frames.
+
+    Returns:
+        str: The formatted latency statistics.
+    """
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    os.set_blocking(master, False)
+    uart = UartHelper(UARTSignals())
+    uart.ser.port = os.ttyname(slave)
+    uart.ser.open()
+    if capture:
+        uart.startCapture(path)
+    message = UART_Message(type=MSG_Type.READ_REQUEST, index=MSG_INDEX_PARAM.VALUE_RPM)
+    samples = []
+    perf = time.perf_counter_ns
+    for i in range(count):
+        start = perf()
+        uart.send(message)
+        samples.append(perf() - start)
+        if i % 64 == 0:
+            try:
+                os.read(master, 65536)
+            except BlockingIOError:
+                pass
+    uart.stopCapture()
+    uart.ser.close()
+    os.close(master)
+    os.close(slave)
+    return _percentiles(samples)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.bldccap")
+        print(f"record   7 B : {benchRecord(path, 7)}")
+        print(f"record 700 B : {benchRecord(path, 700)}")
+        print(f"send  no capture: {benchSend(path, False)}")
+        print(f"send  capture   : {benchSend(path, True)}")
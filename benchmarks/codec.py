@@ -0,0 +1,72 @@
+""" codec.py
+
+Microbenchmark for the UART message codec.
+Measures how many frames per second UART_Message_Frame can decode (including
+validation and payload access) and encode.
+
+Run from the repository root:
+    python -m benchmarks.codec
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import time
+from moduls.uartDefines import UART_Message, UART_Message_Frame, MSG_Type, MSG_INDEX_PARAM
+
+
+def _frames(count: int) -> list:
+    indices = list(MSG_INDEX_PARAM)
+    ret = []
+    for i in range(count):
+        frame = UART_Message_Frame()
+        frame.message = UART_Message(type=MSG_Type.RESPONSE, index=indices[i % len(indices)], payload=(i % 65536) - 32768)
+        ret.append(frame.encode())
+    return ret
+
+
+def benchDecode(frames: list) -> float:
+    """Decodes, validates and reads the payload of every frame.
+
+    Args:
+        frames (list): The encoded frames.
+
+    Returns:
+        float: The decoded frames per second.
+    """
+    frame = UART_Message_Frame()
+    frame.message = UART_Message()
+    start = time.perf_counter()
+    for data in frames:
+        frame.decode(data)
+        if frame.isValide():
+            frame.message.getPayloadSigned()
+            frame.message.getPayloadUnsigned()
+    return len(frames) / (time.perf_counter() - start)
+
+
+def benchEncode(count: int) -> float:
+    """Builds and encodes READ_REQUEST frames like UartHelper.send does.
+
+    Args:
+        count (int): The number of frames to encode.
+
+    Returns:
+        float: The encoded frames per second.
+    """
+    indices = list(MSG_INDEX_PARAM)
+    start = time.perf_counter()
+    for i in range(count):
+        frame = UART_Message_Frame()
+        frame.message = UART_Message(type=MSG_Type.READ_REQUEST, index=indices[i % len(indices)])
+        frame.encode()
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = 200000
+    frames = _frames(count)
+    print(f"decode: {max(benchDecode(frames) for _ in range(7)):12,.0f} frames/s")
+    print(f"encode: {max(benchEncode(count) for _ in range(7)):12,.0f} frames/s")
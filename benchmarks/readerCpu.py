@@ -0,0 +1,84 @@
+""" readerCpu.py
+
+Measures the CPU load of the UART reader thread against a pty loopback.
+The script compares the polling reader with the blocking reader, once with
+an idle line and once with a response frame every 15 ms.
+
+Linux only, run from the repository root:
+    python -m benchmarks.readerCpu
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import os
+import tty
+import time
+import threading
+from moduls.uartHelper import UartHelper
+from moduls.uartDefines import UART_Message, UART_Message_Frame, MSG_Type, MSG_INDEX_PARAM
+from moduls.dataClasses import UARTSignals
+
+
+def _responseFrame() -> bytes:
+    frame = UART_Message_Frame()
+    frame.message = UART_Message(type=MSG_Type.RESPONSE, index=MSG_INDEX_PARAM.VALUE_RPM, payload=1234)
+    return frame.encode()
+
+
+def measure(blockingRead: bool, interval: float | None, duration: float = 3.0) -> tuple:
+    """Measures the process CPU time while the reader is running.
+
+    Args:
+        blockingRead (bool): Use the blocking reader instead of polling.
+        interval (float | None): Seconds between two frames, None for an idle line.
+        duration (float): The measurement time in seconds.
+
+    Returns:
+        tuple: The CPU load in percent of one core and the number of received frames.
+    """
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    os.set_blocking(master, False)
+    uart = UartHelper(UARTSignals(), blockingRead=blockingRead)
+    uart.connect(os.ttyname(slave))
+    running = True
+
+    def _mcu():
+        # drain the requests and send responses like the MCU would
+        frame = _responseFrame()
+        nextSend = time.monotonic()
+        while running:
+            try:
+                os.read(master, 4096)
+            except BlockingIOError:
+                pass
+            if interval is not None and time.monotonic() >= nextSend:
+                os.write(master, frame)
+                nextSend += interval
+            time.sleep(interval / 4 if interval else 0.05)
+
+    mcu = threading.Thread(target=_mcu, daemon=True)
+    mcu.start()
+    uart.message_stack.clear()
+    cpuStart, wallStart = time.process_time(), time.monotonic()
+    time.sleep(duration)
+    cpu, wall = time.process_time() - cpuStart, time.monotonic() - wallStart
+    received = len(uart.message_stack)
+    running = False
+    mcu.join()
+    uart.disconnect()
+    os.close(master)
+    os.close(slave)
+    return 100.0 * cpu / wall, received
+
+
+if __name__ == "__main__":
+    for interval in (None, 15e-3):
+        for blockingRead in (False, True):
+            load, received = measure(blockingRead, interval)
+            mode = "blocking" if blockingRead else "polling"
+            line = "idle" if interval is None else f"{interval * 1e3:.0f} ms"
+            print(f"{mode:<9} {line:<6} CPU: {load:6.1f} %  frames: {received}")
@@ -0,0 +1,329 @@
+""" suite.py
+
+Headless end-to-end benchmark suite for the receive pipeline.
+
+The input is either a live session against the pty MCU simulator (which is
+captured and then reused for the offline stages) or a recorded capture file.
+Every stage is measured separately:
+    decodeFrame  UART_Message_Frame.decode() + isValide() per frame
+    decodeBatch  the _read_from_port core: RingBuffer + FrameDecoder
+    queue        hand-off through the message_stack
+    dispatch     App.readUART() + SignalTable.applyMessages()
+    gui          GuiHelper.abentToPlot() + _updateInfoTable()
+    live         the connected UartHelper, incl. request -> response latency
+
+Results are written as JSON and can be compared against an older result file.
+
+Run from the repository root:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --capture lab.bldccap --baseline results.json
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import logging
+from moduls.app import App, __version__ as appVersion
+from moduls.uartHelper import UartHelper
+from moduls.uartDefines import UART_Message_Frame, MSG_Type
+from moduls.dataClasses import UARTSignals
+from moduls.frameDecoder import FrameDecoder, FRAME_SIZE
+from moduls.ringBuffer import RingBuffer
+from moduls.messageQueue import MessageQueue
+from moduls.captureRecorder import readCapture, DIRECTION_RX
+from moduls.replayTransport import ReplaySerial
+from moduls.mcuSimulator import McuSimulator
+
+# metrics where a higher value is better, used for the regression check
+_THROUGHPUT_KEYS = ("framesPerSecond", "updatesPerSecond")
+
+
+def _measure(function, unit: str = "frames", repeat: int = 5) -> dict:
+    """Runs function several times and measures wall and CPU time of the fastest run.
+
+    Args:
+        function (callable): The work to measure, returns the number of processed items.
+        unit (str): The name of the processed items.
+        repeat (int): The number of runs.
+
+    Returns:
+        dict: The stage result.
+    """
+    runs = []
+    for _ in range(repeat):
+        cpuStart, wallStart = time.process_time(), time.perf_counter()
+        count = function()
+        runs.append((time.perf_counter() - wallStart, time.process_time() - cpuStart))
+    wall, cpu = min(runs)
+    key = "framesPerSecond" if unit == "frames" else "updatesPerSecond"
+    return {unit: count,
+            "seconds": wall,
+            key: count / wall if wall > 0 else 0.0,
+            "cpuSeconds": cpu,
+            "cpuPerItemUs": cpu / count * 1e6 if count else 0.0}
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def stageDecodeFrame(chunks: list) -> dict:
+    """Decodes every valid frame one by one like the original reader did.
+    """
+    stream = b"".join(chunks)
+    offsets = FrameDecoder().decode(stream).offsets.tolist()
+    frame = UART_Message_Frame()
+
+    def run():
+        for offset in offsets:
+            frame.decode(stream[offset:offset + FRAME_SIZE])
+            frame.isValide()
+        return len(offsets)
+    return _measure(run)
+
+
+def stageDecodeBatch(chunks: list) -> tuple:
+    """Feeds the received chunks through RingBuffer and FrameDecoder like _read_from_port.
+
+    Returns:
+        tuple: The stage result and the decoded messages per chunk.
+    """
+    batches = []
+
+    def run():
+        batches.clear()
+        ring = RingBuffer()
+        decoder = FrameDecoder()
+        count = 0
+        for chunk in chunks:
+            ring.write(chunk)
+            if len(ring) < FRAME_SIZE:
+                continue
+            frames = decoder.decode(ring.data())
+            ring.consume(frames.consumed, frames.discarded)
+            batches.append(frames.messages(time.time_ns()))
+            count += len(frames)
+        return count
+    return _measure(run), batches
+
+
+def stageQueue(batches: list) -> dict:
+    """Puts the decoded batches into the message queue and drains it.
+    """
+    count = sum(len(batch) for batch in batches)
+    queue = MessageQueue(maxSize=count + 1)
+
+    def run():
+        received = 0
+        for i, batch in enumerate(batches):
+            queue.putMany(batch)
+            if i % 4 == 3:
+                received += len(queue.getMessages())
+        return received + len(queue.getMessages())
+    return _measure(run)
+
+
+def stageDispatch(app: App, batches: list) -> dict:
+    """Dispatches the decoded messages through App.readUART.
+    """
+    putMany = app.uart.message_stack.putMany
+    readUART = app.readUART
+
+    def run():
+        for batch in batches:
+            putMany(batch)
+            readUART()
+        return sum(len(batch) for batch in batches)
+    return _measure(run)
+
+
+def stageGui(app: App, updates: int = 2000) -> dict:
+    """Prepares the plot and info table data like the GUI update thread.
+    """
+    gui = app.gui
+    data = app._SystemData
+    signals = data.uartSignals
+
+    def run():
+        for _ in range(updates):
+            gui.abentToPlot(value0=signals.current_0.value,
+                            valueA=signals.current_a.value,
+                            valueB=signals.current_b.value,
+                            valueC=signals.current_c.value,
+                            rpmTarget=data.target_rpm, rpmActual=signals.rpm.value,
+                            pwmTarget=data.target_pwm, pwmActual=signals.pwm.value)
+            gui._updateInfoTable()
+        return updates
+    ret = _measure(run, unit="updates", repeat=1)
+    gui._clearPlots()
+    return ret
+
+
+def stageLiveSimulator(duration: float, capturePath: str, cycleTime: int, latency: float) -> dict:
+    """Polls all signals from the pty simulator and records the session.
+
+    Args:
+        duration (float): The measurement time in seconds.
+        capturePath (str): Where to record the session for the offline stages.
+        cycleTime (int): The cycle time of every signal in ms.
+        latency (float): The simulated MCU response latency in seconds.
+
+    Returns:
+        dict: The stage result including the request -> response latency.
+    """
+    simulator = McuSimulator(latency=latency, statusInterval=1.0)
+    port = simulator.start()
+    signals = UARTSignals()
+    uart = UartHelper(signals)
+    uart.connect(port)
+    uart.getMessages()
+    for signal in signals:
+        signal.cyclic = True
+        signal.cycleTime = cycleTime
+    # the benchmark overloads the link on purpose
+    uart.rescheduleSignals(degrade=False)
+    uart.startCapture(capturePath)
+    byIndex = signals.byIndex
+    latencies = []
+    count = 0
+    cpuStart, wallStart = time.process_time(), time.perf_counter()
+    while time.perf_counter() - wallStart < duration:
+        for message in uart.getMessages():
+            count += 1
+            signal = byIndex(message.index) if message.type == MSG_Type.RESPONSE else None
+            if signal is not None and signal.lastTransmitted:
+                latencies.append((message.rxTimestamp - signal.lastTransmitted) / 1e6)
+        time.sleep(1e-3)
+    cpu, wall = time.process_time() - cpuStart, time.perf_counter() - wallStart
+    uart.disconnect()
+    uart.cleanUp()
+    simulator.stop()
+    return {"frames": count,
+            "seconds": wall,
+            "framesPerSecond": count / wall,
+            "cpuSeconds": cpu,
+            "cpuPercent": 100.0 * cpu / wall,
+            "latencyP50Ms": _percentile(latencies, 0.5),
+            "latencyP99Ms": _percentile(latencies, 0.99),
+            "latencySamples": len(latencies)}
+
+
+def stageLiveReplay(capturePath: str) -> dict:
+    """Replays the capture as fast as possible through a connected UartHelper.
+    """
+    transport = ReplaySerial(capturePath, speed=0)
+    uart = UartHelper(UARTSignals(), transport=transport)
+    count = 0
+    cpuStart, wallStart = time.process_time(), time.perf_counter()
+    uart.connect(transport.port)
+    while not (transport.isFinished() and not len(uart.message_stack)):
+        count += len(uart.getMessages())
+        time.sleep(1e-3)
+    cpu, wall = time.process_time() - cpuStart, time.perf_counter() - wallStart
+    queue = uart.message_stack
+    uart.disconnect()
+    uart.cleanUp()
+    return {"frames": count,
+            "seconds": wall,
+            "framesPerSecond": count / wall,
+            "cpuSeconds": cpu,
+            "cpuPercent": 100.0 * cpu / wall,
+            "coalesced": queue.coalesced,
+            "dropped": queue.dropped}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Compares the throughput of every stage with a baseline result.
+
+    Args:
+        results (dict): The current results.
+        baseline (dict): The results to compare with.
+        tolerance (float): The allowed relative throughput loss, e.g. 0.2.
+
+    Returns:
+        list: A description of every regression.
+    """
+    regressions = []
+    for stage, values in results["stages"].items():
+        if stage == "live" and results["source"] != baseline.get("source"):
+            # a simulator run and a replay are not comparable
+            continue
+        old = baseline.get("stages", {}).get(stage, {})
+        for key in _THROUGHPUT_KEYS:
+            if key in values and old.get(key):
+                ratio = values[key] / old[key]
+                print(f"{stage:<12} {key:<17} {old[key]:14,.0f} -> {values[key]:14,.0f}  ({ratio:6.2f}x)")
+                if ratio < 1.0 - tolerance:
+                    regressions.append(f"{stage}.{key} dropped to {ratio:.2f}x")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless benchmark of the UART receive pipeline")
+    parser.add_argument("--capture", help="use a recorded capture instead of the pty simulator")
+    parser.add_argument("--duration", type=float, default=5.0, help="duration of the live simulator run in s")
+    parser.add_argument("--cycle-time", type=int, default=15, help="cycle time of every signal in the live run in ms")
+    parser.add_argument("--latency", type=float, default=1.0, help="simulated MCU response latency in ms")
+    parser.add_argument("--output", default="bench_results.json", help="result file")
+    parser.add_argument("--baseline", help="result file of an older release to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative throughput loss")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {"version": appVersion,
+               "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "source": args.capture or "simulator",
+               "stages": {}}
+    stages = results["stages"]
+    with tempfile.TemporaryDirectory() as directory:
+        capturePath = args.capture
+        if capturePath is None:
+            capturePath = os.path.join(directory, "simulator.bldccap")
+            stages["live"] = stageLiveSimulator(args.duration, capturePath, args.cycle_time, args.latency / 1000)
+        else:
+            stages["live"] = stageLiveReplay(capturePath)
+        chunks = [data for _, direction, data in readCapture(capturePath) if direction == DIRECTION_RX]
+
+    stages["decodeFrame"] = stageDecodeFrame(chunks)
+    stages["decodeBatch"], batches = stageDecodeBatch(chunks)
+    stages["queue"] = stageQueue(batches)
+    app = App(headless=True)
+    try:
+        stages["dispatch"] = stageDispatch(app, batches)
+        stages["gui"] = stageGui(app)
+    finally:
+        app.cleanUp()
+
+    for stage, values in stages.items():
+        line = ", ".join(f"{key}: {value:,.3f}" if isinstance(value, float) else f"{key}: {value}"
+                         for key, value in values.items())
+        print(f"{stage:<12} {line}")
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
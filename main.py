@@ -14,16 +14,28 @@ It initializes the application and starts the main loop.
 
 __version__ = "0.0.2"
 
+import argparse
 import logging
 from moduls.app import App
+from moduls.replayTransport import ReplaySerial
 
 
 if __name__ == "__main__":
     """ Main function
     """
+    parser = argparse.ArgumentParser(description="BLDC Inverter GUI")
+    parser.add_argument("--replay", metavar="CAPTURE", help="replay a recorded capture instead of a serial port")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, 1 is real time, 0 is as fast as possible")
+    parser.add_argument("--asyncio", action="store_true", help="run the serial port and the GUI in one asyncio event loop")
+    parser.add_argument("--process", action="store_true", help="run the serial communication in a separate process")
+    parser.add_argument("--devices", type=int, default=1, help="number of inverters which can be connected at the same time")
+    parser.add_argument("--signals", metavar="CATALOGUE", help="signal catalogue of the firmware (.json or .toml), default resources/signals.json")
+    args = parser.parse_args()
+    
     logging.basicConfig(level=logging.INFO, 
                         format='%(name)-30s - %(levelname)-8s - %(message)s')
-    app = App()
+    replay = ReplaySerial(args.replay, args.speed) if args.replay else None
+    app = App(replay, useAsyncio=args.asyncio, useProcess=args.process, devices=args.devices, signals=args.signals)
     try:
         app.run()
     except KeyboardInterrupt:  
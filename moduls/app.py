@@ -12,8 +12,15 @@ __version__ = "0.0.2"
 
 from moduls.guiHelper import GuiHelper
 from moduls.uartHelper import UartHelper
+from moduls.asyncUartHelper import AsyncUartHelper
+from moduls.serialProcess import SerialProcess
+from moduls.serialPool import SerialPool, PooledUartHelper
+from moduls.device import Device
 from moduls.uartDefines import MSG_Type, MSG_INDEX_STATUS
-from moduls.dataClasses import SystemData
+from moduls.dataClasses import SystemData, UARTSignals
+from moduls.signalCatalogue import SignalCatalogue
+from moduls.replayTransport import ReplaySerial
+import asyncio
 import logging
 import time
 import threading
@@ -27,16 +34,29 @@ class App:
 
     Attributes:
     -----------
+    devices : list
+        The connected inverters, every Device has its own UartHelper, SystemData and plot data.
     _SystemData : SystemData
-        An instance of SystemData containing system-wide data.
+        The SystemData of the first device.
     uart : UartHelper
-        An instance of UartHelper to handle UART communication.
+        The UartHelper of the first device, an AsyncUartHelper with useAsyncio, a SerialProcess
+        with useProcess or a PooledUartHelper with several devices.
+    pool : SerialPool
+        The thread which serves the serial ports of several devices, None with one device.
+    useAsyncio : bool
+        Run the serial port, the scheduler and the GUI in one asyncio event loop.
+    useProcess : bool
+        Run the serial communication in a separate process.
+    catalogue : SignalCatalogue
+        The signal definitions of all devices.
+    replay : ReplaySerial
+        The replay transport if a capture is replayed, None otherwise.
     gui : GuiHelper
         An instance of GuiHelper to handle the GUI.
 
     Methods:
     --------
-    __init__() -> None:
+    __init__(replay: ReplaySerial = None, headless: bool = False, useAsyncio: bool = False, useProcess: bool = False, devices: int = 1, signals: str = None) -> None:
         Initialize the App class.
     
     cleanUp() -> None:
@@ -45,20 +65,77 @@ class App:
     readUART() -> None:
         Read and process UART messages.
     
+    handleMessages(messages: list, device: Device = None) -> None:
+        Process received UART messages of a device.
+    
     run() -> None:
         Run the main application loop.
     """
     
-    _SystemData = SystemData()
-    _newData = False
+    _frameInterval = 1 / 60
+    _guiUpdateInterval = 10E-3
     
-    def __init__(self):
+    def __init__(self, replay: ReplaySerial = None, headless: bool = False, useAsyncio: bool = False,
+                 useProcess: bool = False, devices: int = 1, signals: str = None):
         """
         Initialize the App class.
+
+        Args:
+            replay (ReplaySerial, optional): Replay a recorded capture instead of using a serial port.
+            headless (bool): Create the GUI items without a window, e.g. for benchmarks.
+            useAsyncio (bool): Run the serial port, the scheduler and the GUI in one asyncio event loop.
+            useProcess (bool): Run the serial communication in a separate process, not with a replay or useAsyncio.
+            devices (int): The number of inverters which can be connected at the same time, one with a replay.
+            signals (str, optional): The signal catalogue of the firmware. Defaults to resources/signals.json.
+
+        Raises:
+            ValueError: If the signal catalogue is invalid or lacks a signal of GuiHelper.requiredSignals.
         """
-        self.uart = UartHelper(self._SystemData.uartSignals)
-        self.gui = GuiHelper(self.uart, self._SystemData)
-        self.gui.startGui()
+        self.replay = replay
+        if useProcess and (replay is not None or useAsyncio):
+            logger.warning("The serial process only supports serial ports without asyncio, running in process")
+            useProcess = False
+        if devices > 1 and replay is not None:
+            logger.warning("A replay only supports one device")
+            devices = 1
+        self.useAsyncio = useAsyncio
+        self.useProcess = useProcess
+        self._newData = False
+        self._rxFrames = 0
+        self.catalogue = SignalCatalogue.load(signals)
+        # fail here instead of in the GUI thread when a catalogue lacks a signal the GUI shows
+        self.catalogue.require(GuiHelper.requiredSignals)
+        # with asyncio all devices share the loop of the App, a process serves only one device
+        self.pool = SerialPool() if devices > 1 and not (useAsyncio or useProcess) else None
+        self.devices = [self._createDevice(f"Inverter {number}") for number in range(1, devices + 1)]
+        self.uart = self.devices[0].uart
+        self._SystemData = self.devices[0].systemData
+        self.gui = GuiHelper(self.devices)
+        self.gui.startGui(headless, eventLoop=useAsyncio)
+        
+    def _createDevice(self, name: str) -> Device:
+        """
+        Create a device with its own signals and serial communication.
+
+        Args:
+            name (str): The name shown in the GUI.
+
+        Returns:
+            Device: The new device.
+        """
+        systemData = SystemData(UARTSignals(self.catalogue))
+        if self.useProcess:
+            uart = SerialProcess(systemData.uartSignals)
+        elif self.useAsyncio:
+            uart = AsyncUartHelper(systemData.uartSignals, transport=self.replay)
+        elif self.pool is not None:
+            uart = PooledUartHelper(systemData.uartSignals, self.pool)
+        else:
+            uart = UartHelper(systemData.uartSignals, transport=self.replay)
+        device = Device(name, uart, systemData)
+        if self.useAsyncio:
+            uart.messageHandler = lambda messages: self.handleMessages(messages, device)
+        return device
         
     def _GUI_Update_Thread(self):
         """
@@ -67,9 +144,7 @@ class App:
         """
         logger.debug("GUI update thread started")
         while self.gui.isGuiRunning():
-            if self.uart.isConnected():
-                self.gui.updateData(self._SystemData)
-                
+            self.gui.updateDevices()
             time.sleep(10E-3)  # Sleep for 10ms to avoid busy waiting
         logger.debug("GUI update thread stopped")
         
@@ -78,66 +153,139 @@ class App:
         """
         Clean up resources by stopping UART and GUI components.
         """
-        self.uart.cleanUp()
+        for device in self.devices:
+            device.uart.cleanUp()
+        if self.pool is not None:
+            self.pool.stop()
         self.gui.cleanUp()
 
     def readUART(self):
         """
-        Read and process UART messages.
+        Read and process UART messages of all devices.
         """
-        message = self.uart.getMessage()
-        signal_dict = {signal.index: signal for signal in self._SystemData.uartSignals}
-        while message is not None:
-            logger.debug(f"Read the message: {message}")
-            if message.type == MSG_Type.RESPONSE:
-                # Process response messages
-                signal = signal_dict.get(message.index)
-                if signal:
-                    self._newData = True
-                    if signal.allow_negative:
-                        signal.update(message.getPayloadSigned())
-                    else:
-                        signal.update(message.getPayloadUnsigned())
-            
-            if message.type == MSG_Type.STATUS_MESSAGE:
+        for device in self.devices:
+            self.handleMessages(device.uart.getMessages(), device)
+
+    def handleMessages(self, messages: list, device: Device = None):
+        """
+        Process received UART messages of a device.
+
+        Args:
+            messages (list): The received messages in receive order.
+            device (Device, optional): The device which sent the messages. Defaults to the first device.
+        """
+        if device is None:
+            device = self.devices[0]
+        if not messages:
+            return
+        prefix = f"{device.name}: " if len(self.devices) > 1 else ""
+        self._rxFrames += len(messages)
+        # all RESPONSE messages are scaled into the signal table in one step
+        if device.systemData.uartSignals.table.applyMessages(messages):
+            self._newData = True
+        for message in messages:
+            if message.type is MSG_Type.STATUS_MESSAGE:
+                logger.debug(f"Read the message: {message}")
                 # Process status messages
                 match message.index:
                     case MSG_INDEX_STATUS.STATUS_OK:
-                        self.gui.writeLog("MCU Status OK", Rx=True)
+                        self.gui.writeLog(f"{prefix}MCU Status OK", Rx=True)
                     
                     case MSG_INDEX_STATUS.STATUS_READY:
-                        self.gui.writeLog("MCU Status Ready", Rx=True)
-                        self.gui.writeLog("Transmitting settings to ESC")
-                        for signal in self._SystemData.uartSignals:
+                        self.gui.writeLog(f"{prefix}MCU Status Ready", Rx=True)
+                        self.gui.writeLog(f"{prefix}Transmitting settings to ESC")
+                        for signal in device.systemData.uartSignals:
                             signal.retransmit()
                             
                     case MSG_INDEX_STATUS.STATUS_REMOTE_READY:
-                        self.gui.writeLog("MCU Status Remote Ready", Rx=True)
+                        self.gui.writeLog(f"{prefix}MCU Status Remote Ready", Rx=True)
                     
                     case MSG_INDEX_STATUS.STOP_EMERGENCY:
-                        self.gui.writeLog("MCU Status Emergency Stop", Rx=True)
+                        self.gui.writeLog(f"{prefix}MCU Status Emergency Stop", Rx=True)
                     
                     case MSG_INDEX_STATUS.STATUS_SYSTEM_ERROR:
-                        self.gui.writeLog(f"MCU Status System Error: {message.getPayloadSigned()}", Rx=True)
+                        self.gui.writeLog(f"{prefix}MCU Status System Error: {message.getPayloadSigned()}", Rx=True)
                     
                     case MSG_INDEX_STATUS.STATUS_ERROR:
-                        self.gui.writeLog(f"MCU Status Error: {message.getPayloadSigned()}", Rx=True)
+                        self.gui.writeLog(f"{prefix}MCU Status Error: {message.getPayloadSigned()}", Rx=True)
                     
                     case _:
-                        self.gui.writeLog(f"MCU Status Unknown: {message.getPayloadSigned()}", Rx=True)
+                        self.gui.writeLog(f"{prefix}MCU Status Unknown: {message.getPayloadSigned()}", Rx=True)
                         logger.error(f"Unknown message index: {message.index}")
-                        return
-
-            message = self.uart.getMessage()
             
         
+    def _reportReplay(self, duration: float) -> None:
+        """
+        Report the end-to-end throughput of a finished replay.
+
+        Args:
+            duration (float): The time from connecting until the last frame was processed, in seconds.
+        """
+        uart = self.uart
+        rate = uart.rxFrames / duration if duration > 0 else 0.0
+        msg = (f"Replay finished: {uart.rxFrames} frames in {duration:.3f} s ({rate:.0f} frames/s), "
+               f"{self._rxFrames} dispatched")
+        if not self.useAsyncio:
+            # only the reader thread hands the messages over the queue
+            queue = uart.message_stack
+            msg += f", {queue.coalesced} coalesced, {queue.dropped} dropped"
+        logger.info(msg)
+        self.gui.writeLog(msg)
+    
     def run(self):
+        if self.useAsyncio:
+            asyncio.run(self._runAsync())
+            return
         self.gui.writeLog("Starting GUI")
         guiThread = threading.Thread(target=self._GUI_Update_Thread, daemon=True)
         guiThread.start()
+        replayStart = None
+        if self.replay is not None:
+            self.gui.writeLog(f"Replaying {self.replay.path} at speed {self.replay.speed or 'max'}")
+            replayStart = time.perf_counter()
+            self._rxFrames = 0
+            self.gui.connectTo(self.replay.port)
         while self.gui.isGuiRunning():
             self.readUART()
+            # the reader sets rxFinished after it queued the last frames of the replay
+            if replayStart is not None and self.uart.rxFinished.is_set() and not len(self.uart.message_stack):
+                self._reportReplay(time.perf_counter() - replayStart)
+                replayStart = None
             self.gui.renderWindow()
             time.sleep(1E-3)
         logger.debug("Main loop stopped")
-        guiThread.join()
\ No newline at end of file
+        guiThread.join()
+
+    async def _runAsync(self):
+        """
+        Run the main application loop in an asyncio event loop.
+        The received messages are processed by the AsyncUartHelper as they arrive,
+        the loop renders the frames and runs the GUI callbacks in between.
+        """
+        loop = asyncio.get_running_loop()
+        self.gui.writeLog("Starting GUI (asyncio)")
+        replayStart = None
+        if self.replay is not None:
+            self.gui.writeLog(f"Replaying {self.replay.path} at speed {self.replay.speed or 'max'}")
+            replayStart = time.perf_counter()
+            self._rxFrames = 0
+            self.gui.connectTo(self.replay.port)
+        nextUpdate = 0.0
+        while self.gui.isGuiRunning():
+            frameStart = loop.time()
+            if frameStart >= nextUpdate:
+                self.gui.updateDevices()
+                nextUpdate = frameStart + self._guiUpdateInterval
+            # the loop dispatches the frames as they are decoded, rxFinished follows the last ones
+            if replayStart is not None and self.uart.rxFinished.is_set():
+                self._reportReplay(time.perf_counter() - replayStart)
+                replayStart = None
+            self.gui.renderWindow()
+            self.gui.runCallbacks()
+            # serve the serial port until the next frame is due
+            await asyncio.sleep(max(self._frameInterval - (loop.time() - frameStart), 0))
+        logger.debug("Main loop stopped")
+        for device in self.devices:
+            if device.uart.isConnected():
+                # the loop timers and readers are gone after asyncio.run()
+                device.uart.disconnect()
@@ -0,0 +1,260 @@
+""" asyncUartHelper.py
+
+This module provides a UartHelper which runs in one asyncio event loop instead
+of a reader and a sender thread. The serial port is watched with a file
+descriptor reader, the cyclic requests are sent from loop timers and the
+received messages are dispatched in the same loop, so the GUI, the reader and
+the scheduler never run in parallel. Transports without a file descriptor,
+e.g. a ReplaySerial, and event loops without add_reader are polled instead.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import asyncio
+import threading
+import logging
+import serial
+from moduls.uartHelper import UartHelper
+from moduls.dataClasses import UARTSignals
+from moduls.frameDecoder import FrameDecoder
+from moduls.messageQueue import DropPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUartHelper(UartHelper):
+    """
+    UartHelper which reads, schedules and dispatches in one asyncio event loop.
+
+    Must be connected from a coroutine or a callback of the running loop. Only
+    the parameter readout keeps its own thread.
+
+    Attributes:
+    -----------
+    loop : asyncio.AbstractEventLoop
+        The event loop of the connection, None if not connected.
+    messageHandler : callable
+        Called in the loop with every list of received messages, the message_stack is used if None.
+
+    Methods:
+    --------
+    connect(port: str, updateSignals: bool = False, onReadout: callable = None) -> bool:
+        Connect to the specified serial port and register it in the running event loop.
+
+    _start_reading() -> None:
+        Register the serial port in the event loop.
+
+    _stop_reading() -> None:
+        Remove the serial port from the event loop.
+
+    _start_cyclic_send() -> None:
+        Schedule the cyclic requests in the event loop.
+
+    _stop_cyclic_send() -> None:
+        Cancel the cyclic requests.
+
+    _onReadable() -> None:
+        Read and dispatch the waiting data of the serial port.
+
+    _service() -> None:
+        Send the written values and the due messages, then rearm the timer.
+    """
+
+    _pollInterval = 1E-3
+
+    def __init__(self, uartSignals: UARTSignals, rxDropPolicy: DropPolicy = DropPolicy.COALESCE,
+                 checksum: str = "xor", transport=None) -> None:
+        """
+        Initialize the AsyncUartHelper class.
+
+        Args:
+            uartSignals (UARTSignals): An instance of UARTSignals containing signal definitions.
+            rxDropPolicy (DropPolicy): What to drop when the App does not keep up with the received messages.
+            checksum (str): The frame checksum of the firmware, "xor" or "crc8".
+            transport (optional): A stand-in for serial.Serial, e.g. a ReplaySerial. Defaults to a serial port.
+        """
+        super().__init__(uartSignals, blockingRead=False, rxDropPolicy=rxDropPolicy,
+                         checksum=checksum, transport=transport)
+        self.loop = None
+        self.messageHandler = None
+        self._decoder = None
+        self._fd = None
+        self._pollHandle = None
+        self._timer = None
+        self._kickPending = False
+        self._loopThread = None
+
+    def connect(self, port: str, updateSignals: bool = False, onReadout=None) -> bool:
+        """
+        Connect to the specified serial port and register it in the running event loop.
+
+        Args:
+            port (str): The serial port to connect to.
+            updateSignals (bool): Flag to indicate if all signals should be read after connection.
+            onReadout (callable, optional): Called with the ParameterReadout when all signals were read.
+
+        Returns:
+            bool: True if connection is successful, False otherwise.
+        """
+        self.loop = asyncio.get_running_loop()
+        self._loopThread = threading.get_ident()
+        return super().connect(port, updateSignals, onReadout)
+
+    def _start_reading(self) -> None:
+        """
+        Register the serial port in the event loop.
+        """
+        if not self.ser.is_open:
+            logger.error("Serial port is not open")
+            return
+        self.reading = True
+        self.ser.reset_input_buffer()
+        self.rxBuffer.clear()
+        self.rxFrames = 0
+        self.rxFinished.clear()
+        self._decoder = FrameDecoder(self.checksum, self._uartSignals.catalogue.validIds)
+        try:
+            fd = self.ser.fileno()
+            self.loop.add_reader(fd, self._onReadable)
+            self._fd = fd
+        except (AttributeError, NotImplementedError, OSError, serial.SerialException):
+            # no file descriptor or no selector loop, e.g. a replay or Windows
+            logger.info("No file descriptor reader available, polling the port")
+            self._pollHandle = self.loop.call_soon(self._poll)
+
+    def _stop_reading(self) -> None:
+        """
+        Remove the serial port from the event loop.
+        """
+        self.reading = False
+        if self._fd is not None:
+            self.loop.remove_reader(self._fd)
+            self._fd = None
+        if self._pollHandle is not None:
+            self._pollHandle.cancel()
+            self._pollHandle = None
+
+    def _poll(self) -> None:
+        self._onReadable()
+        if self.reading:
+            self._pollHandle = self.loop.call_later(self._pollInterval, self._poll)
+
+    def _onReadable(self) -> None:
+        """
+        Read and dispatch the waiting data of the serial port.
+        """
+        try:
+            waiting = self.ser.in_waiting
+            if not waiting:
+                if self._fd is None:
+                    return
+                # readable without data is a hang up, the read raises the error
+                waiting = 1
+            messages = self._decode(self._decoder, self.rxBuffer.readFrom(self.ser, waiting))
+        except (OSError, serial.SerialException) as e:
+            logger.error(f"Reading the serial port failed: {e}")
+            self._stop_reading()
+            return
+        if messages:
+            handler = self.messageHandler
+            if handler is not None:
+                handler(messages)
+            else:
+                self.message_stack.putMany(messages)
+        self._checkFinished()
+
+    def _start_cyclic_send(self) -> None:
+        """
+        Schedule the cyclic requests in the event loop.
+        """
+        if not self.ser.is_open:
+            logger.error("Serial port is not open")
+            return
+        self.isSending = True
+        for signal in self._uartSignals:
+            signal.setWriteListener(self._notifyWrite)
+        self.scheduler.scheduleSignals(self._uartSignals)
+        self._kick()
+
+    def _stop_cyclic_send(self) -> None:
+        """
+        Cancel the cyclic requests.
+        """
+        self.isSending = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def rescheduleSignals(self, degrade: bool = True) -> list:
+        """
+        Apply changed cyclic and cycleTime settings of the signals, all cyclic signals are requested immediately.
+
+        Args:
+            degrade (bool): Slow down low priority signals if the link budget is exceeded. Defaults to True.
+
+        Returns:
+            list: (signal, old cycleTime, new cycleTime) of every slowed down signal.
+        """
+        changes = super().rescheduleSignals(degrade)
+        self._wakeUp()
+        return changes
+
+    def addCyclicSend(self, message, interval: int) -> None:
+        """
+        Add a message to be sent cyclically.
+
+        Args:
+            message (UART_Message): The UART message to send cyclically.
+            interval (int): The interval in milliseconds between each send.
+        """
+        super().addCyclicSend(message, interval)
+        self._wakeUp()
+
+    def _notifyWrite(self, signal) -> None:
+        if signal.urgent:
+            self.sendUrgent(signal)
+        else:
+            self.scheduler.notifyWrite(signal)
+        self._wakeUp()
+
+    def _wakeUp(self) -> None:
+        # several writes within one loop iteration are sent together
+        if self.loop is None or self._kickPending:
+            return
+        self._kickPending = True
+        if threading.get_ident() == self._loopThread:
+            self.loop.call_soon(self._kick)
+        else:
+            self.loop.call_soon_threadsafe(self._kick)
+
+    def _kick(self) -> None:
+        self._kickPending = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.isSending:
+            self._service()
+
+    def _service(self) -> None:
+        """
+        Send the written values and the due messages, then rearm the timer.
+        """
+        self._timer = None
+        if not self.isSending:
+            return
+        written, due, deadline = self.scheduler.poll()
+        try:
+            self._transmit(written, due)
+        except (OSError, serial.SerialException) as e:
+            logger.error(f"Writing the serial port failed: {e}")
+            self.isSending = False
+            return
+        retry = self.writes.nextDeadline()
+        if retry is not None and (deadline is None or retry < deadline):
+            deadline = retry
+        if deadline is not None:
+            # the default loop clock is time.monotonic()
+            self._timer = self.loop.call_at(deadline / 1e9, self._service)
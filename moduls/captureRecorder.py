@@ -0,0 +1,142 @@
+""" captureRecorder.py
+
+This module records the raw serial traffic into a capture file.
+Every received and transmitted chunk is stored with a monotonic timestamp in
+nanoseconds and its direction. The file is preallocated and memory mapped, so
+recording a chunk is only a memory copy and never waits for the disk.
+
+File layout:
+    header: 8 byte magic
+    record: uint64 timestamp [ns], uint8 direction, uint16 length, length bytes of data
+A record with timestamp 0 marks the end of the capture.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import mmap
+import struct
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"BLDCCAP1"
+DIRECTION_RX = 0x0
+DIRECTION_TX = 0x1
+
+_RECORD_HEADER = struct.Struct('<QBH')
+
+
+class CaptureRecorder:
+    """
+    Append only recorder for raw serial data.
+
+    Attributes:
+        path (str): The path of the capture file.
+        size (int): The preallocated size of the capture file in bytes.
+        records (int): The number of recorded chunks.
+        dropped (int): The number of chunks which did not fit into the file anymore.
+
+    Methods:
+        record(direction, data): Records one chunk of serial data.
+        used(): Returns the number of used bytes in the capture file.
+        close(): Flushes the data and truncates the file to the used size.
+    """
+
+    def __init__(self, path: str, size: int = 64 * 1024 * 1024) -> None:
+        """
+        Initialize the CaptureRecorder class and preallocate the capture file.
+
+        Args:
+            path (str): The path of the capture file.
+            size (int): The size to preallocate in bytes. Defaults to 64 MiB.
+        """
+        self.path = path
+        self.size = size
+        self.records = 0
+        self.dropped = 0
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._map[:len(CAPTURE_MAGIC)] = CAPTURE_MAGIC
+        self._pos = len(CAPTURE_MAGIC)
+        self._lock = threading.Lock()
+        self._closed = False
+        logger.info(f"Recording capture to: {path}")
+
+    def record(self, direction: int, data) -> bool:
+        """Records one chunk of serial data.
+
+        Args:
+            direction (int): DIRECTION_RX or DIRECTION_TX.
+            data (bytes | memoryview): The data of the chunk.
+
+        Returns:
+            bool: True if the chunk was recorded, False if the file is full or closed.
+        """
+        timestamp = time.monotonic_ns()
+        length = len(data)
+        with self._lock:
+            start = self._pos
+            end = start + _RECORD_HEADER.size + length
+            if self._closed:
+                return False
+            # keep room for the end marker
+            if end + _RECORD_HEADER.size > self.size:
+                if self.dropped == 0:
+                    logger.warning(f"Capture file full: {self.path}")
+                self.dropped += 1
+                return False
+            _RECORD_HEADER.pack_into(self._map, start, timestamp, direction, length)
+            self._map[start + _RECORD_HEADER.size:end] = data
+            self._pos = end
+            self.records += 1
+        return True
+
+    def used(self) -> int:
+        """Returns the number of used bytes in the capture file.
+
+        Returns:
+            int: The used bytes including the header.
+        """
+        return self._pos
+
+    def close(self) -> None:
+        """Flushes the data and truncates the file to the used size.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._map.flush()
+            self._map.close()
+            self._file.truncate(self._pos)
+            self._file.close()
+        logger.info(f"Capture closed: {self.path}, {self.records} records, {self.dropped} dropped")
+
+
+def readCapture(path: str):
+    """Reads all records of a capture file.
+
+    Args:
+        path (str): The path of the capture file.
+
+    Yields:
+        tuple: (timestamp [ns], direction, data) of every record.
+    """
+    with open(path, "rb") as file:
+        content = file.read()
+    if content[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+        raise ValueError(f"Not a capture file: {path}")
+    pos = len(CAPTURE_MAGIC)
+    while pos + _RECORD_HEADER.size <= len(content):
+        timestamp, direction, length = _RECORD_HEADER.unpack_from(content, pos)
+        if timestamp == 0:
+            break
+        pos += _RECORD_HEADER.size
+        yield timestamp, direction, content[pos:pos + length]
+        pos += length
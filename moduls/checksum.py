@@ -0,0 +1,142 @@
+""" checksum.py
+
+This module contains the checksums which can be used to protect a UART frame.
+Every checksum can be calculated for a single message and, vectorized with NumPy,
+for many messages at once.
+
+The current firmware uses the XorChecksum, the table driven Crc8Checksum is
+available for firmware versions with a real CRC-8.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import abc
+import numpy as np
+
+
+class Checksum(abc.ABC):
+    """
+    Abstract base class for the frame checksums.
+
+    Attributes:
+        name (str): The name of the checksum.
+
+    Methods:
+        compute(data): Calculates the checksum for one message.
+        computeBatch(messages): Calculates the checksum for many messages at once.
+    """
+    name = ""
+
+    @abc.abstractmethod
+    def compute(self, data) -> int:
+        """Calculates the checksum for one message.
+
+        Args:
+            data (bytes): The message bytes.
+
+        Returns:
+            int: The checksum.
+        """
+
+    @abc.abstractmethod
+    def computeBatch(self, messages: np.ndarray) -> np.ndarray:
+        """Calculates the checksum for many messages at once.
+
+        Args:
+            messages (np.ndarray): A (n, length) uint8 array with one message per row.
+
+        Returns:
+            np.ndarray: The n checksums as uint8.
+        """
+
+
+class XorChecksum(Checksum):
+    """
+    XOR over all message bytes, as used by the current firmware.
+    """
+    name = "xor"
+
+    def compute(self, data) -> int:
+        crc = 0
+        for byte in data:
+            crc ^= byte
+        return crc
+
+    def computeBatch(self, messages: np.ndarray) -> np.ndarray:
+        return np.bitwise_xor.reduce(messages, axis=1)
+
+
+class Crc8Checksum(Checksum):
+    """
+    Table driven CRC-8 (MSB first, no reflection, no final XOR).
+
+    Attributes:
+        polynomial (int): The generator polynomial without the leading bit.
+        init (int): The start value of the CRC register.
+    """
+    name = "crc8"
+
+    def __init__(self, polynomial: int = 0x07, init: int = 0x00) -> None:
+        """
+        Initialize the Crc8Checksum class.
+
+        Args:
+            polynomial (int): The generator polynomial. Defaults to 0x07 (CRC-8/SMBUS).
+            init (int): The start value of the CRC register. Defaults to 0x00.
+        """
+        self.polynomial = polynomial
+        self.init = init
+        self._table = self._buildTable(polynomial)
+        self._tableArray = np.array(self._table, dtype=np.uint8)
+
+    @staticmethod
+    def _buildTable(polynomial: int) -> tuple:
+        """Builds the lookup table with the CRC of every single byte.
+
+        Args:
+            polynomial (int): The generator polynomial.
+
+        Returns:
+            tuple: The 256 table entries.
+        """
+        table = []
+        for byte in range(256):
+            crc = byte
+            for _ in range(8):
+                crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+            table.append(crc)
+        return tuple(table)
+
+    def compute(self, data) -> int:
+        table = self._table
+        crc = self.init
+        for byte in data:
+            crc = table[crc ^ byte]
+        return crc
+
+    def computeBatch(self, messages: np.ndarray) -> np.ndarray:
+        table = self._tableArray
+        crc = np.full(len(messages), self.init, dtype=np.uint8)
+        for column in range(messages.shape[1]):
+            crc = table[crc ^ messages[:, column]]
+        return crc
+
+
+CHECKSUMS = {checksum.name: checksum for checksum in (XorChecksum(), Crc8Checksum())}
+
+def getChecksum(name: str) -> Checksum:
+    """Returns the checksum registered under the given name.
+
+    Args:
+        name (str): The name of the checksum, e.g. "xor" or "crc8".
+
+    Returns:
+        Checksum: The checksum instance.
+    """
+    try:
+        return CHECKSUMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown checksum: {name}") from None
@@ -12,13 +12,14 @@ It also defines the SystemData class for system-wide data.
 __version__ = "0.0.2"
 
 import dataclasses
-from moduls.uartDefines import MSG_INDEX_PARAM
+from moduls.uartDefines import MSG_INDEX_PARAM, INDEX_COUNT, _enumValue
+from moduls.signalCatalogue import SignalCatalogue
+from moduls.signalTable import SignalTable
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclasses.dataclass
 class Signale:
     """
     Data class for the serial signals.
@@ -31,8 +32,8 @@ class Signale:
         The value of the signal.
     unite : str
         The unit of the signal.
-    index : MSG_INDEX_PARAM
-        The index of the signal.
+    index : MSG_INDEX_PARAM | int
+        The index of the signal, an integer for indices without a MSG_INDEX_PARAM member.
     factor : float, optional
         The factor to apply to the signal value (default is 1.0).
     offset : float, optional
@@ -51,30 +52,105 @@ class Signale:
         Whether to disable retransmission of the signal (default is False).     
     lastReceived : float, optional
         The timestamp of the last received signal (default is 0.0).
+        value, lastReceived and valueWritten are stored in the SignalTable of the UARTSignals.
     lastTransmitted : float, optional
         The timestamp of the last transmitted signal (default is 0.0).
     valueWritten : bool, optional
         Whether the signal value has been written (default is False).
     newValue : int | float, optional
         The new value of the signal (default is 0).
+    priority : int, optional
+        The priority of the cyclic requests, signals with a lower priority are
+        polled slower first if the link is overloaded (default is 1).
+    writeInterval : int, optional
+        The minimum time between two writes in milliseconds. Faster writes are
+        coalesced and only the last value is sent (default is 0, no limit).
+    urgent : bool, optional
+        Written values bypass the scheduler and are sent immediately, even if the
+        value did not change, e.g. for the emergency stop (default is False).
+    lastWritten : float, optional
+        The time of the last write in ns (default is 0.0).
+
+    Methods:
+    --------
+    setWriteListener(listener: callable) -> None:
+        Set a function which is called with the signal after every write.
     """
-    name: str
-    value: int | float
-    unite: str
-    index: MSG_INDEX_PARAM
-    factor: float = 1.0
-    offset: float = 0.0
-    allow_negative: bool = False
-    isRaw: bool = False
-    cycleTime: int = 1000
-    cyclic: bool = False
-    isPersistent: bool = False
-    noRetransmit: bool = False
-    lastReceived: float = 0.0
-    lastTransmitted: float = 0.0
-    valueWritten: bool = False
-    newValue: int | float = None
-    
+    # the constructor arguments in order, __iter__ returns them
+    _fields = ("name", "value", "unite", "index", "factor", "offset", "allow_negative", "isRaw", "cycleTime",
+               "cyclic", "isPersistent", "noRetransmit", "lastReceived", "lastTransmitted", "valueWritten",
+               "newValue", "priority", "writeInterval", "urgent", "lastWritten")
+
+    def __init__(self, name: str, value: int | float, unite: str, index: MSG_INDEX_PARAM | int,
+                 factor: float = 1.0, offset: float = 0.0, allow_negative: bool = False, isRaw: bool = False,
+                 cycleTime: int = 1000, cyclic: bool = False, isPersistent: bool = False,
+                 noRetransmit: bool = False, lastReceived: float = 0.0, lastTransmitted: float = 0.0,
+                 valueWritten: bool = False, newValue: int | float = None, priority: int = 1,
+                 writeInterval: int = 0, urgent: bool = False, lastWritten: float = 0.0) -> None:
+        """
+        Initialize the Signale class, the arguments are described in the attributes.
+        """
+        self.name = name
+        self.unite = unite
+        self.index = index
+        self.factor = factor
+        self.offset = offset
+        self.allow_negative = allow_negative
+        self.isRaw = isRaw
+        self.cycleTime = cycleTime
+        self.cyclic = cyclic
+        self.isPersistent = isPersistent
+        self.noRetransmit = noRetransmit
+        self.lastTransmitted = lastTransmitted
+        self.newValue = newValue
+        self.priority = priority
+        self.writeInterval = writeInterval
+        self.urgent = urgent
+        self.lastWritten = lastWritten
+        self._writeListener = None
+        # value, lastReceived and valueWritten are stored here until the signal is bound to a SignalTable
+        self._table = None
+        self._row = 0
+        self._value = value
+        self._lastReceived = lastReceived
+        self._valueWritten = valueWritten
+
+    @property
+    def value(self) -> int | float:
+        """int | float: The value, read from the SignalTable if the signal is bound to one."""
+        return self._value if self._table is None else self._table.read(self._row)
+
+    @value.setter
+    def value(self, value: int | float) -> None:
+        if self._table is None:
+            self._value = value
+        else:
+            self._table.value[self._row] = value
+
+    @property
+    def lastReceived(self) -> float:
+        """float: The time of the last received value, read from the SignalTable if the signal is bound to one."""
+        return self._lastReceived if self._table is None else self._table.lastReceived.item(self._row)
+
+    @lastReceived.setter
+    def lastReceived(self, value: float) -> None:
+        if self._table is None:
+            self._lastReceived = value
+        else:
+            self._table.lastReceived[self._row] = value
+
+    @property
+    def valueWritten(self) -> bool:
+        """bool: True if the written value is not sent yet, read from the SignalTable if the signal is bound to one."""
+        return self._valueWritten if self._table is None else self._table.pending.item(self._row)
+
+    @valueWritten.setter
+    def valueWritten(self, value: bool) -> None:
+        if self._table is None:
+            self._valueWritten = value
+        else:
+            self._table.pending[self._row] = value
+
     def __eq__(self, value):
         """
         Check if the signal index is equal to the given value.
@@ -86,41 +162,47 @@ class Signale:
         Return a string representation of the signal.
         """
         return f"{self.name}: {self.value} {self.unite}"
+
+    def __repr__(self):
+        """
+        Return the constructor call of the signal.
+        """
+        arguments = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"Signale({arguments})"
     
     def __iter__(self):
         """
         Return an iterator over the signal attributes.
         """
-        return iter(dataclasses.asdict(self))
+        return iter(self._fields)
     
     def write(self, value: int | float):
         """
-        Write a new value to the signal if it is different from the current value.
+        Write a new value to the signal if it is different from the current value or the signal is urgent.
 
         Args:
             value (int | float): The new value to write.
         """
-        if value != self.value:
+        if value != self.value or self.urgent:
+            self.lastWritten = time.time_ns()
             if self.isPersistent:
                 self.value = value
             logger.debug(f"Write {self.name}: {self.value} {self.unite}")
             self.newValue = value
             self.valueWritten = True
+            if self._writeListener is not None:
+                self._writeListener(self)
             
     def update(self, value: int | float):
         """
-        Update the signal value if it is different from the current value and not already written.
+        Update the signal value if it is not already written.
+        A batch of received values is stored with SignalTable.applyMessages() instead.
 
         Args:
             value (int | float): The new value to update.
         """
-        if value != self.value and not self.valueWritten:
-            if self.isRaw:
-                self.value = value
-                logger.debug(f"Update RAW {self.name}: {self.value} {self.unite}")
-            else:
-                self.value = (value * self.factor) + self.offset
-                logger.debug(f"Update {self.name}: {self.value} {self.unite}")
+        if not self.valueWritten:
+            self.value = value if self.isRaw else (value * self.factor) + self.offset
         self.lastReceived = time.time_ns()
         
     def retransmit(self) -> None:
@@ -132,6 +214,17 @@ class Signale:
         if  not(self.newValue is None) and not self.noRetransmit:
             logger.debug(f"Retransmit {self.name}: {self.newValue} {self.unite}")
             self.valueWritten = True
+            if self._writeListener is not None:
+                self._writeListener(self)
+    
+    def setWriteListener(self, listener) -> None:
+        """
+        Set a function which is called with the signal after every write, e.g. to wake the send thread.
+
+        Args:
+            listener (callable): The function, None to remove it.
+        """
+        self._writeListener = listener
         
 
     def getRaw(self):
@@ -149,6 +242,10 @@ class UARTSignals:
     """
     Data class for the UART signals.
 
+    The signals are created from a SignalCatalogue, every catalogue entry is an
+    attribute named by its key. The default catalogue resources/signals.json
+    defines the signals below.
+
     Attributes:
     -----------
     bat_voltage : Signale
@@ -183,293 +280,76 @@ class UARTSignals:
         The PWM I signal.
     pwm_d : Signale
         The PWM D signal.
+    catalogue : SignalCatalogue
+        The catalogue the signals were created from.
+    indexTable : list
+        The signal per parameter index value, None for unused values.
+    table : SignalTable
+        The received values of all signals, every signal is a view on its row.
+
+    Methods:
+    --------
+    byIndex(index: MSG_INDEX_PARAM | int) -> Signale:
+        Return the signal of an index, None if there is none.
+    byName(name: str) -> Signale:
+        Return the signal with the given name, None if there is none.
     """
-    def __init__(self):
+    def __init__(self, catalogue: SignalCatalogue = None):
         """
-        Initialize the UART signals.
+        Initialize the UART signals from a signal catalogue.
+
+        Args:
+            catalogue (SignalCatalogue, optional): The signal definitions. Defaults to resources/signals.json.
         """
-        
-        # Battery voltage signal
-        self.bat_voltage: Signale = Signale(
-            name="Bat Voltage",  # Name of the signal
-            value=0.0,          # Default value
-            unite="V",          # Unit of the signal
-            index=MSG_INDEX_PARAM.VALUE_BAT_VOLTAGE,  # Index in UART communication
-            factor=0.01,        # Scaling factor
-            offset=0.0,         # Offset value
-            allow_negative=False,  # Whether negative values are allowed
-            isRaw=False,        # Whether the signal is raw
-            cycleTime=30000,    # Cycle time in milliseconds
-            cyclic=True,        # Whether the signal is cyclic
-            isPersistent=False, # Whether the signal is persistent
-            noRetransmit=True   # Whether retransmission is disabled
-        )
-
-        # Current signals
-        self.current_0: Signale = Signale(
-            name="Current 0",
-            value=0.0,
-            unite="A",
-            index=MSG_INDEX_PARAM.VALUE_CURRENT_0,
-            factor=0.001,
-            offset=0.0,
-            allow_negative=True,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=True,
-            isPersistent=False
-        )
-        self.current_a: Signale = Signale(
-            name="Current A",
-            value=0.0,
-            unite="A",
-            index=MSG_INDEX_PARAM.VALUE_CURRENT_A,
-            factor=0.001,
-            offset=0.0,
-            allow_negative=True,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=True,
-            isPersistent=False
-        )
-        self.current_b: Signale = Signale(
-            name="Current B",
-            value=0.0,
-            unite="A",
-            index=MSG_INDEX_PARAM.VALUE_CURRENT_B,
-            factor=0.001,
-            offset=0.0,
-            allow_negative=True,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=True,
-            isPersistent=False
-        )
-        self.current_c: Signale = Signale(
-            name="Current C",
-            value=0.0,
-            unite="A",
-            index=MSG_INDEX_PARAM.VALUE_CURRENT_C,
-            factor=0.001,
-            offset=0.0,
-            allow_negative=True,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=True,
-            isPersistent=False
-        )
-
-        # Temperature signals
-        self.temp_motor: Signale = Signale(
-            name="Motor Temp",
-            value=0.0,
-            unite="°C",
-            index=MSG_INDEX_PARAM.VALUE_TEMP_MOTOR,
-            factor=0.1,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=30000,
-            cyclic=True,
-            isPersistent=False,
-            noRetransmit=True
-        )
-        self.temp_inverter: Signale = Signale(
-            name="Inverter Temp",
-            value=0.0,
-            unite="°C",
-            index=MSG_INDEX_PARAM.VALUE_TEMP_INVERTER,
-            factor=0.1,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=30000,
-            cyclic=True,
-            isPersistent=True
-        )
-
-        # RPM signal
-        self.rpm: Signale = Signale(
-            name="RPM",
-            value=0,
-            unite="1/min",
-            index=MSG_INDEX_PARAM.VALUE_RPM,
-            factor=1,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=500,
-            cyclic=True,
-            isPersistent=False
-        )
-
-        # PWM signal
-        self.pwm: Signale = Signale(
-            name="PWM",
-            value=0,
-            unite="%",
-            index=MSG_INDEX_PARAM.VALUE_PWM,
-            factor=1,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=500,
-            cyclic=True,
-            isPersistent=False
-        )
-
-        # Control method signal
-        self.controle_method: Signale = Signale(
-            name="Control Method",
-            value=0,
-            unite="",
-            index=MSG_INDEX_PARAM.VALUE_CONTROLE_METHOD,
-            factor=1,
-            offset=0,
-            allow_negative=False,
-            isRaw=True,
-            cycleTime=10000,
-            cyclic=False,
-            isPersistent=True
-        )
-
-        # Commutation signal
-        self.commutation: Signale = Signale(
-            name="Commutation",
-            value=0,
-            unite="",
-            index=MSG_INDEX_PARAM.VALUE_COMMUTATION,
-            factor=1,
-            offset=0,
-            allow_negative=False,
-            isRaw=True,
-            cycleTime=1000,
-            cyclic=False,
-            isPersistent=True
-        )
-
-        # Swish frequency signal
-        self.swish_freq: Signale = Signale(
-            name="Swish Freq",
-            value=0,
-            unite="Hz",
-            index=MSG_INDEX_PARAM.VALUE_SWISH_FREQ,
-            factor=1,
-            offset=0,
-            allow_negative=False,
-            isRaw=True,
-            cycleTime=1000,
-            cyclic=False,
-            isPersistent=True
-        )
-
-        # Enable signal
-        self.enable: Signale = Signale(
-            name="Enable",
-            value=0,
-            unite="",
-            index=MSG_INDEX_PARAM.VALUE_ENABLE,
-            factor=1,
-            offset=0,
-            allow_negative=False,
-            isRaw=True,
-            cycleTime=1000,
-            cyclic=False,
-            isPersistent=True,
-            noRetransmit=True
-        )
-
-        # PID controller signals
-        self.pwm_p: Signale = Signale(
-            name="PWM P",
-            value=0,
-            unite="",
-            index=MSG_INDEX_PARAM.VALUE_PWM_P,
-            factor=0.001,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=False,
-            isPersistent=True
-        )
-        self.pwm_i: Signale = Signale(
-            name="PWM I",
-            value=0,
-            unite="",
-            index=MSG_INDEX_PARAM.VALUE_PWM_I,
-            factor=0.001,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=False,
-            isPersistent=True
-        )
-        self.pwm_d: Signale = Signale(
-            name="PWM D",
-            value=0,
-            unite="",
-            index=MSG_INDEX_PARAM.VALUE_PWM_D,
-            factor=0.001,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=False,
-            isPersistent=True
-        )
-
-        # Remote PWM signal
-        self.remote_pwm: Signale = Signale(
-            name="Remote PWM",
-            value=0,
-            unite="%",
-            index=MSG_INDEX_PARAM.VALUE_REMOTE_PWM,
-            factor=1,
-            offset=0,
-            allow_negative=True,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=True,
-            isPersistent=True,
-            noRetransmit=True
-        )
-        self.remote_freq: Signale = Signale(
-            name="Remote Frequency",
-            value=0,
-            unite="Hz",
-            index=MSG_INDEX_PARAM.VALUE_REMOTE_FREQUENCY,
-            factor=0.001,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=True,
-            isPersistent=True,
-            noRetransmit=True
-        )
-        self.remote_imp: Signale = Signale(
-            name="Remote Impulse",
-            value=0,
-            unite="ms",
-            index=MSG_INDEX_PARAM.VALUE_REMOTE_IMPULSE,
-            factor=0.001,
-            offset=0,
-            allow_negative=False,
-            isRaw=False,
-            cycleTime=1000,
-            cyclic=True,
-            isPersistent=True,
-            noRetransmit=True
-        )
+        self.catalogue = catalogue if catalogue is not None else SignalCatalogue.load()
+        for key, fields in self.catalogue.definitions:
+            setattr(self, key, Signale(**fields))
+        self._register()
+
+    def _register(self) -> None:
+        # the lookups are built once, the receive path only indexes the table
+        self._signals = tuple(value for value in self.__dict__.values() if isinstance(value, Signale))
+        self.indexTable = [None] * INDEX_COUNT
+        self.table = SignalTable(self.catalogue)
+        for signal in self._signals:
+            self.indexTable[_enumValue(signal.index)] = signal
+            self.table.bind(signal)
+        self._byName = {signal.name: signal for signal in self._signals}
+
+    def byIndex(self, index: MSG_INDEX_PARAM | int) -> Signale | None:
+        """
+        Return the signal of an index.
+
+        Args:
+            index (MSG_INDEX_PARAM | int): The index or its value.
+
+        Returns:
+            Signale: The signal, None if there is none.
+        """
+        if isinstance(index, MSG_INDEX_PARAM):
+            index = index._value_
+        return self.indexTable[index] if 0 <= index < INDEX_COUNT else None
+
+    def byName(self, name: str) -> Signale | None:
+        """
+        Return the signal with the given name.
+
+        Args:
+            name (str): The name of the signal.
+
+        Returns:
+            Signale: The signal, None if there is none.
+        """
+        return self._byName.get(name)
+
+    def __len__(self):
+        return len(self._signals)
 
     def __iter__(self):
         """
         Return an iterator over the UART signals.
         """
-        for attr, value in self.__dict__.items():
-            yield value
+        return iter(self._signals)
 
 @dataclasses.dataclass
 class SystemData:
@@ -489,7 +369,7 @@ class SystemData:
     updateSignalsAtConnect : bool
         Whether to update signals at connection (default is True).
     """
-    uartSignals: UARTSignals = UARTSignals()
+    uartSignals: UARTSignals = dataclasses.field(default_factory=UARTSignals)
     target_current: float = 0.0
     target_rpm: int = 0
     target_pwm: int = 0
@@ -0,0 +1,144 @@
+""" device.py
+
+This module bundles everything which belongs to one connected inverter: its
+signals, its UartHelper and the recorded plot data. Several devices can be
+connected at the same time, the GUI shows the selected one.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import logging
+from moduls.dataClasses import SystemData
+
+logger = logging.getLogger(__name__)
+
+
+class PlotBuffers:
+    """
+    The recorded plot data of one device.
+
+    Attributes:
+        timeStamp (list): The sample number of every sample.
+        current0 (list): The DC current.
+        currentA (list): The phase A current.
+        currentB (list): The phase B current.
+        currentC (list): The phase C current.
+        rpmTarget (list): The target RPM.
+        rpmActual (list): The actual RPM.
+        pwmTarget (list): The target PWM.
+        pwmActual (list): The actual PWM.
+        currentMin (float): The smallest current so far.
+        currentMax (float): The largest current so far.
+        rpmMin (float): The smallest RPM so far.
+        rpmMax (float): The largest RPM so far.
+        pwmMin (float): The smallest PWM so far.
+        pwmMax (float): The largest PWM so far.
+
+    Methods:
+        append(value0, valueA, valueB, valueC, rpmTarget, rpmActual, pwmTarget, pwmActual): Adds one sample.
+        appendData(data): Adds one sample of the current values of a SystemData.
+        clear(): Drops all samples.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the PlotBuffers class.
+        """
+        self.timeStamp = [0]
+        self.current0 = [0]
+        self.currentA = [0]
+        self.currentB = [0]
+        self.currentC = [0]
+        self.rpmTarget = [0]
+        self.rpmActual = [0]
+        self.pwmTarget = [0]
+        self.pwmActual = [0]
+        self.currentMin = 0.0
+        self.currentMax = 0.0
+        self.rpmMin = 0.0
+        self.rpmMax = 0.0
+        self.pwmMin = 0.0
+        self.pwmMax = 0.0
+
+    def append(self, value0: float, valueA: float, valueB: float, valueC: float,
+               rpmTarget: float, rpmActual: float, pwmTarget: float, pwmActual: float) -> None:
+        """Adds one sample.
+
+        Args:
+            value0 (float): The DC current.
+            valueA (float): The phase A current.
+            valueB (float): The phase B current.
+            valueC (float): The phase C current.
+            rpmTarget (float): The target RPM.
+            rpmActual (float): The actual RPM.
+            pwmTarget (float): The target PWM.
+            pwmActual (float): The actual PWM.
+        """
+        # just increment the time stamp, no real time (for now)
+        self.timeStamp.append(self.timeStamp[-1] + 1 if self.timeStamp else 0)
+        self.current0.append(value0)
+        self.currentA.append(valueA)
+        self.currentB.append(valueB)
+        self.currentC.append(valueC)
+        self.rpmTarget.append(rpmTarget)
+        self.rpmActual.append(rpmActual)
+        self.pwmTarget.append(pwmTarget)
+        self.pwmActual.append(pwmActual)
+        self.currentMax = max(self.currentMax, valueA, valueB, valueC, value0)
+        self.currentMin = min(self.currentMin, valueA, valueB, valueC, value0)
+        self.rpmMax = max(self.rpmMax, rpmTarget, rpmActual)
+        self.rpmMin = min(self.rpmMin, rpmTarget, rpmActual)
+        self.pwmMax = max(self.pwmMax, pwmTarget, pwmActual)
+        self.pwmMin = min(self.pwmMin, pwmTarget, pwmActual)
+
+    def appendData(self, data: SystemData) -> None:
+        """Adds one sample of the current values of a SystemData.
+
+        Args:
+            data (SystemData): The data of the device.
+        """
+        signals = data.uartSignals
+        self.append(signals.current_0.value, signals.current_a.value, signals.current_b.value,
+                    signals.current_c.value, data.target_rpm, signals.rpm.value,
+                    data.target_pwm, signals.pwm.value)
+
+    def clear(self) -> None:
+        """Drops all samples.
+        """
+        for samples in (self.timeStamp, self.current0, self.currentA, self.currentB, self.currentC,
+                        self.rpmTarget, self.rpmActual, self.pwmTarget, self.pwmActual):
+            samples.clear()
+        self.currentMin = self.currentMax = 0.0
+        self.rpmMin = self.rpmMax = 0.0
+        self.pwmMin = self.pwmMax = 0.0
+
+
+class Device:
+    """
+    One connected inverter.
+
+    Attributes:
+        name (str): The name shown in the GUI.
+        systemData (SystemData): The signals and targets of the device.
+        uart (UartHelper): The serial communication of the device.
+        plots (PlotBuffers): The recorded plot data of the device.
+        port (str): The last selected serial port.
+    """
+
+    def __init__(self, name: str, uart, systemData: SystemData) -> None:
+        """
+        Initialize the Device class.
+
+        Args:
+            name (str): The name shown in the GUI.
+            uart (UartHelper): The serial communication of the device.
+            systemData (SystemData): The signals and targets of the device.
+        """
+        self.name = name
+        self.uart = uart
+        self.systemData = systemData
+        self.plots = PlotBuffers()
+        self.port = None
@@ -0,0 +1,131 @@
+""" frameBatch.py
+
+This module collects the frames which are sent together into one preallocated
+buffer, so they reach the serial port with a single write call. The
+READ_REQUEST frames never change, they are encoded once per parameter index and
+copied from a cache.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import logging
+from moduls.uartDefines import UART_Message, UART_Message_Frame, MSG_Type, MSG_INDEX_PARAM, MESSAGE_ID_TABLE, INDEX_COUNT
+from moduls.frameDecoder import FRAME_SIZE
+from moduls.checksum import Checksum
+
+logger = logging.getLogger(__name__)
+
+
+class FrameBatch:
+    """
+    Preallocated transmit buffer for several frames.
+
+    Attributes:
+        capacity (int): The maximum number of frames in the buffer.
+        checksum (Checksum): The checksum of the encoded frames.
+        count (int): The number of frames in the buffer.
+        requests (list): The (type, index) of every frame in the buffer.
+
+    Methods:
+        readRequest(index) -> bytes: Returns the cached READ_REQUEST frame of an index.
+        add(message) -> bool: Encodes a message into the buffer.
+        addReadRequest(index) -> bool: Copies a cached READ_REQUEST frame into the buffer.
+        isFull() -> bool: Checks if the buffer is full.
+        data() -> memoryview: Returns the frames in the buffer.
+        clear(): Empties the buffer.
+    """
+
+    def __init__(self, checksum: Checksum = None, capacity: int = 64) -> None:
+        """
+        Initialize the FrameBatch class.
+
+        Args:
+            checksum (Checksum, optional): The frame checksum. Defaults to XorChecksum.
+            capacity (int): The maximum number of frames in the buffer. Defaults to 64.
+        """
+        self.capacity = capacity
+        self.checksum = checksum if checksum is not None else UART_Message_Frame.checksum
+        self.count = 0
+        self.requests = []
+        self._buffer = bytearray(capacity * FRAME_SIZE)
+        self._view = memoryview(self._buffer)
+        # keyed like the signals, the MSG_INDEX_PARAM member or the integer of an unknown index
+        indices = (MESSAGE_ID_TABLE[(MSG_Type.READ_REQUEST.value << 6) | value][1] for value in range(INDEX_COUNT))
+        self._readRequests = {index: UART_Message_Frame(UART_Message(type=MSG_Type.READ_REQUEST, index=index),
+                                                        self.checksum).encode()
+                              for index in indices}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def readRequest(self, index: MSG_INDEX_PARAM | int) -> bytes:
+        """Returns the cached READ_REQUEST frame of an index.
+
+        Args:
+            index (MSG_INDEX_PARAM | int): The index to request.
+
+        Returns:
+            bytes: The encoded frame.
+        """
+        return self._readRequests[index]
+
+    def isFull(self) -> bool:
+        """Checks if the buffer is full.
+
+        Returns:
+            bool: True if no further frame fits into the buffer.
+        """
+        return self.count >= self.capacity
+
+    def add(self, message: UART_Message) -> bool:
+        """Encodes a message into the buffer.
+
+        Args:
+            message (UART_Message): The message to send.
+
+        Returns:
+            bool: False if the buffer is full.
+        """
+        if (message.type == MSG_Type.READ_REQUEST and message.index in self._readRequests
+                and not message.getPayloadUnsigned()):
+            return self.addReadRequest(message.index)
+        if self.count >= self.capacity:
+            return False
+        UART_Message_Frame(message, self.checksum).encodeInto(self._buffer, self.count * FRAME_SIZE)
+        self.count += 1
+        self.requests.append((message.type, message.index))
+        return True
+
+    def addReadRequest(self, index: MSG_INDEX_PARAM | int) -> bool:
+        """Copies the cached READ_REQUEST frame of an index into the buffer.
+
+        Args:
+            index (MSG_INDEX_PARAM | int): The index to request.
+
+        Returns:
+            bool: False if the buffer is full.
+        """
+        if self.count >= self.capacity:
+            return False
+        offset = self.count * FRAME_SIZE
+        self._buffer[offset:offset + FRAME_SIZE] = self._readRequests[index]
+        self.count += 1
+        self.requests.append((MSG_Type.READ_REQUEST, index))
+        return True
+
+    def data(self) -> memoryview:
+        """Returns the frames in the buffer.
+
+        Returns:
+            memoryview: The encoded frames, only valid until the next change.
+        """
+        return self._view[:self.count * FRAME_SIZE]
+
+    def clear(self) -> None:
+        """Empties the buffer.
+        """
+        self.count = 0
+        self.requests.clear()
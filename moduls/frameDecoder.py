@@ -0,0 +1,221 @@
+""" frameDecoder.py
+
+This module provides a batch decoder for the UART receive path.
+Instead of searching, unpacking and validating one frame at a time, the
+FrameDecoder looks at every possible frame offset of the receive buffer at once
+and returns all complete, valid frames as compact NumPy arrays.
+
+The result is identical to feeding the same buffer frame by frame through
+UART_Message_Frame.decode() and UART_Message_Frame.isValide().
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import dataclasses
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from moduls.checksum import Checksum, XorChecksum
+from moduls.uartDefines import UART_Message_Frame, RxMessage, MESSAGE_ID_TABLE
+
+FRAME_SIZE = len(UART_Message_Frame())
+
+_START_BYTE = UART_Message_Frame._start_byte_Default
+_END_BYTE = UART_Message_Frame._end_byte_Default
+
+# marks every valid message ID byte
+_VALID_ID = np.array([valid for _, _, valid in MESSAGE_ID_TABLE], dtype=bool)
+
+
+@dataclasses.dataclass
+class DecodedFrames:
+    """
+    Data class for the result of a batch decode.
+
+    Attributes:
+        offsets (np.ndarray): The start offset of each frame in the buffer.
+        types (np.ndarray): The message type of each frame (uint8).
+        indices (np.ndarray): The message index of each frame (uint8).
+        payloads (np.ndarray): The raw big endian payload of each frame (uint16).
+        consumed (int): The number of bytes which can be dropped from the buffer.
+        discarded (int): The number of consumed bytes which did not belong to a valid frame.
+        ids (np.ndarray): The message ID byte of each frame (uint8), None to derive it from types and indices.
+
+    Methods:
+        __len__(): Returns the number of decoded frames.
+        payloadsSigned(): Returns the payloads as signed integers.
+        messages(rxTimestamp): Returns the decoded frames as RxMessage records.
+    """
+    offsets: np.ndarray
+    types: np.ndarray
+    indices: np.ndarray
+    payloads: np.ndarray
+    consumed: int = 0
+    discarded: int = 0
+    ids: np.ndarray = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def payloadsSigned(self) -> np.ndarray:
+        """Returns the payloads as signed integers.
+
+        Returns:
+            np.ndarray: The payloads reinterpreted as int16.
+        """
+        return self.payloads.view(np.int16)
+
+    def messages(self, rxTimestamp: int = 0) -> list:
+        """Returns the decoded frames as RxMessage records.
+
+        Args:
+            rxTimestamp (int): The receive time in nanoseconds stored in every record.
+
+        Returns:
+            list: A list of RxMessage records in receive order.
+        """
+        ids = self.ids if self.ids is not None else (self.types << 6) | self.indices
+        table = MESSAGE_ID_TABLE
+        return [RxMessage(table[id][0], table[id][1], payload, rxTimestamp)
+                for id, payload in zip(ids.tolist(), self.payloads.tolist())]
+
+
+class FrameDecoder:
+    """
+    Class for decoding all frames of a receive buffer in one pass.
+
+    Attributes:
+        checksum (Checksum): The checksum used to validate the frames.
+        validIds (np.ndarray): True per accepted message ID byte.
+
+    Methods:
+        decode(data): Finds, validates and decodes every complete frame in data.
+    """
+
+    # below this buffer size in bytes the fixed cost of the NumPy calls is larger than a frame by frame scan
+    _vectorThreshold = 24 * FRAME_SIZE
+
+    def __init__(self, checksum: Checksum = None, validIds: np.ndarray = None) -> None:
+        """
+        Initialize the FrameDecoder class.
+
+        Args:
+            checksum (Checksum, optional): The checksum to validate. Defaults to XorChecksum.
+            validIds (np.ndarray, optional): True per accepted message ID byte, e.g. the
+                validIds of a SignalCatalogue. Defaults to the IDs of MSG_INDEX_PARAM and MSG_INDEX_STATUS.
+        """
+        self.checksum = checksum if checksum is not None else XorChecksum()
+        self.validIds = validIds if validIds is not None else _VALID_ID
+        self._validIdList = self.validIds.tolist()
+
+    def decode(self, data) -> DecodedFrames:
+        """Finds, validates and decodes every complete frame in data.
+
+        Frames are accepted with the same rules as the per frame path: the first
+        valid frame at or after the current position is taken, invalid start bytes
+        are skipped one byte at a time.
+
+        Args:
+            data (bytes | bytearray | memoryview): The received data.
+
+        Returns:
+            DecodedFrames: The decoded frames and the number of consumed bytes.
+        """
+        if len(data) < self._vectorThreshold:
+            return self._decodeScalar(bytes(data))
+        buf = np.frombuffer(data, dtype=np.uint8)
+        size = len(buf)
+        candidates = size - FRAME_SIZE + 1
+        if candidates <= 0:
+            offsets = np.empty(0, dtype=np.intp)
+        else:
+            # one row per candidate offset, no copy
+            frames = sliding_window_view(buf, FRAME_SIZE)
+            msgId = frames[:, 1]
+            valid = ((frames[:, 0] == _START_BYTE)
+                     & (frames[:, 5] == _END_BYTE)
+                     & self.validIds[msgId])
+            # only calculate the checksum where the framing already matches
+            framed = np.flatnonzero(valid)
+            crcOk = self.checksum.computeBatch(frames[framed, 1:4]) == frames[framed, 4]
+            offsets = framed[crcOk]
+            if len(offsets) > 1 and np.any(np.diff(offsets) < FRAME_SIZE):
+                offsets = self._dropOverlapping(offsets)
+
+        # keep everything from the first start byte whose frame is not complete yet
+        end = int(offsets[-1]) + FRAME_SIZE if len(offsets) else 0
+        pending = np.flatnonzero(buf[max(end, candidates):] == _START_BYTE)
+        consumed = max(end, candidates) + int(pending[0]) if len(pending) else size
+
+        ids = buf[offsets + 1]
+        payloads = (buf[offsets + 2].astype(np.uint16) << 8) | buf[offsets + 3]
+        return DecodedFrames(offsets=offsets,
+                             types=ids >> 6,
+                             indices=ids & 0x3F,
+                             payloads=payloads,
+                             consumed=consumed,
+                             discarded=consumed - len(offsets) * FRAME_SIZE,
+                             ids=ids)
+
+    def _decodeScalar(self, data: bytes) -> DecodedFrames:
+        """Decodes a short buffer frame by frame with the same rules as decode().
+
+        The serial reader returns as soon as one frame arrived, so most buffers
+        only hold a few frames.
+
+        Args:
+            data (bytes): The received data.
+
+        Returns:
+            DecodedFrames: The decoded frames and the number of consumed bytes.
+        """
+        size = len(data)
+        last = size - FRAME_SIZE
+        validIds = self._validIdList
+        compute = self.checksum.compute
+        offsets = []
+        ids = []
+        payloads = []
+        pos = data.find(_START_BYTE)
+        while 0 <= pos <= last:
+            if (data[pos + 5] == _END_BYTE and validIds[data[pos + 1]]
+                    and compute(data[pos + 1:pos + 4]) == data[pos + 4]):
+                offsets.append(pos)
+                ids.append(data[pos + 1])
+                payloads.append((data[pos + 2] << 8) | data[pos + 3])
+                pos = data.find(_START_BYTE, pos + FRAME_SIZE)
+            else:
+                pos = data.find(_START_BYTE, pos + 1)
+
+        # keep everything from the first start byte whose frame is not complete yet
+        end = offsets[-1] + FRAME_SIZE if offsets else 0
+        pending = data.find(_START_BYTE, max(end, last + 1, 0))
+        consumed = pending if pending >= 0 else size
+        # plain lists and np.array(), a NumPy operation costs more than the whole scan of a frame
+        return DecodedFrames(offsets=np.array(offsets, dtype=np.intp),
+                             types=np.array([id >> 6 for id in ids], dtype=np.uint8),
+                             indices=np.array([id & 0x3F for id in ids], dtype=np.uint8),
+                             payloads=np.array(payloads, dtype=np.uint16),
+                             consumed=consumed,
+                             discarded=consumed - len(offsets) * FRAME_SIZE,
+                             ids=np.array(ids, dtype=np.uint8))
+
+    @staticmethod
+    def _dropOverlapping(offsets: np.ndarray) -> np.ndarray:
+        """Removes valid frames which start inside a previously accepted frame.
+
+        Args:
+            offsets (np.ndarray): The sorted offsets of all valid frames.
+
+        Returns:
+            np.ndarray: The offsets of the frames which are actually accepted.
+        """
+        keep = []
+        nextFree = 0
+        for offset in offsets.tolist():
+            if offset >= nextFree:
+                keep.append(offset)
+                nextFree = offset + FRAME_SIZE
+        return np.array(keep, dtype=np.intp)
@@ -10,12 +10,15 @@ It uses the DearPyGui library for GUI rendering and the UartHelper class for UAR
 
 __version__ = "0.0.2"
 
-from .uartHelper import  UartHelper
 from .dataClasses import SystemData
+from .device import Device
 from .uartDefines import CommutationsTypeValues, SwishFrequencyValues, ControlMethodValues, UpdateRates
+from .latencyHistogram import LATENCY_BUCKETS_MS
+from .writeTransaction import WriteState
 import dearpygui.dearpygui as dpg
 import dearpygui.demo as demo
 import logging
+import time
 
 
 logger = logging.getLogger(__name__)
@@ -36,49 +39,39 @@ class GuiHelper():
         The maximum RPM value.
     _timeDisplayed : int
         The amount of time to display in the plots.
-    _timeStamp : list
-        A list of timestamps for the plots.
-    _currentList0 : list
-        A list of current values for phase 0.
-    _currentListA : list
-        A list of current values for phase A.
-    _currentListB : list
-        A list of current values for phase B.
-    _currentListC : list
-        A list of current values for phase C.
-    _pwmListActual : list
-        A list of actual PWM values.
-    _pwmListTarget : list
-        A list of target PWM values.
-    _rpmListActual : list
-        A list of actual RPM values.
-    _rpmListTarget : list
-        A list of target RPM values.
-    _currenMax : float
-        The maximum current value.
-    _currenMin : float
-        The minimum current value.
-    _rpmMax : float
-        The maximum RPM value.
-    _rpmMin : float
-        The minimum RPM value.
-    _pwmMax : float
-        The maximum PWM value.
-    _pwmMin : float
-        The minimum PWM value.
+    _devices : list
+        The connected devices.
+    _device : Device
+        The device shown in the GUI.
+    _plots : PlotBuffers
+        The recorded plot data of the shown device.
+    _compareSignals : dict
+        The plot data shown in the compare window, by label.
+    requiredSignals : tuple
+        The keys of the UARTSignals the GUI and the plot data use, every signal catalogue needs them.
+    _latencyUpdateInterval : float
+        Seconds between two updates of the latency window.
+    _writeStateColors : dict
+        The text color of every write state in the signal viewer.
 
     Methods:
     --------
-    __init__(uartHelper: UartHelper, systemData: SystemData) -> None:
+    __init__(devices: list) -> None:
         Initialize the GuiHelper class.
     
+    selectDevice(device: Device) -> None:
+        Show the given device in the GUI.
+    
+    connectTo(instance: str) -> bool:
+        Connect to the given instance, same as selecting it and pressing Connect.
+    
     writeLog(msg: str, Tx: bool = False, Rx: bool = False) -> None:
         Write a log message to the GUI.
     
     abentToPlot(value0: float, valueA: float, valueB: float, valueC: float, rpmTarget: float, rpmActual: float, pwmTarget: float, pwmActual: float) -> None:
         Update the plots with new values.
     
-    startGui() -> None:
+    startGui(headless: bool = False, eventLoop: bool = False) -> None:
         Initialize and start the GUI.
     
     isGuiRunning() -> bool:
@@ -87,33 +80,32 @@ class GuiHelper():
     updateData(data: SystemData) -> None:
         Update the data in the GUI.
     
+    updateDevices() -> None:
+        Record the data of all connected devices and update the GUI with the shown one.
+    
     renderWindow() -> None:
         Render a new frame in the GUI.
     
+    runCallbacks() -> None:
+        Run the queued item callbacks when they are run from the event loop.
+    
     cleanUp() -> None:
         Clean up the GUI context.
     """
-    _systemData = SystemData()
     _uartInstances:list = []
     _minRPM = 1000
     _maxRPM = 30000
     _timeDisplayed = 400
     
-    _timeStamp:list = [0]
-    _currentList0:list = [0]
-    _currentListA:list = [0]
-    _currentListB:list = [0]
-    _currentListC:list = [0]
-    _pwmListActual:list = [0]
-    _pwmListTarget:list = [0]
-    _rpmListActual:list = [0]
-    _rpmListTarget:list = [0]
-    _currenMax:float = 0.0
-    _currenMin:float = 0.0
-    _rpmMax:float = 0.0
-    _rpmMin:float = 0.0
-    _pwmMax:float = 0.0
-    _pwmMin:float = 0.0
+    _latencyUpdateInterval:float = 0.5
+    _latencyLastUpdate:float = 0.0
+    # (value, uart, count of the urgent latencies before the write) of a start or stop which is not reported yet
+    _urgentReport:tuple = None
+    _writeStateColors:dict = {WriteState.PENDING: (255, 200, 0), WriteState.ACKED: (0, 200, 0), WriteState.FAILED: (255, 60, 60)}
+    _compareSignals:dict = {"RPM": "rpmActual", "PWM": "pwmActual", "Current DC": "current0",
+                            "Current A": "currentA", "Current B": "currentB", "Current C": "currentC"}
+    requiredSignals:tuple = ("rpm", "pwm", "enable", "current_0", "current_a", "current_b", "current_c",
+                             "controle_method", "commutation", "swish_freq", "pwm_p", "pwm_i", "pwm_d")
     
 ########################################################################   
 # Private calsses
@@ -121,6 +113,43 @@ class GuiHelper():
     def _print_me(self, sender):
         logger.info(f"Menu Item: {sender}")
     
+    def _toggleCapture(self, sender, app_data):
+        if app_data:
+            path = f"capture_{time.strftime('%Y%m%d_%H%M%S')}.bldccap"
+            self.uartHelper.startCapture(path)
+            self.writeLog(f"Recording capture to {path}")
+        else:
+            self.uartHelper.stopCapture()
+            self.writeLog("Capture stopped")
+    
+    def _exportLatency(self, sender):
+        path = f"latency_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        names = {signal.index: signal.name for signal in self._systemData.uartSignals}
+        self.uartHelper.latency.export(path, names)
+        self.writeLog(f"Latency statistics written to {path}")
+    
+    def _readoutFinished(self, readout, device):
+        msg = f"{self._logPrefix(device)}Read {len(readout.answered)} of {readout.total} parameters in {readout.duration * 1000:.0f} ms"
+        if readout.failed:
+            byIndex = device.systemData.uartSignals.byIndex
+            msg += f", no response: {', '.join(byIndex(index).name if byIndex(index) else str(index) for index in readout.failed)}"
+        self.writeLog(msg)
+    
+    def _logPrefix(self, device):
+        return f"{device.name}: " if len(self._devices) > 1 else ""
+    
+    def _selectDevice(self, sender, app_data):
+        for device in self._devices:
+            if device.name == app_data:
+                self.selectDevice(device)
+    
+    def _resetLatencyUpdate(self, sender):
+        self._latencyLastUpdate = 0.0
+    
+    def _resetLatency(self, sender):
+        self.uartHelper.latency.reset()
+        self._latencyLastUpdate = 0.0
+        
     def _save_init(self):
         dpg.save_init_file("dpg.ini")
         
@@ -132,18 +161,11 @@ class GuiHelper():
         buttonLabel = dpg.get_item_label(sender)
         logger.info(f"presst button: {sender = } {buttonLabel = }")
         if buttonLabel == "Connect":
-            instance = dpg.get_value("uart_combo")
-            ret = self.uartHelper.connect(instance, self._systemData.updateSignalsAtConnect)
-            if ret:
-                # connected to host.
-                self.writeLog("Connected to host")
-                dpg.set_item_label(item=sender, label="Disconnect")
-                if dpg.get_value("check_update_all"):
-                    self._updateUartSignals()
+            self.connectTo(dpg.get_value("uart_combo"))
         else:
             ret = self.uartHelper.disconnect()
             if ret:
-                self.writeLog("Disconnected from host")
+                self.writeLog(f"{self._logPrefix(self._device)}Disconnected from host")
                 # connected to host.
                 dpg.set_item_label(item=sender, label="Connect")
                 dpg.set_axis_limits_auto(self._curetn_Yaxis)
@@ -200,85 +222,131 @@ class GuiHelper():
         self._systemData.uartSignals.controle_method.write(ControlMethodValues[value])
 
         
-    def _updateCurrentPlot(self, valueA, valueB, valueC, value0):
-        self._currenMax = max([self._currenMax, valueA, valueB, valueC, value0])
-        self._currenMin = min([self._currenMin, valueA, valueB, valueC, value0])
-        self._currentList0.append(value0)
-        self._currentListA.append(valueA)
-        self._currentListB.append(valueB)
-        self._currentListC.append(valueC)
-        dpg.set_value('plot_current_0', [self._timeStamp, self._currentList0])
-        dpg.set_value('plot_current_a', [self._timeStamp, self._currentListA])
-        dpg.set_value('plot_current_b', [self._timeStamp, self._currentListB])
-        dpg.set_value('plot_current_c', [self._timeStamp, self._currentListC])
-        dpg.set_axis_limits(self._curetn_Yaxis, self._currenMin*1.05, self._currenMax*1.05)
+    def _updateCurrentPlot(self):
+        plots = self._plots
+        dpg.set_value('plot_current_0', [plots.timeStamp, plots.current0])
+        dpg.set_value('plot_current_a', [plots.timeStamp, plots.currentA])
+        dpg.set_value('plot_current_b', [plots.timeStamp, plots.currentB])
+        dpg.set_value('plot_current_c', [plots.timeStamp, plots.currentC])
+        dpg.set_axis_limits(self._curetn_Yaxis, plots.currentMin*1.05, plots.currentMax*1.05)
         
     
-    def _updateRpmPlot(self, target, actual):
-        self._rpmMax = max([self._rpmMax, target, actual])
-        self._rpmMin = min([self._rpmMin, target, actual])
-        self._rpmListTarget.append(target)
-        self._rpmListActual.append(actual)
-        dpg.set_value('plot_rpm_target', [self._timeStamp, self._rpmListTarget])
-        dpg.set_value('plot_rpm_actual', [self._timeStamp, self._rpmListActual])
-        dpg.set_axis_limits(self._rpm_Yaxis, self._rpmMin*1.05, self._rpmMax*1.05)
-        
-    def _updatePwmPlot(self, target, actual):
-        self._pwmMax = max([self._pwmMax, target, actual])
-        self._pwmMin = min([self._pwmMin, target, actual])
-        self._pwmListTarget.append(target)
-        self._pwmListActual.append(actual)
-        dpg.set_value('plot_pwm_target', [self._timeStamp, self._pwmListTarget])
-        dpg.set_value('plot_pwm_actual', [self._timeStamp, self._pwmListActual])
-        dpg.set_axis_limits(self._pwm_Yaxis, self._pwmMin*1.05, self._pwmMax*1.05)
+    def _updateRpmPlot(self):
+        plots = self._plots
+        dpg.set_value('plot_rpm_target', [plots.timeStamp, plots.rpmTarget])
+        dpg.set_value('plot_rpm_actual', [plots.timeStamp, plots.rpmActual])
+        dpg.set_axis_limits(self._rpm_Yaxis, plots.rpmMin*1.05, plots.rpmMax*1.05)
+        
+    def _updatePwmPlot(self):
+        plots = self._plots
+        dpg.set_value('plot_pwm_target', [plots.timeStamp, plots.pwmTarget])
+        dpg.set_value('plot_pwm_actual', [plots.timeStamp, plots.pwmActual])
+        dpg.set_axis_limits(self._pwm_Yaxis, plots.pwmMin*1.05, plots.pwmMax*1.05)
         
     def _clearPlots(self):
-        self._timeStamp.clear()
-        self._currentList0.clear()
-        self._currentListA.clear()
-        self._currentListB.clear()
-        self._currentListC.clear()
-        self._pwmListActual.clear()
-        self._pwmListTarget.clear()
-        self._rpmListActual.clear()
-        self._rpmListTarget.clear()
-        self._currenMax = 0.0
-        self._currenMin = 0.0
-        self._rpmMax = 0.0
-        self._rpmMin = 0.0
-        self._pwmMax = 0.0
-        self._pwmMin = 0.0
+        self._plots.clear()
         
     
     def _updateTimeAxis(self):
-        # just increment the time stamp, no real time (for now)
-        if len(self._timeStamp) == 0:
-            self._timeStamp.append(0)
-        else:
-            self._timeStamp.append(self._timeStamp[-1]+1)
-        # self._timeStamp.append(time.time())
-        arraySize = len(self._timeStamp)
+        timeStamp = self._plots.timeStamp
+        arraySize = len(timeStamp)
+        if arraySize == 0:
+            return
         if arraySize > self._timeDisplayed:
-            dpg.set_axis_limits(self._curetn_Xaxis, self._timeStamp[arraySize-self._timeDisplayed] , self._timeStamp[-1])
-            dpg.set_axis_limits(self._rpm_Xaxis, self._timeStamp[arraySize-self._timeDisplayed] , self._timeStamp[-1])
-            dpg.set_axis_limits(self._pwm_Xaxis, self._timeStamp[arraySize-self._timeDisplayed] , self._timeStamp[-1])
+            dpg.set_axis_limits(self._curetn_Xaxis, timeStamp[arraySize-self._timeDisplayed] , timeStamp[-1])
+            dpg.set_axis_limits(self._rpm_Xaxis, timeStamp[arraySize-self._timeDisplayed] , timeStamp[-1])
+            dpg.set_axis_limits(self._pwm_Xaxis, timeStamp[arraySize-self._timeDisplayed] , timeStamp[-1])
         else:
-            dpg.set_axis_limits(self._curetn_Xaxis, self._timeStamp[0] , self._timeStamp[-1])
-            dpg.set_axis_limits(self._rpm_Xaxis, self._timeStamp[0] , self._timeStamp[-1])
-            dpg.set_axis_limits(self._pwm_Xaxis, self._timeStamp[0] , self._timeStamp[-1])
+            dpg.set_axis_limits(self._curetn_Xaxis, timeStamp[0] , timeStamp[-1])
+            dpg.set_axis_limits(self._rpm_Xaxis, timeStamp[0] , timeStamp[-1])
+            dpg.set_axis_limits(self._pwm_Xaxis, timeStamp[0] , timeStamp[-1])
+    
+    def _updatePlots(self):
+        self._updateTimeAxis()
+        self._updateCurrentPlot()
+        self._updateRpmPlot()
+        self._updatePwmPlot()
+    
+    def _updateCompareWindow(self):
+        if not dpg.is_item_shown("compare_window"):
+            return
+        attribute = self._compareSignals[dpg.get_value("compare_combo")]
+        last = 0
+        for i, device in enumerate(self._devices):
+            plots = device.plots
+            dpg.set_value(f"compare_{i}", [plots.timeStamp, getattr(plots, attribute)])
+            if plots.timeStamp:
+                last = max(last, plots.timeStamp[-1])
+        dpg.set_axis_limits(self._compare_Xaxis, max(last - self._timeDisplayed, 0), last)
+        dpg.fit_axis_data(self._compare_Yaxis)
         
     def _updateInfoTable(self):
+        writes = self.uartHelper.writes
         for signal in self._systemData.uartSignals:
             if type(signal.value) == float:
                 dpg.set_value(f"info_{signal.name}", round(signal.value,3))
             else:
                 dpg.set_value(f"info_{signal.name}", signal.value)
+            state = writes.state(signal.index)
+            if state is not None:
+                dpg.set_value(f"write_{signal.name}", state.name.lower())
+                dpg.configure_item(f"write_{signal.name}", color=self._writeStateColors[state])
+            
+    def _updateLatencyWindow(self):
+        now = time.monotonic()
+        if now - self._latencyLastUpdate < self._latencyUpdateInterval or not dpg.is_item_shown("latency_window"):
+            return
+        self._latencyLastUpdate = now
+        tracker = self.uartHelper.latency
+        tracker.checkTimeouts()
+        selected = dpg.get_value("latency_combo")
+        schedule = self.uartHelper.scheduler.jobs
+        dpg.set_value("write_stats_text", f"Writes: {self.uartHelper.scheduler.coalescedWrites} coalesced, "
+                                          f"{self.uartHelper.writes.retransmitted} repeated")
+        urgent = self.uartHelper.urgentLatency
+        dpg.set_value("urgent_stats_text", f"Start/Stop to wire: {urgent.count} writes, "
+                                           f"mean {urgent.mean() * 1000:.0f} us, max {urgent.maximum / 1e3:.0f} us")
+        for signal in self._systemData.uartSignals:
+            job = schedule.get(signal.index)
+            if job is not None:
+                dpg.set_value(f"latency_{signal.name}_period", f"{job.periodMs():.1f}")
+                dpg.set_value(f"latency_{signal.name}_jitter", f"{job.jitterMs():.2f}")
+            else:
+                # not polled cyclically (any more)
+                dpg.set_value(f"latency_{signal.name}_period", "0")
+                dpg.set_value(f"latency_{signal.name}_jitter", "0")
+            histogram = tracker.histograms.get(signal.index)
+            if histogram is None:
+                continue
+            dpg.set_value(f"latency_{signal.name}_count", histogram.count)
+            dpg.set_value(f"latency_{signal.name}_p50", f"{histogram.percentile(0.5):g}")
+            dpg.set_value(f"latency_{signal.name}_p99", f"{histogram.percentile(0.99):g}")
+            dpg.set_value(f"latency_{signal.name}_max", f"{histogram.maximum / 1e6:.1f}")
+            dpg.set_value(f"latency_{signal.name}_timeouts", histogram.timeouts)
+            if signal.name == selected:
+                dpg.set_value("latency_bars", [list(range(len(histogram.counts))), list(histogram.counts)])
+                dpg.set_axis_limits_auto(self._latency_Yaxis)
             
     def _updateUartSignals(self):
         for signal in self._systemData.uartSignals:
             signal.cyclic = dpg.get_value(f"check_{signal.name}")
             cycleTime = dpg.get_value(f"combo_{signal.name}")
             signal.cycleTime = UpdateRates[cycleTime]
+        changes = self.uartHelper.rescheduleSignals(dpg.get_value("check_link_budget"))
+        rateNames = {rate: name for name, rate in UpdateRates.items()}
+        for signal, old, new in changes:
+            dpg.set_value(f"combo_{signal.name}", rateNames[new])
+            self.writeLog(f"Link overloaded, {signal.name} slowed down to {rateNames[new]}")
+        self._updateLinkLoad()
+    
+    def _updateLinkLoad(self, sender=None):
+        budget = self.uartHelper.linkBudget
+        settings = [(dpg.get_value(f"check_{signal.name}"), UpdateRates[dpg.get_value(f"combo_{signal.name}")])
+                    for signal in self._systemData.uartSignals]
+        load = budget.bytesPerSecond(settings)
+        utilisation = load / budget.capacity()
+        dpg.set_value("link_load_text", f"Link load: {utilisation:.0%} ({load:.0f} of {budget.capacity():.0f} B/s)")
+        dpg.configure_item("link_load_text", color=(255, 80, 80) if utilisation > budget.threshold else (255, 255, 255))
             
     def _openAboutModal(self, sender):
         with dpg.window(label="About", width=350, height=200, modal=True,
@@ -300,6 +368,21 @@ class GuiHelper():
         self._systemData.uartSignals.rpm.write(value)
         logger.debug(f"Update RPM to: {value}")
 
+    def _writeEnable(self, value):
+        uart = self.uartHelper
+        self._urgentReport = (value, uart, uart.urgentLatency.count)
+        self._systemData.uartSignals.enable.write(value)
+        self._reportUrgent()
+
+    def _reportUrgent(self):
+        # the SerialProcess sends the latency with the next statistics of the engine
+        if self._urgentReport is None:
+            return
+        value, uart, sent = self._urgentReport
+        if uart.urgentLatency.count > sent:
+            self._urgentReport = None
+            self.writeLog(f"{'Start' if value else 'Stop'} on the wire after {uart.lastUrgentLatency / 1e3:.0f} us", Tx=True)
+        
     def _writePwm(self, sender):
         value = dpg.get_value(sender)
         self._systemData.target_pwm = value
@@ -312,11 +395,71 @@ class GuiHelper():
 # Public calsses
 ########################################################################
    
-    def __init__(self, uartHelper:UartHelper, systemData:SystemData):
-        self.uartHelper = uartHelper
+    def __init__(self, devices:list):
+        self._devices = devices
+        self._device = devices[0]
+        self.uartHelper = self._device.uart
+        self._systemData = self._device.systemData
+        self._plots = self._device.plots
         logger.info(f"Init version: {__version__}")
-        self._systemData = systemData
         
+    def selectDevice(self, device:Device) -> None:
+        """
+        Show the given device in the GUI, the other devices keep recording.
+
+        Args:
+            device (Device): The device to show.
+        """
+        if not self.uartHelper.isConnected():
+            # remember the selected port for the next connect
+            self._device.port = dpg.get_value("uart_combo")
+        self._device = device
+        self.uartHelper = device.uart
+        self._systemData = device.systemData
+        self._plots = device.plots
+        if device.port:
+            dpg.set_value("uart_combo", device.port)
+        dpg.set_value("device_combo", device.name)
+        dpg.set_item_label(item="connect_button", label="Disconnect" if device.uart.isConnected() else "Connect")
+        rateNames = {rate: name for name, rate in UpdateRates.items()}
+        for signal in self._systemData.uartSignals:
+            dpg.set_value(f"check_{signal.name}", signal.cyclic)
+            if signal.cycleTime in rateNames:
+                dpg.set_value(f"combo_{signal.name}", rateNames[signal.cycleTime])
+            dpg.set_value(f"write_{signal.name}", "")
+        dpg.set_value("rpm_slider", self._systemData.target_rpm)
+        dpg.set_value("pwm_slider", self._systemData.target_pwm)
+        self._latencyLastUpdate = 0.0
+        self._updateLinkLoad()
+        self._updatePlots()
+        self._updateInfoTable()
+        
+        
+    def connectTo(self, instance:str) -> bool:
+        """
+        Connect to the given instance, same as selecting it and pressing Connect.
+
+        Args:
+            instance (str): The serial port or capture to connect to.
+
+        Returns:
+            bool: True if the connection is successful, False otherwise.
+        """
+        for device in self._devices:
+            if device is not self._device and device.port == instance and device.uart.isConnected():
+                self.writeLog(f"{instance} is already used by {device.name}")
+                return False
+        device = self._device
+        ret = self.uartHelper.connect(instance, self._systemData.updateSignalsAtConnect,
+                                      lambda readout: self._readoutFinished(readout, device))
+        if ret:
+            # connected to host.
+            device.port = instance
+            self.writeLog(f"{self._logPrefix(device)}Connected to host")
+            dpg.set_item_label(item="connect_button", label="Disconnect")
+            if dpg.get_value("check_update_all"):
+                self._updateUartSignals()
+        return ret
         
     def writeLog(self, msg, Tx=False, Rx=False)-> None:
         
@@ -346,22 +489,27 @@ class GuiHelper():
             pwmTarget (float): The target PWM value.
             pwmActual (float): The actual PWM value.
         """
-        self._updateTimeAxis()
-        self._updateCurrentPlot(valueA, valueB, valueC, value0)
-        self._updateRpmPlot(target=rpmTarget, actual=rpmActual)
-        self._updatePwmPlot(target=pwmTarget, actual=pwmActual)
+        self._plots.append(value0, valueA, valueB, valueC, rpmTarget, rpmActual, pwmTarget, pwmActual)
+        self._updatePlots()
        
         
-    def startGui(self) -> None:
+    def startGui(self, headless:bool=False, eventLoop:bool=False) -> None:
         """
         Initialize and start the GUI.
+
+        Args:
+            headless (bool): Only create the items without a viewport, e.g. for benchmarks.
+            eventLoop (bool): Queue the item callbacks for runCallbacks() and render without vsync, the App paces the frames.
         """
         
-        self._uartInstances = self.uartHelper.listInstances()
+        self._uartInstances = self.uartHelper.listInstances() or [""]
         
         dpg.create_context()
-        dpg.create_viewport(title='BLCD control panel', width=1000, height=800)
-        dpg.setup_dearpygui()
+        if eventLoop:
+            dpg.configure_app(manual_callback_management=True)
+        if not headless:
+            dpg.create_viewport(title='BLCD control panel', width=1000, height=800, vsync=not eventLoop)
+            dpg.setup_dearpygui()
         
         with dpg.theme(tag="log_text_theme"):
                 with dpg.theme_component(dpg.mvText):
@@ -403,11 +551,14 @@ class GuiHelper():
             with dpg.menu(label="File"):
                 dpg.add_menu_item(label="Save", callback=self._print_me)
                 dpg.add_menu_item(label="Save As", callback=self._print_me)
+                dpg.add_menu_item(label="Record Capture", check=True, callback=self._toggleCapture)
 
             with dpg.menu(label="Window"):
                 dpg.add_menu_item(label="Reset Window", callback=self._load_init)
                 dpg.add_menu_item(label="Save Window", callback=self._save_init)
                 dpg.add_menu_item(label="Load Window", callback=self._save_init)
+                dpg.add_menu_item(label="Latency", callback=lambda: dpg.show_item("latency_window"))
+                dpg.add_menu_item(label="Compare Devices", callback=lambda: dpg.show_item("compare_window"))
 
             with dpg.menu(label="Signals"):
                 dpg.add_text("Cyclic Requests")
@@ -417,9 +568,13 @@ class GuiHelper():
                     dpg.add_table_column()
                     for signal in self._systemData.uartSignals:
                         with dpg.table_row():
-                            dpg.add_checkbox(label=signal.name, default_value=signal.cyclic, tag=f"check_{signal.name}")
+                            dpg.add_checkbox(label=signal.name, default_value=signal.cyclic, tag=f"check_{signal.name}",
+                                             callback=self._updateLinkLoad)
                             default_value = list(UpdateRates.keys())[list(UpdateRates.values()).index(signal.cycleTime)]
-                            dpg.add_combo(default_value=default_value, items=list(UpdateRates.keys()), tag=f"combo_{signal.name}" ,width=100)
+                            dpg.add_combo(default_value=default_value, items=list(UpdateRates.keys()), tag=f"combo_{signal.name}" ,width=100,
+                                          callback=self._updateLinkLoad)
+                dpg.add_text("", tag="link_load_text")
+                dpg.add_checkbox(label="Slow down low priority signals", default_value=True, tag="check_link_budget")
                 dpg.add_checkbox(label="Update all @ connect", default_value=self._systemData.updateSignalsAtConnect, tag="check_update_all")
                 dpg.add_button(label="Update", width=200 ,callback=self._updateUartSignals)
                 dpg.bind_item_font(dpg.last_item(), self.heading_font)
@@ -432,16 +587,23 @@ class GuiHelper():
             dpg.add_menu_item(label="Help", callback=self._print_me)
             dpg.add_menu_item(label="Demo", callback=lambda:demo.show_demo())
             dpg.add_menu_item(label="About", callback=self._openAboutModal)
+        self._updateLinkLoad()
                 
         ######################################################################################
         # Settimgs window
         ######################################################################################
         with dpg.window(label="Settings", width=300, height=581, pos=(700,0), no_close=True, horizontal_scrollbar=True):
+            deviceNames = [device.name for device in self._devices]
+            with dpg.group(show=len(self._devices) > 1):
+                dpg.add_text("Device", indent=15)
+                dpg.bind_item_font(dpg.last_item(), self.heading_font)
+                dpg.add_combo(deviceNames, default_value=self._device.name, tag="device_combo", width=250, indent=15,
+                              callback=self._selectDevice)
             dpg.add_text("Select MCU", indent=15)
             dpg.bind_item_font(dpg.last_item(), self.heading_font)
             dpg.add_combo(self._uartInstances, default_value=self._uartInstances[-1], tag="uart_combo",  width=250, indent=15)
             with dpg.group(horizontal=True, indent=15):
-                dpg.add_button(label="Connect", width=80 ,callback=self._connectToHost)
+                dpg.add_button(label="Connect", width=80 ,callback=self._connectToHost, tag="connect_button")
                 dpg.bind_item_font(dpg.last_item(), self.button_font)
                 dpg.add_button(label="Reload", width=80, callback=self._updateUartInstances)
             # dpg.add_spacer(height=5)
@@ -492,11 +654,11 @@ class GuiHelper():
             
             dpg.add_spacer(height=15)
             dpg.add_button(label="Start", width=200, indent=50, height=35, tag="start_button",
-                           callback=lambda: self._systemData.uartSignals.enable.write(1))
+                           callback=lambda: self._writeEnable(1))
             dpg.bind_item_theme(dpg.last_item(), "start_button_theme")
             dpg.bind_item_font("start_button", self.buttonBig_font)
             dpg.add_button(label="Stop", width=200, indent=50, height=35, tag="stop_button",
-                           callback=lambda: self._systemData.uartSignals.enable.write(0))
+                           callback=lambda: self._writeEnable(0))
             dpg.bind_item_theme(dpg.last_item(), "stop_button_theme")
             dpg.bind_item_font("stop_button", self.buttonBig_font)
 
@@ -508,11 +670,13 @@ class GuiHelper():
                 dpg.add_table_column()
                 dpg.add_table_column()
                 dpg.add_table_column()
+                dpg.add_table_column()
                 for signal in self._systemData.uartSignals:
                     with dpg.table_row():
                         dpg.add_text(f"{signal.name}")
                         dpg.add_text(f"{signal.value}", tag=f"info_{signal.name}")
                         dpg.add_text(f"{signal.unite}")
+                        dpg.add_text("", tag=f"write_{signal.name}")
                 
         ######################################################################################  
         # Plot window 
@@ -524,34 +688,74 @@ class GuiHelper():
                     dpg.add_plot_legend()
                     self._pwm_Xaxis = dpg.add_plot_axis(dpg.mvXAxis, label="", no_tick_labels=True)
                     with dpg.plot_axis(dpg.mvYAxis, label="", no_tick_labels=False) as self._pwm_Yaxis:
-                        dpg.add_line_series(self._timeStamp, self._pwmListTarget, label="Target", tag="plot_pwm_target")
-                        dpg.add_line_series(self._timeStamp, self._pwmListActual, label="Actual", tag="plot_pwm_actual")
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.pwmTarget, label="Target", tag="plot_pwm_target")
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.pwmActual, label="Actual", tag="plot_pwm_actual")
                     
                 with dpg.plot(label="RPM"):
                     dpg.add_plot_legend()
                     self._rpm_Xaxis = dpg.add_plot_axis(dpg.mvXAxis, label="", no_tick_labels=True)
                     with dpg.plot_axis(dpg.mvYAxis, label="", no_tick_labels=False) as self._rpm_Yaxis :
-                        dpg.add_line_series(self._timeStamp, self._rpmListTarget, label="Target", tag="plot_rpm_target")
-                        dpg.add_line_series(self._timeStamp, self._rpmListActual, label="Actual", tag="plot_rpm_actual")    
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.rpmTarget, label="Target", tag="plot_rpm_target")
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.rpmActual, label="Actual", tag="plot_rpm_actual")    
                     
                 with dpg.plot(label="Current", zoom_mod=0.5):
                     dpg.add_plot_legend()
                     self._curetn_Xaxis = dpg.add_plot_axis(dpg.mvXAxis, label="", no_tick_labels=True)
                     with dpg.plot_axis(dpg.mvYAxis, label="Current (A)", no_tick_labels=False) as self._curetn_Yaxis:
-                        dpg.add_line_series(self._timeStamp, self._currentList0, label="Current DC", tag="plot_current_0")
-                        dpg.add_line_series(self._timeStamp, self._currentListA, label="Current A", tag="plot_current_a")
-                        dpg.add_line_series(self._timeStamp, self._currentListA, label="Current B", tag="plot_current_b")
-                        dpg.add_line_series(self._timeStamp, self._currentListA, label="Current C", tag="plot_current_c")
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.current0, label="Current DC", tag="plot_current_0")
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.currentA, label="Current A", tag="plot_current_a")
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.currentA, label="Current B", tag="plot_current_b")
+                        dpg.add_line_series(self._plots.timeStamp, self._plots.currentA, label="Current C", tag="plot_current_c")
             
             
         
+        ######################################################################################
+        # Latency window
+        ######################################################################################
+        with dpg.window(label="Latency", width=500, height=500, pos=(250,100), show=False, tag="latency_window"):
+            with dpg.group(horizontal=True):
+                dpg.add_button(label="Reset", width=80, callback=self._resetLatency)
+                dpg.add_button(label="Export", width=80, callback=self._exportLatency)
+                dpg.add_text("", tag="write_stats_text")
+            dpg.add_text("", tag="urgent_stats_text")
+            with dpg.table(header_row=True, row_background=True, delay_search=True, tag="table_latency"):
+                for label in ("Signal", "Count", "p50 (ms)", "p99 (ms)", "Max (ms)", "Timeouts", "Period (ms)", "Jitter (ms)"):
+                    dpg.add_table_column(label=label)
+                for signal in self._systemData.uartSignals:
+                    with dpg.table_row():
+                        dpg.add_text(f"{signal.name}")
+                        for column in ("count", "p50", "p99", "max", "timeouts", "period", "jitter"):
+                            dpg.add_text("0", tag=f"latency_{signal.name}_{column}")
+            signalNames = [signal.name for signal in self._systemData.uartSignals]
+            dpg.add_combo(signalNames, default_value=signalNames[0], tag="latency_combo", width=250,
+                          callback=self._resetLatencyUpdate)
+            with dpg.plot(label="Histogram", width=-1, height=-1):
+                bucketLabels = [f"{edge:g}" for edge in LATENCY_BUCKETS_MS] + [">"]
+                latencyXaxis = dpg.add_plot_axis(dpg.mvXAxis, label="Latency (ms)")
+                dpg.set_axis_ticks(latencyXaxis, tuple((label, i) for i, label in enumerate(bucketLabels)))
+                with dpg.plot_axis(dpg.mvYAxis, label="Count") as self._latency_Yaxis:
+                    dpg.add_bar_series(list(range(len(bucketLabels))), [0] * len(bucketLabels), weight=0.8, tag="latency_bars")
+        
+        ######################################################################################
+        # Compare window
+        ######################################################################################
+        with dpg.window(label="Compare Devices", width=700, height=400, pos=(0,100), show=False, tag="compare_window"):
+            dpg.add_combo(list(self._compareSignals.keys()), default_value="RPM", tag="compare_combo", width=250)
+            with dpg.plot(label="Compare", width=-1, height=-1):
+                dpg.add_plot_legend()
+                self._compare_Xaxis = dpg.add_plot_axis(dpg.mvXAxis, label="", no_tick_labels=True)
+                with dpg.plot_axis(dpg.mvYAxis, label="") as self._compare_Yaxis:
+                    for i, device in enumerate(self._devices):
+                        dpg.add_line_series(device.plots.timeStamp, device.plots.rpmActual, label=device.name, tag=f"compare_{i}")
+        
         ######################################################################################    
         # Log window
         ######################################################################################
         with dpg.window(label="Log", width=700, height=200, pos=(0,600), no_close=True) as self.logWindow:
             pass
             
-        dpg.show_viewport()
+        if not headless:
+            dpg.show_viewport()
         
         
     def isGuiRunning(self)-> bool:
@@ -570,7 +774,6 @@ class GuiHelper():
         Args:
             data (SystemData): The data to update.
         """
-        self._systemData = data
         self.abentToPlot(value0=data.uartSignals.current_0.value, 
                          valueA=data.uartSignals.current_a.value, 
                          valueB=data.uartSignals.current_b.value, 
@@ -580,6 +783,7 @@ class GuiHelper():
                          pwmTarget=data.target_pwm, 
                          pwmActual=data.uartSignals.pwm.value)
         self._updateInfoTable()
+        self._updateLatencyWindow()
         try:
             value = list(CommutationsTypeValues.keys())[list(CommutationsTypeValues.values()).index(data.uartSignals.commutation.value)]
             dpg.set_value("modulation_combo", value)
@@ -603,11 +807,29 @@ class GuiHelper():
             pass
        
         
+    def updateDevices(self):
+        """
+        Record the data of all connected devices and update the GUI with the shown one.
+        """
+        shown = self._device
+        for device in self._devices:
+            if device is not shown and device.uart.isConnected():
+                device.plots.appendData(device.systemData)
+        if shown.uart.isConnected():
+            self.updateData(shown.systemData)
+        self._reportUrgent()
+        self._updateCompareWindow()
+        
     def renderWindow(self):
         """ This will reander a new frame
         """
         dpg.render_dearpygui_frame()
     
+    def runCallbacks(self):
+        """ This will run the queued item callbacks, only needed with eventLoop set in startGui
+        """
+        dpg.run_callbacks(dpg.get_callback_queue())
+    
     def cleanUp(self):
         """ This will clean up the class 
         """
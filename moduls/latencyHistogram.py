@@ -0,0 +1,280 @@
+""" latencyHistogram.py
+
+This module tracks the request -> response latency of every signal.
+The latencies are sorted into fixed buckets, so recording a sample never
+allocates memory. Requests without a response within the timeout are counted
+as timeouts.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import json
+import time
+import threading
+import logging
+from array import array
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# upper bucket edges in ms, the last bucket takes everything above
+LATENCY_BUCKETS_MS = (0.5, 1, 1.5, 2, 3, 4, 5, 7.5, 10, 15, 20, 30, 50, 75, 100, 150, 200, 300, 500, 1000)
+
+
+class LatencyHistogram:
+    """
+    Fixed bucket histogram of the request -> response latency of one signal.
+
+    Attributes:
+        counts (array): The number of samples per bucket, one more than LATENCY_BUCKETS_MS.
+        count (int): The number of samples.
+        timeouts (int): The number of requests without a response.
+        minimum (int): The smallest latency in ns.
+        maximum (int): The largest latency in ns.
+
+    Methods:
+        record(latency): Adds one latency sample in ns.
+        percentile(fraction) -> float: Estimates a percentile in ms from the buckets.
+        mean() -> float: Returns the mean latency in ms.
+        reset(): Clears all samples.
+        toDict() -> dict: Returns the histogram as a dict for the export.
+    """
+    _edges = tuple(int(edge * 1e6) for edge in LATENCY_BUCKETS_MS)
+
+    def __init__(self) -> None:
+        """
+        Initialize the LatencyHistogram class.
+        """
+        self.counts = array('Q', bytes(8 * (len(self._edges) + 1)))
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears all samples.
+        """
+        counts = self.counts
+        for i in range(len(counts)):
+            counts[i] = 0
+        self.count = 0
+        self.timeouts = 0
+        self.minimum = 0
+        self.maximum = 0
+        self._sum = 0
+
+    def record(self, latency: int) -> None:
+        """Adds one latency sample.
+
+        Args:
+            latency (int): The latency in ns.
+        """
+        self.counts[bisect_left(self._edges, latency)] += 1
+        if not self.count or latency < self.minimum:
+            self.minimum = latency
+        if latency > self.maximum:
+            self.maximum = latency
+        self.count += 1
+        self._sum += latency
+
+    def percentile(self, fraction: float) -> float:
+        """Estimates a percentile from the buckets.
+
+        Args:
+            fraction (float): The percentile as fraction, e.g. 0.99.
+
+        Returns:
+            float: The upper edge of the bucket holding the percentile in ms, 0 without samples.
+        """
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        total = 0
+        for i, count in enumerate(self.counts):
+            total += count
+            if total >= target and count:
+                # the overflow bucket has no upper edge
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.maximum / 1e6
+        return self.maximum / 1e6
+
+    def mean(self) -> float:
+        """Returns the mean latency.
+
+        Returns:
+            float: The mean latency in ms, 0 without samples.
+        """
+        return self._sum / self.count / 1e6 if self.count else 0.0
+
+    def toDict(self) -> dict:
+        """Returns the histogram as a dict for the export.
+
+        Returns:
+            dict: Counts, timeouts and the statistics in ms.
+        """
+        return {"count": self.count,
+                "timeouts": self.timeouts,
+                "minMs": self.minimum / 1e6,
+                "meanMs": self.mean(),
+                "p50Ms": self.percentile(0.5),
+                "p99Ms": self.percentile(0.99),
+                "maxMs": self.maximum / 1e6,
+                "buckets": list(self.counts)}
+
+
+class _PendingRequests:
+    """
+    Fixed size FIFO with the send timestamps of the unanswered requests of one signal.
+    """
+    __slots__ = ("times", "head", "size")
+
+    def __init__(self, depth: int) -> None:
+        self.times = [0] * depth
+        self.head = 0
+        self.size = 0
+
+
+class LatencyTracker:
+    """
+    Matches the responses to the requests of every signal and records the latency.
+
+    The MCU answers the requests of one signal in order, so a response belongs to
+    the oldest unanswered request of its index. A request which is still
+    unanswered after the timeout, or pushed out of the FIFO by newer requests,
+    is counted as timeout. Responses without a request, e.g. late ones, are
+    counted as unmatched.
+
+    Attributes:
+        timeout (float): Seconds after which a request counts as timed out.
+        histograms (dict): The LatencyHistogram per signal index.
+        unmatched (int): The number of responses without an open request.
+
+    Methods:
+        requestSent(index, timestamp): Registers a sent request.
+        responseReceived(index, timestamp): Matches a response and records its latency.
+        checkTimeouts(now): Counts all requests older than the timeout.
+        outstanding(index) -> int: Returns the number of open requests of an index.
+        reset(): Clears all histograms and open requests.
+        export(path, names): Writes all histograms to a JSON file.
+    """
+
+    def __init__(self, timeout: float = 1.0, depth: int = 8) -> None:
+        """
+        Initialize the LatencyTracker class.
+
+        Args:
+            timeout (float): Seconds after which a request counts as timed out. Defaults to 1.
+            depth (int): The maximum number of open requests per signal. Defaults to 8.
+        """
+        self.timeout = timeout
+        self.histograms = {}
+        self.unmatched = 0
+        self._depth = depth
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _get(self, index) -> tuple:
+        pending = self._pending.get(index)
+        if pending is None:
+            pending = self._pending[index] = _PendingRequests(self._depth)
+            self.histograms[index] = LatencyHistogram()
+        return pending, self.histograms[index]
+
+    def requestSent(self, index, timestamp: int) -> None:
+        """Registers a sent request.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the requested signal.
+            timestamp (int): The send time from time.time_ns().
+        """
+        with self._lock:
+            pending, histogram = self._get(index)
+            self._expire(pending, histogram, timestamp)
+            if pending.size == self._depth:
+                # the oldest request will never be matched anymore
+                pending.head = (pending.head + 1) % self._depth
+                pending.size -= 1
+                histogram.timeouts += 1
+            pending.times[(pending.head + pending.size) % self._depth] = timestamp
+            pending.size += 1
+
+    def responseReceived(self, index, timestamp: int) -> None:
+        """Matches a response to the oldest open request and records its latency.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the answered signal.
+            timestamp (int): The receive time from time.time_ns().
+        """
+        with self._lock:
+            pending = self._pending.get(index)
+            if pending is None or not pending.size:
+                self.unmatched += 1
+                return
+            histogram = self.histograms[index]
+            self._expire(pending, histogram, timestamp)
+            if not pending.size:
+                self.unmatched += 1
+                return
+            histogram.record(timestamp - pending.times[pending.head])
+            pending.head = (pending.head + 1) % self._depth
+            pending.size -= 1
+
+    def outstanding(self, index) -> int:
+        """Returns the number of open requests of an index.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the signal.
+
+        Returns:
+            int: The number of requests without a response.
+        """
+        pending = self._pending.get(index)
+        return pending.size if pending is not None else 0
+
+    def checkTimeouts(self, now: int = None) -> None:
+        """Counts all requests older than the timeout.
+
+        Args:
+            now (int, optional): The current time from time.time_ns(). Defaults to now.
+        """
+        if now is None:
+            now = time.time_ns()
+        with self._lock:
+            for index, pending in self._pending.items():
+                self._expire(pending, self.histograms[index], now)
+
+    def _expire(self, pending: _PendingRequests, histogram: LatencyHistogram, now: int) -> None:
+        deadline = now - int(self.timeout * 1e9)
+        while pending.size and pending.times[pending.head] < deadline:
+            pending.head = (pending.head + 1) % self._depth
+            pending.size -= 1
+            histogram.timeouts += 1
+
+    def reset(self) -> None:
+        """Clears all histograms and open requests.
+        """
+        with self._lock:
+            for index, pending in self._pending.items():
+                pending.head = 0
+                pending.size = 0
+                self.histograms[index].reset()
+            self.unmatched = 0
+
+    def export(self, path: str, names: dict = None) -> None:
+        """Writes all histograms to a JSON file.
+
+        Args:
+            path (str): The path of the JSON file.
+            names (dict, optional): Signal names per index, the index is used otherwise.
+        """
+        names = names or {}
+        with self._lock:
+            signals = {names.get(index, str(index)): histogram.toDict()
+                       for index, histogram in self.histograms.items()}
+            unmatched = self.unmatched
+        with open(path, "w") as file:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "timeoutS": self.timeout,
+                       "bucketEdgesMs": list(LATENCY_BUCKETS_MS),
+                       "unmatched": unmatched,
+                       "signals": signals}, file, indent=2)
+        logger.info(f"Latency statistics written to: {path}")
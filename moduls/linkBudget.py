@@ -0,0 +1,113 @@
+""" linkBudget.py
+
+This module estimates the load of the serial link caused by the cyclic
+requests and keeps it below a threshold. Every cyclic request costs a request
+and a response frame, the UART sends 10 bits per byte (8N1). If the expected
+utilisation exceeds the threshold, the signals with the lowest priority are
+polled slower until the requests fit into the link again.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import logging
+from moduls.uartDefines import UpdateRates
+from moduls.frameDecoder import FRAME_SIZE
+
+logger = logging.getLogger(__name__)
+
+# request frame + response frame
+BYTES_PER_REQUEST = 2 * FRAME_SIZE
+# start bit + 8 data bits + stop bit
+BITS_PER_BYTE = 10
+
+
+class LinkBudget:
+    """
+    Bandwidth budget of the serial link for the cyclic requests.
+
+    Attributes:
+        baudrate (int): The baud rate of the serial link.
+        threshold (float): The maximum utilisation of the link, e.g. 0.8 for 80 %.
+
+    Methods:
+        capacity() -> float: Returns the capacity of the link in bytes per second.
+        bytesPerSecond(settings) -> float: Returns the expected load in bytes per second.
+        utilisation(settings) -> float: Returns the expected utilisation of the link.
+        admit(signals) -> list: Slows down low priority signals until the load fits.
+    """
+
+    def __init__(self, baudrate: int = 115200, threshold: float = 0.8) -> None:
+        """
+        Initialize the LinkBudget class.
+
+        Args:
+            baudrate (int): The baud rate of the serial link. Defaults to 115200.
+            threshold (float): The maximum utilisation of the link. Defaults to 0.8.
+        """
+        self.baudrate = baudrate
+        self.threshold = threshold
+
+    def capacity(self) -> float:
+        """Returns the capacity of the link.
+
+        Returns:
+            float: The bytes per second the link can transfer.
+        """
+        return self.baudrate / BITS_PER_BYTE
+
+    def bytesPerSecond(self, settings) -> float:
+        """Returns the expected load of the cyclic requests.
+
+        Args:
+            settings (iterable): (cyclic, cycleTime in ms) per signal.
+
+        Returns:
+            float: The expected load in bytes per second.
+        """
+        return sum(BYTES_PER_REQUEST * 1000 / max(cycleTime, 1) for cyclic, cycleTime in settings if cyclic)
+
+    def utilisation(self, settings) -> float:
+        """Returns the expected utilisation of the link.
+
+        Args:
+            settings (iterable): (cyclic, cycleTime in ms) per signal.
+
+        Returns:
+            float: The utilisation, 1.0 is a fully loaded link.
+        """
+        return self.bytesPerSecond(settings) / self.capacity()
+
+    def admit(self, signals) -> list:
+        """Slows down the cyclic signals with the lowest priority until the load fits the threshold.
+
+        The cycle time of a signal is raised to the next slower update rate, the
+        fastest signal of the lowest priority is slowed down first.
+
+        Args:
+            signals (UARTSignals): The signals, their cycleTime is changed in place.
+
+        Returns:
+            list: (signal, old cycleTime, new cycleTime) of every slowed down signal.
+        """
+        rates = sorted(UpdateRates.values())
+        cyclic = [signal for signal in signals if signal.cyclic]
+        original = {signal.index: signal.cycleTime for signal in cyclic}
+        load = self.bytesPerSecond((True, signal.cycleTime) for signal in cyclic)
+        limit = self.threshold * self.capacity()
+        while load > limit:
+            candidates = [signal for signal in cyclic if signal.cycleTime < rates[-1]]
+            if not candidates:
+                logger.warning(f"Link overloaded even at the slowest update rate: {load:.0f} B/s")
+                break
+            signal = min(candidates, key=lambda signal: (signal.priority, signal.cycleTime))
+            slower = next(rate for rate in rates if rate > signal.cycleTime)
+            load -= BYTES_PER_REQUEST * 1000 * (1 / max(signal.cycleTime, 1) - 1 / slower)
+            signal.cycleTime = slower
+        changes = [(signal, original[signal.index], signal.cycleTime) for signal in cyclic
+                   if signal.cycleTime != original[signal.index]]
+        for signal, old, new in changes:
+            logger.info(f"Link budget: {signal.name} slowed down from {old} ms to {new} ms")
+        return changes
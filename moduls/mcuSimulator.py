@@ -0,0 +1,371 @@
+""" mcuSimulator.py
+
+Virtual inverter MCU which speaks the UART protocol of uartDefines.py over a
+Linux pseudo terminal. It answers READ_REQUEST and WRITE_REQUEST for every
+MSG_INDEX_PARAM, sends MSG_INDEX_STATUS messages and generates synthetic three
+phase currents. Response latency, jitter and bit errors can be configured to
+load test the GUI and the parser without hardware.
+
+On its own the simulator sends STATUS_READY at start and STATUS_OK periodically.
+The other statuses are faults: they are sent at configured times after the start
+or when the phase current exceeds the over current limit, a STOP_* status also
+drops enable like the MCU does.
+
+Linux only, run from the repository root:
+    python -m moduls.mcuSimulator --latency 2 --jitter 1 --ber 1e-5
+    python -m moduls.mcuSimulator --fault STOP_OVER_TEMP@5 --fault STATUS_ERROR=3@8 --over-current 4
+and connect the GUI or UartHelper.connect() to the printed /dev/pts/N.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import os
+import tty
+import math
+import time
+import heapq
+import random
+import select
+import argparse
+import threading
+import logging
+from moduls.uartDefines import UART_Message, UART_Message_Frame, MSG_Type, MSG_INDEX_PARAM, MSG_INDEX_STATUS
+from moduls.frameDecoder import FrameDecoder, FRAME_SIZE
+from moduls.ringBuffer import RingBuffer
+from moduls.checksum import Checksum
+
+logger = logging.getLogger(__name__)
+
+# the statuses with which the MCU stops the inverter and drops enable
+_STOP_STATUSES = frozenset(status for status in MSG_INDEX_STATUS if status.name.startswith("STOP_"))
+
+
+def _parseFault(text: str) -> tuple:
+    """Parses a fault of the command line, NAME[=PAYLOAD]@SECONDS, e.g. STOP_OVER_TEMP@5.
+
+    Args:
+        text (str): The fault.
+
+    Returns:
+        tuple: (seconds after the start, MSG_INDEX_STATUS, payload).
+
+    Raises:
+        argparse.ArgumentTypeError: If the fault is invalid.
+    """
+    try:
+        status, seconds = text.rsplit("@", 1)
+        name, _, payload = status.partition("=")
+        return float(seconds.removesuffix("s")), MSG_INDEX_STATUS[name.strip().upper()], int(payload or "0", 0)
+    except (ValueError, KeyError):
+        names = ", ".join(status.name for status in MSG_INDEX_STATUS)
+        raise argparse.ArgumentTypeError(f"invalid fault {text}, expected NAME[=PAYLOAD]@SECONDS with a NAME of {names}") from None
+
+
+class McuSimulator:
+    """
+    Virtual inverter MCU on a pseudo terminal.
+
+    The registers hold the raw payload values as the real MCU would send them.
+    Currents, RPM and battery voltage are generated from the written PWM and enable
+    values every time they are read.
+
+    Attributes:
+        latency (float): The response latency in seconds.
+        jitter (float): The maximum additional random latency in seconds.
+        bitErrorRate (float): The probability of a flipped bit in a sent frame.
+        statusInterval (float): Seconds between two STATUS_OK messages, 0 to disable.
+        amplitude (float): The amplitude of the phase currents at 100 % PWM in A.
+        maxRpm (float): The RPM at 100 % PWM.
+        faults (list): (seconds after the start, MSG_INDEX_STATUS, payload) per fault to send.
+        overCurrent (float): The phase current amplitude in A which stops the inverter
+            with STOP_OVER_CURRENT, 0 to disable.
+        port (str): The path of the pseudo terminal to connect to.
+        registers (dict): The raw register values per MSG_INDEX_PARAM.
+        requests (int): The number of received requests.
+        responses (int): The number of sent frames.
+        corrupted (int): The number of frames sent with bit errors.
+
+    Methods:
+        start() -> str: Opens the pseudo terminal and starts the simulator thread.
+        stop(): Stops the simulator and closes the pseudo terminal.
+        run(): Runs the simulator loop in the calling thread.
+        sendStatus(index, payload): Sends a status message.
+        fault(index, payload): Sends a fault status, a STOP_* status drops enable.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, bitErrorRate: float = 0.0,
+                 statusInterval: float = 1.0, amplitude: float = 5.0, maxRpm: float = 30000,
+                 seed: int = None, checksum: Checksum = None, faults: list = None,
+                 overCurrent: float = 0.0) -> None:
+        """
+        Initialize the McuSimulator class.
+
+        Args:
+            latency (float): The response latency in seconds. Defaults to 0.
+            jitter (float): The maximum additional random latency in seconds. Defaults to 0.
+            bitErrorRate (float): The probability of a flipped bit in a sent frame. Defaults to 0.
+            statusInterval (float): Seconds between two STATUS_OK messages, 0 to disable. Defaults to 1.
+            amplitude (float): The amplitude of the phase currents at 100 % PWM in A. Defaults to 5.
+            maxRpm (float): The RPM at 100 % PWM. Defaults to 30000.
+            seed (int, optional): Seed for the random generator.
+            checksum (Checksum, optional): The frame checksum. Defaults to XorChecksum.
+            faults (list, optional): (seconds after the start, MSG_INDEX_STATUS, payload) per fault to send.
+            overCurrent (float): The phase current amplitude in A which stops the inverter with
+                STOP_OVER_CURRENT, 0 to disable. Defaults to 0.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.bitErrorRate = bitErrorRate
+        self.statusInterval = statusInterval
+        self.amplitude = amplitude
+        self.maxRpm = maxRpm
+        self.checksum = checksum
+        self.faults = list(faults or [])
+        self.overCurrent = overCurrent
+        self.port = None
+        self.requests = 0
+        self.responses = 0
+        self.corrupted = 0
+        self.registers = {index: 0 for index in MSG_INDEX_PARAM}
+        self.registers[MSG_INDEX_PARAM.VALUE_BAT_VOLTAGE] = 2400
+        self.registers[MSG_INDEX_PARAM.VALUE_TEMP_MOTOR] = 250
+        self.registers[MSG_INDEX_PARAM.VALUE_TEMP_INVERTER] = 250
+        self.registers[MSG_INDEX_PARAM.VALUE_COMMUTATION] = 0x10
+        self.registers[MSG_INDEX_PARAM.VALUE_SWISH_FREQ] = 0x09
+        self._random = random.Random(seed)
+        self._master = None
+        self._slave = None
+        self._running = False
+        self._thread = threading.Thread()
+        self._outgoing = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._startTime = time.monotonic()
+
+    def start(self) -> str:
+        """Opens the pseudo terminal and starts the simulator thread.
+
+        Returns:
+            str: The path of the pseudo terminal to connect to.
+        """
+        self._open()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self) -> None:
+        """Stops the simulator and closes the pseudo terminal.
+        """
+        self._running = False
+        if self._thread.is_alive():
+            self._thread.join()
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master, self._slave = None, None
+
+    def run(self) -> None:
+        """Runs the simulator loop in the calling thread.
+        """
+        if self._master is None:
+            self._open()
+        self._running = True
+        ring = RingBuffer()
+        decoder = FrameDecoder(self.checksum)
+        self.sendStatus(MSG_INDEX_STATUS.STATUS_READY)
+        start = time.monotonic()
+        nextStatus = start + self.statusInterval
+        # the next fault is at the end of the list
+        faults = sorted(((start + seconds, index, payload) for seconds, index, payload in self.faults),
+                        key=lambda fault: fault[0], reverse=True)
+        while self._running:
+            now = time.monotonic()
+            if self.statusInterval and now >= nextStatus:
+                self.sendStatus(MSG_INDEX_STATUS.STATUS_OK)
+                nextStatus += self.statusInterval
+            while faults and now >= faults[-1][0]:
+                _, index, payload = faults.pop()
+                self.fault(index, payload)
+            timeout = self._flush(now)
+            if self.statusInterval:
+                timeout = min(timeout, max(nextStatus - now, 0.0))
+            if faults:
+                timeout = min(timeout, max(faults[-1][0] - now, 0.0))
+            ready, _, _ = select.select([self._master], [], [], min(timeout, 0.1))
+            if not ready:
+                continue
+            try:
+                data = os.read(self._master, 4096)
+            except OSError:
+                # the other side of the pty was closed
+                time.sleep(0.01)
+                continue
+            ring.write(data)
+            if len(ring) < FRAME_SIZE:
+                continue
+            frames = decoder.decode(ring.data())
+            ring.consume(frames.consumed, frames.discarded)
+            for message in frames.messages():
+                self._handle(message)
+
+    def sendStatus(self, index: MSG_INDEX_STATUS, payload: int = 0) -> None:
+        """Sends a status message.
+
+        Args:
+            index (MSG_INDEX_STATUS): The status to send.
+            payload (int): The signed payload of the status. Defaults to 0.
+        """
+        self._queue(MSG_Type.STATUS_MESSAGE, index, payload & 0xFFFF, delayed=False)
+
+    def fault(self, index: MSG_INDEX_STATUS, payload: int = 0) -> None:
+        """Sends a fault status, with a STOP_* status the inverter is stopped and enable drops to 0.
+
+        Args:
+            index (MSG_INDEX_STATUS): The status to send.
+            payload (int): The signed payload of the status, e.g. an error code. Defaults to 0.
+        """
+        if index in _STOP_STATUSES:
+            self.registers[MSG_INDEX_PARAM.VALUE_ENABLE] = 0
+        logger.info(f"Fault {index.name}, payload {payload}")
+        self.sendStatus(index, payload)
+
+    def _open(self) -> None:
+        """Opens the pseudo terminal in raw mode.
+        """
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        logger.info(f"Simulator running on: {self.port}")
+
+    def _handle(self, message) -> None:
+        """Answers a request.
+
+        Args:
+            message (RxMessage): The received request.
+        """
+        if message.type not in (MSG_Type.READ_REQUEST, MSG_Type.WRITE_REQUEST):
+            return
+        self.requests += 1
+        if message.type == MSG_Type.WRITE_REQUEST:
+            self.registers[message.index] = message.getPayloadSigned()
+        self._queue(MSG_Type.RESPONSE, message.index, self._readRegister(message.index) & 0xFFFF)
+
+    def _readRegister(self, index: MSG_INDEX_PARAM) -> int:
+        """Returns the raw value of a register, including the synthetic signals.
+
+        Args:
+            index (MSG_INDEX_PARAM): The register to read.
+
+        Returns:
+            int: The raw value.
+        """
+        registers = self.registers
+        enabled = registers[MSG_INDEX_PARAM.VALUE_ENABLE] != 0
+        pwm = min(max(registers[MSG_INDEX_PARAM.VALUE_PWM], 0), 100) if enabled else 0
+        rpm = self.maxRpm * pwm / 100
+        if index == MSG_INDEX_PARAM.VALUE_RPM:
+            return int(rpm)
+        if index in (MSG_INDEX_PARAM.VALUE_CURRENT_A, MSG_INDEX_PARAM.VALUE_CURRENT_B,
+                     MSG_INDEX_PARAM.VALUE_CURRENT_C, MSG_INDEX_PARAM.VALUE_CURRENT_0):
+            amplitude = self.amplitude * pwm / 100
+            if self.overCurrent and amplitude > self.overCurrent:
+                # the payload is the tripping amplitude in mA
+                self.fault(MSG_INDEX_STATUS.STOP_OVER_CURRENT, int(amplitude * 1000))
+                return 0
+            angle = 2 * math.pi * (rpm / 60) * (time.monotonic() - self._startTime)
+            phase = {MSG_INDEX_PARAM.VALUE_CURRENT_A: 0.0,
+                     MSG_INDEX_PARAM.VALUE_CURRENT_B: -2 * math.pi / 3,
+                     MSG_INDEX_PARAM.VALUE_CURRENT_C: 2 * math.pi / 3}.get(index)
+            # currents are sent in mA, the DC current is the mean rectified phase current
+            current = amplitude * 2 / math.pi if phase is None else amplitude * math.sin(angle + phase)
+            return int(current * 1000)
+        if index == MSG_INDEX_PARAM.VALUE_BAT_VOLTAGE:
+            return registers[index] - int(pwm)
+        return registers[index]
+
+    def _queue(self, msgType: MSG_Type, index, payload: int, delayed: bool = True) -> None:
+        """Schedules a frame for sending after the configured latency.
+
+        Args:
+            msgType (MSG_Type): The type of the message.
+            index (MSG_INDEX_PARAM | MSG_INDEX_STATUS): The index of the message.
+            payload (int): The unsigned payload.
+            delayed (bool): Apply latency and jitter. Defaults to True.
+        """
+        message = UART_Message(type=msgType, index=index)
+        message.setPayloadUnsigned(payload)
+        data = UART_Message_Frame(message, self.checksum).encode()
+        due = time.monotonic()
+        if delayed:
+            due += self.latency + self._random.uniform(0.0, self.jitter)
+        with self._lock:
+            heapq.heappush(self._outgoing, (due, self._sequence, data))
+            self._sequence += 1
+
+    def _flush(self, now: float) -> float:
+        """Sends all frames which are due.
+
+        Args:
+            now (float): The current monotonic time.
+
+        Returns:
+            float: Seconds until the next frame is due.
+        """
+        with self._lock:
+            outgoing = self._outgoing
+            while outgoing and outgoing[0][0] <= now:
+                _, _, data = heapq.heappop(outgoing)
+                os.write(self._master, self._corrupt(data))
+                self.responses += 1
+            return outgoing[0][0] - now if outgoing else 0.1
+
+    def _corrupt(self, data: bytes) -> bytes:
+        """Flips random bits of a frame according to the bit error rate.
+
+        Args:
+            data (bytes): The encoded frame.
+
+        Returns:
+            bytes: The frame, possibly with bit errors.
+        """
+        if not self.bitErrorRate:
+            return data
+        rand = self._random.random
+        flipped = [bit for bit in range(len(data) * 8) if rand() < self.bitErrorRate]
+        if not flipped:
+            return data
+        self.corrupted += 1
+        corrupted = bytearray(data)
+        for bit in flipped:
+            corrupted[bit // 8] ^= 1 << (bit % 8)
+        return bytes(corrupted)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Virtual BLDC inverter MCU on a pseudo terminal")
+    parser.add_argument("--latency", type=float, default=0.0, help="response latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum additional random latency in ms")
+    parser.add_argument("--ber", type=float, default=0.0, help="bit error rate of the sent frames")
+    parser.add_argument("--status-interval", type=float, default=1.0, help="seconds between STATUS_OK messages, 0 to disable")
+    parser.add_argument("--amplitude", type=float, default=5.0, help="phase current amplitude at 100 %% PWM in A")
+    parser.add_argument("--fault", type=_parseFault, action="append", default=[], metavar="NAME[=PAYLOAD]@SECONDS",
+                        help="send a status after the start, e.g. STOP_OVER_TEMP@5 or STATUS_ERROR=3@8, can be repeated")
+    parser.add_argument("--over-current", type=float, default=0.0, help="phase current amplitude in A which sends STOP_OVER_CURRENT, 0 to disable")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(name)-30s - %(levelname)-8s - %(message)s')
+    simulator = McuSimulator(latency=args.latency / 1000, jitter=args.jitter / 1000, bitErrorRate=args.ber,
+                             statusInterval=args.status_interval, amplitude=args.amplitude,
+                             faults=args.fault, overCurrent=args.over_current)
+    simulator.start()
+    print(f"Connect to: {simulator.port}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        simulator.stop()
+        logging.info(f"Exit, {simulator.requests} requests, {simulator.responses} frames sent, {simulator.corrupted} corrupted")
@@ -0,0 +1,159 @@
+""" messageQueue.py
+
+This module provides the bounded FIFO between the UART reader thread and the App.
+The reader puts whole batches of received messages, the App drains them with one
+call per frame. If the App stalls, the queue does not grow without limit but
+applies a configurable drop policy.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import threading
+import logging
+from collections import deque
+from enum import Enum
+from moduls.uartDefines import MSG_Type
+
+logger = logging.getLogger(__name__)
+
+class DropPolicy(Enum):
+    """Enum for the behaviour of a full MessageQueue.
+    """
+    DROP_OLDEST = 0x0
+    COALESCE = 0x1
+
+
+class MessageQueue:
+    """
+    Thread safe, bounded FIFO for received messages.
+
+    With DropPolicy.DROP_OLDEST the oldest messages are dropped when the queue is full.
+    With DropPolicy.COALESCE only the newest pending response per signal is kept when
+    the queue is full, status messages are never coalesced. If the queue is still full
+    afterwards, the oldest messages are dropped.
+
+    Attributes:
+        maxSize (int): The maximum number of queued messages.
+        dropPolicy (DropPolicy): The behaviour of a full queue.
+        highWaterMark (int): The highest number of queued messages so far.
+        dropped (int): The number of dropped messages.
+        coalesced (int): The number of responses replaced by a newer one.
+
+    Methods:
+        __len__(): Returns the number of queued messages.
+        put(message): Adds a message to the queue.
+        putMany(messages): Adds several messages to the queue.
+        get(): Gets the oldest message.
+        getMessages(maxCount): Gets up to maxCount of the oldest messages.
+        clear(): Drops all queued messages without counting them.
+    """
+
+    def __init__(self, maxSize: int = 4096, dropPolicy: DropPolicy = DropPolicy.COALESCE) -> None:
+        """
+        Initialize the MessageQueue class.
+
+        Args:
+            maxSize (int): The maximum number of queued messages. Defaults to 4096.
+            dropPolicy (DropPolicy): The behaviour of a full queue. Defaults to DropPolicy.COALESCE.
+        """
+        self.maxSize = maxSize
+        self.dropPolicy = dropPolicy
+        self.highWaterMark = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._queue = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, message) -> None:
+        """Adds a message to the queue.
+
+        Args:
+            message (RxMessage): The message to add.
+        """
+        self.putMany((message,))
+
+    def putMany(self, messages) -> None:
+        """Adds several messages to the queue.
+
+        Args:
+            messages (list): The messages to add in receive order.
+        """
+        with self._lock:
+            queue = self._queue
+            queue.extend(messages)
+            if len(queue) > self.maxSize:
+                self._shrink()
+            if len(queue) > self.highWaterMark:
+                self.highWaterMark = len(queue)
+
+    def get(self):
+        """Gets the oldest message.
+
+        Returns:
+            RxMessage: The oldest message, or None if the queue is empty.
+        """
+        with self._lock:
+            if self._queue:
+                return self._queue.popleft()
+        return None
+
+    def getMessages(self, maxCount: int = None) -> list:
+        """Gets up to maxCount of the oldest messages.
+
+        Args:
+            maxCount (int, optional): The maximum number of messages. Defaults to all.
+
+        Returns:
+            list: The messages in receive order, empty if the queue is empty.
+        """
+        with self._lock:
+            queue = self._queue
+            if maxCount is None or maxCount >= len(queue):
+                ret = list(queue)
+                queue.clear()
+            else:
+                popleft = queue.popleft
+                ret = [popleft() for _ in range(maxCount)]
+        return ret
+
+    def clear(self) -> None:
+        """Drops all queued messages without counting them.
+        """
+        with self._lock:
+            self._queue.clear()
+
+    def _shrink(self) -> None:
+        """Applies the drop policy to a queue which grew above maxSize.
+        """
+        queue = self._queue
+        if self.dropPolicy == DropPolicy.COALESCE:
+            before = len(queue)
+            self._coalesce()
+            self.coalesced += before - len(queue)
+        overflow = len(queue) - self.maxSize
+        if overflow > 0:
+            for _ in range(overflow):
+                queue.popleft()
+            self.dropped += overflow
+            logger.debug(f"Message queue full, dropped {overflow} messages")
+
+    def _coalesce(self) -> None:
+        """Keeps only the newest response per signal and all status messages.
+        """
+        seen = set()
+        kept = []
+        for message in reversed(self._queue):
+            if message.type == MSG_Type.RESPONSE:
+                if message.index in seen:
+                    continue
+                seen.add(message.index)
+            kept.append(message)
+        kept.reverse()
+        self._queue.clear()
+        self._queue.extend(kept)
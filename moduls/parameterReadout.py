@@ -0,0 +1,153 @@
+""" parameterReadout.py
+
+This module reads a snapshot of all parameters from the MCU.
+Instead of one request every 10 ms, up to a window of READ_REQUESTs is kept in
+flight. Every response frees a slot for the next request, requests without a
+response are retried after a timeout. The caller is notified when every
+parameter was answered or has failed.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import threading
+import time
+import logging
+from collections import deque
+from moduls.frameBatch import FrameBatch
+from moduls.checksum import Checksum
+
+logger = logging.getLogger(__name__)
+
+
+class ParameterReadout:
+    """
+    Pipelined readout of a set of signals.
+
+    Attributes:
+        window (int): The maximum number of requests in flight.
+        timeout (float): Seconds to wait for a response before the request is repeated.
+        retries (int): The number of repetitions before a parameter has failed.
+        total (int): The number of parameters to read.
+        answered (list): The indices of the answered parameters.
+        failed (list): The indices of the parameters without a response.
+        sent (int): The number of sent requests, including retries.
+        duration (float): The time from start until completion in seconds.
+        done (threading.Event): Set when the readout is complete.
+
+    Methods:
+        start(): Starts the readout thread.
+        cancel(): Stops the readout, the remaining parameters count as failed.
+        responseReceived(index): Marks the parameter of a RESPONSE as answered.
+        wait(timeout) -> bool: Waits until the readout is complete.
+    """
+
+    def __init__(self, send, signals, window: int = 8, timeout: float = 0.2, retries: int = 2,
+                 onComplete=None, checksum: Checksum = None) -> None:
+        """
+        Initialize the ParameterReadout class.
+
+        Args:
+            send (callable): Sends a FrameBatch from the readout thread, it must hold the transmit
+                lock of the port, e.g. UartHelper.sendBatch.
+            signals (UARTSignals): The signals to read.
+            window (int): The maximum number of requests in flight. Defaults to 8.
+            timeout (float): Seconds to wait for a response. Defaults to 0.2.
+            retries (int): The number of repetitions per parameter. Defaults to 2.
+            onComplete (callable, optional): Called with the readout when it is complete.
+            checksum (Checksum, optional): The frame checksum. Defaults to XorChecksum.
+        """
+        self.window = window
+        self.timeout = timeout
+        self.retries = retries
+        self.answered = []
+        self.failed = []
+        self.sent = 0
+        self.duration = 0.0
+        self.done = threading.Event()
+        self._send = send
+        self._onComplete = onComplete
+        self._batch = FrameBatch(checksum, capacity=window)
+        self._open = deque(signal.index for signal in signals)
+        self.total = len(self._open)
+        self._inFlight = {}
+        self._attempts = {}
+        self._cancelled = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        """Starts the readout thread.
+        """
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Stops the readout, the remaining parameters count as failed.
+        """
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def responseReceived(self, index) -> None:
+        """Marks the parameter of a RESPONSE as answered.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the response.
+        """
+        with self._condition:
+            if self._inFlight.pop(index, None) is not None:
+                self.answered.append(index)
+                self._condition.notify()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Waits until the readout is complete.
+
+        Args:
+            timeout (float, optional): The maximum time to wait in seconds.
+
+        Returns:
+            bool: True if the readout is complete.
+        """
+        return self.done.wait(timeout)
+
+    def _run(self) -> None:
+        start = time.monotonic_ns()
+        timeout = int(self.timeout * 1e9)
+        inFlight, attempts, pending = self._inFlight, self._attempts, self._open
+        batch = self._batch
+        with self._condition:
+            while not self._cancelled:
+                now = time.monotonic_ns()
+                for index, deadline in list(inFlight.items()):
+                    if deadline <= now:
+                        del inFlight[index]
+                        if attempts[index] > self.retries:
+                            self.failed.append(index)
+                            logger.warning(f"No response for {index} after {attempts[index]} requests")
+                        else:
+                            pending.appendleft(index)
+                while pending and len(inFlight) < self.window:
+                    index = pending.popleft()
+                    attempts[index] = attempts.get(index, 0) + 1
+                    inFlight[index] = now + timeout
+                    batch.addReadRequest(index)
+                if batch.count:
+                    self.sent += batch.count
+                    self._send(batch)
+                if not pending and not inFlight:
+                    break
+                self._condition.wait(max(min(inFlight.values()) - now, 0) / 1e9)
+            self.failed.extend(inFlight)
+            self.failed.extend(pending)
+            inFlight.clear()
+            pending.clear()
+        self.duration = (time.monotonic_ns() - start) / 1e9
+        logger.info(f"Readout complete: {len(self.answered)} of {self.total} parameters in "
+                    f"{self.duration * 1000:.1f} ms, {self.sent} requests, {len(self.failed)} failed")
+        self.done.set()
+        if self._onComplete is not None:
+            self._onComplete(self)
@@ -0,0 +1,191 @@
+""" replayTransport.py
+
+This module provides a replay transport for recorded serial captures.
+ReplaySerial implements the part of the serial.Serial interface used by the
+UartHelper and feeds the received bytes of a capture file back into the normal
+receive pipeline, either in real time, N times faster or as fast as possible.
+Transmitted bytes are accepted and discarded.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import threading
+import time
+import logging
+from moduls.captureRecorder import readCapture, DIRECTION_RX
+
+logger = logging.getLogger(__name__)
+
+class ReplaySerial:
+    """
+    Stand-in for serial.Serial which replays the received data of a capture file.
+
+    The replay clock starts with the first read, so data is not lost by the
+    reset_input_buffer() calls during connect.
+
+    Attributes:
+        path (str): The path of the capture file.
+        speed (float): The replay speed, 1.0 is real time, 0 is as fast as possible.
+        port (str): The port name, set by UartHelper.connect().
+        timeout (float): The read timeout in seconds.
+        is_open (bool): Flag indicating if the transport is open.
+        written (int): The number of discarded transmitted bytes.
+
+    Methods:
+        open(): Opens the transport and rewinds the capture.
+        close(): Closes the transport.
+        isFinished(): Checks if all recorded data was read.
+        reset_input_buffer(): Drops all data which is due but not read yet.
+        reset_output_buffer(): Does nothing.
+        read(size): Reads up to size bytes, waits for data until the timeout.
+        readinto(b): Reads into a writable buffer.
+        write(data): Discards the data.
+        cancel_read(): Wakes up a blocked read().
+    """
+    _fastChunkSize = 65536
+
+    def __init__(self, path: str, speed: float = 1.0, timeout: float = 0.5) -> None:
+        """
+        Initialize the ReplaySerial class and load the capture.
+
+        Args:
+            path (str): The path of the capture file.
+            speed (float): The replay speed, 1.0 is real time, 0 is as fast as possible.
+            timeout (float): The read timeout in seconds.
+        """
+        self.path = path
+        self.speed = speed
+        self.port = path
+        self.timeout = timeout
+        self.is_open = False
+        self.written = 0
+        self._records = [(timestamp, data) for timestamp, direction, data in readCapture(path)
+                         if direction == DIRECTION_RX and data]
+        self._pending = bytearray()
+        self._next = 0
+        self._start = None
+        self._cancel = threading.Event()
+        logger.info(f"Loaded {len(self._records)} received chunks from: {path}")
+
+    def open(self) -> None:
+        """Opens the transport and rewinds the capture.
+        """
+        self._pending.clear()
+        self._next = 0
+        self._start = None
+        self._cancel.clear()
+        self.is_open = True
+
+    def close(self) -> None:
+        """Closes the transport.
+        """
+        self.is_open = False
+        self._cancel.set()
+
+    def isFinished(self) -> bool:
+        """Checks if all recorded data was read.
+
+        Returns:
+            bool: True if the replay started and no data is left.
+        """
+        return self._start is not None and self._next >= len(self._records) and not self._pending
+
+    def reset_input_buffer(self) -> None:
+        """Drops all data which is due but not read yet.
+        """
+        self._pending.clear()
+
+    def reset_output_buffer(self) -> None:
+        """Does nothing, transmitted data is discarded anyway.
+        """
+
+    @property
+    def in_waiting(self) -> int:
+        self._due()
+        return len(self._pending)
+
+    def _due(self) -> float | None:
+        """Moves all records which are due into the pending data.
+
+        Returns:
+            float | None: Seconds until the next record is due, None if no record is left.
+        """
+        records = self._records
+        if self._start is None:
+            self._start = time.monotonic_ns()
+        if self._next >= len(records):
+            return None
+        if not self.speed:
+            # hand out the capture in chunks to keep the pending data small
+            while self._next < len(records) and len(self._pending) < self._fastChunkSize:
+                self._pending += records[self._next][1]
+                self._next += 1
+            return 0.0 if self._next < len(records) else None
+        elapsed = (time.monotonic_ns() - self._start) * self.speed
+        first = records[0][0]
+        while self._next < len(records):
+            timestamp, data = records[self._next]
+            offset = timestamp - first
+            if offset > elapsed:
+                return (offset - elapsed) / self.speed / 1e9
+            self._pending += data
+            self._next += 1
+        return None
+
+    def read(self, size: int = 1) -> bytes:
+        """Reads up to size bytes, waits for data until the timeout.
+
+        Args:
+            size (int): The number of bytes to read.
+
+        Returns:
+            bytes: The data, may be shorter than size.
+        """
+        deadline = time.monotonic() + self.timeout
+        while self.is_open:
+            wait = self._due()
+            available = len(self._pending)
+            if available >= size or (wait is None and available):
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._cancel.wait(remaining if wait is None else min(wait, remaining)):
+                self._cancel.clear()
+                break
+        data = bytes(self._pending[:size])
+        del self._pending[:size]
+        return data
+
+    def readinto(self, b) -> int:
+        """Reads into a writable buffer.
+
+        Args:
+            b (memoryview): The buffer to fill.
+
+        Returns:
+            int: The number of bytes read.
+        """
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def write(self, data) -> int:
+        """Discards the data.
+
+        Args:
+            data (bytes): The data to send.
+
+        Returns:
+            int: The number of bytes "sent".
+        """
+        self.written += len(data)
+        return len(data)
+
+    def cancel_read(self) -> None:
+        """Wakes up a blocked read().
+        """
+        self._cancel.set()
@@ -0,0 +1,318 @@
+""" requestScheduler.py
+
+This module schedules the cyclic read requests and the written values.
+The deadlines of all cyclic signals and CyclicSend messages are kept in a heap,
+so the send thread sleeps exactly until the next deadline instead of scanning
+all signals every few milliseconds. Written values wake the send thread
+immediately, unless the signal was written less than its writeInterval ago.
+Such writes are held back until the interval has passed and only the last
+value is sent. All deadlines use the monotonic clock.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import heapq
+import threading
+import time
+import logging
+from moduls.uartDefines import UART_Message, MSG_Type, CyclicSend
+from moduls.dataClasses import Signale
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledJob:
+    """
+    A cyclic request or message in the scheduler, including its timing statistics.
+
+    Attributes:
+        signal (Signale): The signal to read, None for a CyclicSend message.
+        cyclicSend (CyclicSend): The message to send, None for a signal.
+        deadline (int): The next deadline in monotonic ns.
+        sends (int): The number of sends.
+        lastSend (int): The monotonic time of the last send in ns.
+        jitterMax (int): The largest delay behind the deadline in ns.
+
+    Methods:
+        name() -> str: Returns the name for the statistics.
+        period() -> int: Returns the configured period in ns.
+        message() -> UART_Message: Returns the message to send.
+        periodMs() -> float: Returns the achieved mean period in ms.
+        jitterMs() -> float: Returns the mean delay behind the deadline in ms.
+    """
+    __slots__ = ("signal", "cyclicSend", "deadline", "sends", "lastSend",
+                 "jitterMax", "_periodSum", "_periods", "_jitterSum")
+
+    def __init__(self, signal: Signale = None, cyclicSend: CyclicSend = None, deadline: int = 0) -> None:
+        """
+        Initialize the ScheduledJob class.
+
+        Args:
+            signal (Signale, optional): The signal to read.
+            cyclicSend (CyclicSend, optional): The message to send, if no signal is given.
+            deadline (int): The first deadline in monotonic ns. Defaults to 0.
+        """
+        self.signal = signal
+        self.cyclicSend = cyclicSend
+        self.deadline = deadline
+        self.sends = 0
+        self.lastSend = 0
+        self.jitterMax = 0
+        self._periodSum = 0
+        self._periods = 0
+        self._jitterSum = 0
+
+    def name(self) -> str:
+        """Returns the name for the statistics.
+
+        Returns:
+            str: The signal name, or the type and index of the CyclicSend message.
+        """
+        if self.signal is not None:
+            return self.signal.name
+        message = self.cyclicSend.message
+        return f"{message.type.name} {message.index}"
+
+    def period(self) -> int:
+        """Returns the configured period, at least 1 ms.
+
+        Returns:
+            int: The cycleTime of the signal or the interval of the message in ns.
+        """
+        interval = self.signal.cycleTime if self.signal is not None else self.cyclicSend.interval
+        return max(int(interval), 1) * 1000000
+
+    def message(self) -> UART_Message:
+        """Returns the message to send.
+
+        Returns:
+            UART_Message: A READ_REQUEST of the signal or the CyclicSend message.
+        """
+        if self.signal is not None:
+            return UART_Message(type=MSG_Type.READ_REQUEST, index=self.signal.index)
+        return self.cyclicSend.message
+
+    def _sent(self, now: int) -> None:
+        if self.lastSend:
+            self._periodSum += now - self.lastSend
+            self._periods += 1
+        jitter = now - self.deadline
+        self._jitterSum += jitter
+        if jitter > self.jitterMax:
+            self.jitterMax = jitter
+        self.sends += 1
+        self.lastSend = now
+
+    def periodMs(self) -> float:
+        """Returns the achieved mean period.
+
+        Returns:
+            float: The mean time between two sends in ms, 0 before the second send.
+        """
+        return self._periodSum / self._periods / 1e6 if self._periods else 0.0
+
+    def jitterMs(self) -> float:
+        """Returns the mean delay of the sends behind their deadline.
+
+        Returns:
+            float: The mean delay in ms, 0 before the first send.
+        """
+        return self._jitterSum / self.sends / 1e6 if self.sends else 0.0
+
+
+class RequestScheduler:
+    """
+    Deadline scheduler for the cyclic requests of the UartHelper.
+
+    Signals are scheduled with scheduleSignals() and rescheduled with every
+    send, so changes of Signale.cycleTime take effect with the next request.
+    A signal with cyclic set to False is dropped from the heap and from jobs when it is due.
+
+    Attributes:
+        jobs (dict): The ScheduledJob per scheduled signal index.
+        coalescedWrites (int): The number of writes which were replaced by a later value before they were sent.
+
+    Methods:
+        scheduleSignals(signals): (Re)schedules all cyclic signals and collects pending writes.
+        addCyclicSend(cyclicSend): Schedules a CyclicSend message.
+        notifyWrite(signal): Wakes the send thread for a written signal.
+        wake(): Wakes the send thread without work, e.g. to stop it.
+        wait(deadline) -> tuple: Waits for the next deadline or write.
+        poll() -> tuple: Collects the written signals and due jobs without waiting.
+        statistics() -> dict: Returns the achieved period and jitter per job.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the RequestScheduler class.
+        """
+        self.jobs = {}
+        self._cyclicSends = []
+        self._heap = []
+        self._sequence = 0
+        self._writes = {}
+        self._held = {}
+        self._writeReady = {}
+        self.coalescedWrites = 0
+        self._woken = False
+        self._condition = threading.Condition()
+
+    def _push(self, job: ScheduledJob) -> None:
+        heapq.heappush(self._heap, (job.deadline, self._sequence, job))
+        self._sequence += 1
+
+    def scheduleSignals(self, signals) -> None:
+        """(Re)schedules all cyclic signals and collects the pending writes.
+
+        Cyclic signals are due immediately, their statistics start again. The jobs
+        of signals which are not cyclic any more are removed.
+
+        Args:
+            signals (UARTSignals): The signals to schedule.
+        """
+        now = time.monotonic_ns()
+        with self._condition:
+            self._heap = []
+            for cyclicSend in self._cyclicSends:
+                self._push(cyclicSend)
+            jobs = {}
+            for signal in signals:
+                if signal.valueWritten:
+                    self._writes[signal.index] = signal
+                if not signal.cyclic:
+                    continue
+                job = jobs[signal.index] = ScheduledJob(signal=signal, deadline=now)
+                self._push(job)
+            self.jobs = jobs
+            self._condition.notify()
+
+    def addCyclicSend(self, cyclicSend: CyclicSend) -> None:
+        """Schedules a CyclicSend message, the first send is due immediately.
+
+        Args:
+            cyclicSend (CyclicSend): The message and its interval.
+        """
+        job = ScheduledJob(cyclicSend=cyclicSend, deadline=time.monotonic_ns())
+        with self._condition:
+            self._cyclicSends.append(job)
+            self._push(job)
+            self._condition.notify()
+
+    def notifyWrite(self, signal: Signale) -> None:
+        """Wakes the send thread for a written signal.
+
+        A signal which is already waiting to be sent is only counted as coalesced,
+        its last value is sent.
+
+        Args:
+            signal (Signale): The written signal.
+        """
+        with self._condition:
+            index = signal.index
+            if index in self._writes or index in self._held:
+                self.coalescedWrites += 1
+                return
+            self._writes[index] = signal
+            self._condition.notify()
+
+    def wake(self) -> None:
+        """Wakes the send thread without work, e.g. to stop it.
+        """
+        with self._condition:
+            self._woken = True
+            self._condition.notify()
+
+    def wait(self, deadline: int = None) -> tuple:
+        """Waits until a job is due, a signal was written or wake() was called.
+
+        The due jobs are rescheduled for their next deadline. If a job is late by
+        more than one period, the schedule is restarted from now instead of
+        sending a burst of requests.
+
+        Args:
+            deadline (int, optional): An additional monotonic time in ns to wake up, e.g. for a retry.
+
+        Returns:
+            tuple: The written signals and the due ScheduledJobs.
+        """
+        condition = self._condition
+        with condition:
+            while True:
+                now = time.monotonic_ns()
+                wakeUp = self._nextDeadline()
+                if deadline is not None and (wakeUp is None or deadline < wakeUp):
+                    wakeUp = deadline
+                if self._writes or self._woken or (wakeUp is not None and wakeUp <= now):
+                    break
+                condition.wait((wakeUp - now) / 1e9 if wakeUp is not None else None)
+            return self._collect(now)
+
+    def poll(self) -> tuple:
+        """Collects the written signals and the due jobs without waiting, e.g. for an event loop.
+
+        Returns:
+            tuple: The written signals, the due ScheduledJobs and the next deadline of a job or a held write as monotonic time in ns, None if there is none.
+        """
+        with self._condition:
+            writes, due = self._collect(time.monotonic_ns())
+            return writes, due, self._nextDeadline()
+
+    def _nextDeadline(self) -> int | None:
+        deadline = self._heap[0][0] if self._heap else None
+        for index in self._held:
+            ready = self._writeReady[index]
+            if deadline is None or ready < deadline:
+                deadline = ready
+        return deadline
+
+    def _collect(self, now: int) -> tuple:
+        heap = self._heap
+        self._woken = False
+        writeReady = self._writeReady
+        held = self._held
+        for index, signal in self._writes.items():
+            held[index] = signal
+        self._writes.clear()
+        writes = []
+        for index, signal in list(held.items()):
+            if writeReady.get(index, 0) > now:
+                continue
+            del held[index]
+            writes.append(signal)
+            if signal.writeInterval:
+                writeReady[index] = now + signal.writeInterval * 1000000
+        due = []
+        while heap and heap[0][0] <= now:
+            job = heapq.heappop(heap)[2]
+            if job.signal is not None:
+                index = job.signal.index
+                if self.jobs.get(index) is not job:
+                    # replaced by scheduleSignals()
+                    continue
+                if not job.signal.cyclic:
+                    del self.jobs[index]
+                    continue
+            job._sent(now)
+            due.append(job)
+            period = job.period()
+            job.deadline += period
+            if job.deadline <= now:
+                job.deadline = now + period
+            self._push(job)
+        return writes, due
+
+    def statistics(self) -> dict:
+        """Returns the achieved period and jitter per job.
+
+        Returns:
+            dict: Per job name a dict with sends, periodMs, jitterMs and jitterMaxMs.
+        """
+        with self._condition:
+            jobs = list(self.jobs.values()) + self._cyclicSends
+        return {job.name(): {"sends": job.sends,
+                             "periodMs": job.periodMs(),
+                             "jitterMs": job.jitterMs(),
+                             "jitterMaxMs": job.jitterMax / 1e6} for job in jobs}
@@ -0,0 +1,146 @@
+""" ringBuffer.py
+
+This module provides a fixed capacity receive buffer for the UART reader.
+The buffer is allocated once, filled directly by serial.Serial.readinto()
+and parsed in place by the FrameDecoder. Read and write cursors replace the
+reallocation of the buffer after every frame.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RingBuffer:
+    """
+    Fixed capacity receive buffer with read and write cursors.
+
+    The unread data is always kept contiguous so it can be handed to the decoder
+    as one memoryview. When the write cursor reaches the end of the storage, the
+    unread rest (usually less than one frame) is moved back to the start.
+
+    Attributes:
+        capacity (int): The size of the buffer in bytes.
+        overruns (int): Number of reads which could not take all waiting data.
+        discarded (int): Number of received bytes which did not belong to a valid frame.
+
+    Methods:
+        __len__(): Returns the number of unread bytes.
+        data(): Returns a view on the unread bytes.
+        freeSpace(): Returns the number of bytes which can be written.
+        readFrom(ser, size): Reads up to size bytes from the serial port into the buffer.
+        write(data): Copies data into the buffer.
+        consume(size, discarded): Marks bytes as read.
+        clear(): Drops all unread bytes.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        """
+        Initialize the RingBuffer class.
+
+        Args:
+            capacity (int): The size of the buffer in bytes. Defaults to 4096.
+        """
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._read = 0
+        self._write = 0
+        self.overruns = 0
+        self.discarded = 0
+
+    def __len__(self) -> int:
+        return self._write - self._read
+
+    def data(self) -> memoryview:
+        """Returns a view on the unread bytes.
+
+        The view is only valid until the next call to readFrom() or write().
+
+        Returns:
+            memoryview: The unread bytes.
+        """
+        return self._view[self._read:self._write]
+
+    def freeSpace(self) -> int:
+        """Returns the number of bytes which can be written.
+
+        Returns:
+            int: The free space including the space gained by compacting.
+        """
+        return self.capacity - len(self)
+
+    def _reserve(self, size: int) -> memoryview:
+        """Returns a writable view of up to size bytes behind the write cursor.
+
+        Args:
+            size (int): The number of bytes which should be written.
+
+        Returns:
+            memoryview: The writable view, may be shorter than size.
+        """
+        if self.capacity - self._write < size and self._read > 0:
+            unread = len(self)
+            self._view[:unread] = self._view[self._read:self._write]
+            self._read, self._write = 0, unread
+        if self._write == self.capacity:
+            # no frame fits into the unread data, drop it to make room
+            logger.warning(f"Receive buffer full, dropping {len(self)} bytes")
+            self.consume(len(self), len(self))
+        if size > self.capacity - self._write:
+            self.overruns += 1
+            size = self.capacity - self._write
+        return self._view[self._write:self._write + size]
+
+    def readFrom(self, ser, size: int) -> int:
+        """Reads up to size bytes from the serial port into the buffer.
+
+        Args:
+            ser (serial.Serial): The serial port to read from.
+            size (int): The number of bytes waiting in the port.
+
+        Returns:
+            int: The number of bytes read.
+        """
+        target = self._reserve(size)
+        read = ser.readinto(target) or 0
+        target.release()
+        self._write += read
+        return read
+
+    def write(self, data) -> int:
+        """Copies data into the buffer.
+
+        Args:
+            data (bytes): The data to copy.
+
+        Returns:
+            int: The number of bytes copied.
+        """
+        target = self._reserve(len(data))
+        size = len(target)
+        target[:] = data[:size]
+        target.release()
+        self._write += size
+        return size
+
+    def consume(self, size: int, discarded: int = 0) -> None:
+        """Marks bytes as read.
+
+        Args:
+            size (int): The number of bytes to mark as read.
+            discarded (int): How many of these bytes were not part of a valid frame.
+        """
+        self._read += size
+        self.discarded += discarded
+        if self._read == self._write:
+            self._read, self._write = 0, 0
+
+    def clear(self) -> None:
+        """Drops all unread bytes.
+        """
+        self._read, self._write = 0, 0
@@ -0,0 +1,142 @@
+""" serialPool.py
+
+This module serves the serial ports of several devices from one thread.
+The SerialPool runs an asyncio event loop in a background thread, every
+PooledUartHelper registers its port and its request timers in this loop.
+N devices need one thread instead of a reader and a sender thread each.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future
+from moduls.asyncUartHelper import AsyncUartHelper
+from moduls.dataClasses import UARTSignals
+
+logger = logging.getLogger(__name__)
+
+
+class SerialPool:
+    """
+    Event loop thread shared by several PooledUartHelpers.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The event loop of the pool.
+
+    Methods:
+        call(function, *args): Runs a function in the loop thread and returns its result.
+        stop(): Stops the loop thread.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the SerialPool class and start the loop thread.
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True, name="SerialPool")
+        self._thread.start()
+        logger.info(f"Init version: {__version__}")
+
+    def call(self, function, *args):
+        """Runs a function in the loop thread and returns its result.
+
+        Args:
+            function (callable): The function to run.
+            *args: The arguments of the function.
+
+        Returns:
+            The result of the function, its exception is raised in the calling thread.
+        """
+        if threading.current_thread() is self._thread:
+            return function(*args)
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(function(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        self.loop.call_soon_threadsafe(run)
+        return future.result()
+
+    def stop(self) -> None:
+        """Stops the loop thread.
+        """
+        if not self._thread.is_alive():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class PooledUartHelper(AsyncUartHelper):
+    """
+    AsyncUartHelper which runs in the loop of a SerialPool and can be used from any thread.
+
+    Received messages are put into the message_stack for the App.
+
+    Attributes:
+    -----------
+    pool : SerialPool
+        The pool which serves the serial port.
+
+    Methods:
+    --------
+    connect(port: str, updateSignals: bool = False, onReadout: callable = None) -> bool:
+        Connect to the specified serial port in the loop of the pool.
+
+    disconnect() -> bool:
+        Disconnect from the serial port in the loop of the pool.
+
+    cleanUp() -> None:
+        Stop the reading and the cyclic requests in the loop of the pool.
+    """
+
+    def __init__(self, uartSignals: UARTSignals, pool: SerialPool, **kwargs) -> None:
+        """
+        Initialize the PooledUartHelper class.
+
+        Args:
+            uartSignals (UARTSignals): An instance of UARTSignals containing signal definitions.
+            pool (SerialPool): The pool which serves the serial port.
+            **kwargs: Passed to the AsyncUartHelper.
+        """
+        super().__init__(uartSignals, **kwargs)
+        self.pool = pool
+
+    def connect(self, port: str, updateSignals: bool = False, onReadout=None) -> bool:
+        """
+        Connect to the specified serial port in the loop of the pool.
+
+        Args:
+            port (str): The serial port to connect to.
+            updateSignals (bool): Flag to indicate if all signals should be read after connection.
+            onReadout (callable, optional): Called with the ParameterReadout when all signals were read.
+
+        Returns:
+            bool: True if connection is successful, False otherwise.
+        """
+        return self.pool.call(super().connect, port, updateSignals, onReadout)
+
+    def disconnect(self) -> bool:
+        """
+        Disconnect from the serial port in the loop of the pool.
+
+        Returns:
+            bool: True if disconnection is successful, False otherwise.
+        """
+        return self.pool.call(super().disconnect)
+
+    def cleanUp(self) -> None:
+        """
+        Stop the reading and the cyclic requests in the loop of the pool.
+        """
+        if self.pool.loop.is_closed():
+            return
+        self.pool.call(super().cleanUp)
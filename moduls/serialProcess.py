@@ -0,0 +1,625 @@
+""" serialProcess.py
+
+This module runs the serial communication in a separate process, so the GUI
+can no longer delay the protocol timing. The SerialEngine runs an
+AsyncUartHelper in the child process. It publishes every received frame into
+a shared memory ring and takes the writes and schedule changes from a second
+ring. The SerialProcess in the GUI process provides the interface of the
+UartHelper which is used by the App and the GuiHelper. Statistics, e.g. the
+latency histograms, are sent a few times per second through a queue.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import asyncio
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+import logging
+from enum import Enum
+from typing import NamedTuple
+import serial.tools.list_ports
+from moduls.uartDefines import MESSAGE_ID_TABLE, RxMessage, _enumValue
+from moduls.dataClasses import UARTSignals
+from moduls.signalCatalogue import SignalCatalogue
+from moduls.sharedRing import SharedRing
+from moduls.latencyHistogram import LatencyTracker, LatencyHistogram
+from moduls.requestScheduler import RequestScheduler
+from moduls.writeTransaction import WriteTracker
+from moduls.linkBudget import LinkBudget
+
+logger = logging.getLogger(__name__)
+
+
+class EngineCommand(Enum):
+    """Enum for the commands from the GUI process to the SerialEngine.
+    """
+    WRITE = 0x0
+    SCHEDULE = 0x1
+    RESCHEDULE = 0x2
+    READ_ALL = 0x3
+    RESET_LATENCY = 0x4
+    CONTROL = 0x5
+    STOP = 0x6
+    # the time.time_ns() of the write in the GUI process, sent before the WRITE of an urgent signal
+    STAMP = 0x7
+
+
+class ReadoutResult(NamedTuple):
+    """
+    Result of a parameter readout in the SerialEngine.
+
+    Attributes:
+        answered (list): The indices of the answered parameters.
+        failed (list): The indices of the parameters without a response.
+        sent (int): The number of sent requests, including retries.
+        duration (float): The time from start until completion in seconds.
+        total (int): The number of parameters to read.
+    """
+    answered: list
+    failed: list
+    sent: int
+    duration: float
+    total: int
+
+
+class RemoteJob:
+    """
+    The achieved period and jitter of a ScheduledJob in the SerialEngine.
+
+    Methods:
+        periodMs() -> float: Returns the mean period in ms.
+        jitterMs() -> float: Returns the mean jitter in ms.
+    """
+    __slots__ = ("_periodMs", "_jitterMs")
+
+    def __init__(self, periodMs: float, jitterMs: float) -> None:
+        """
+        Initialize the RemoteJob class.
+
+        Args:
+            periodMs (float): The mean period of the ScheduledJob in ms.
+            jitterMs (float): The mean jitter of the ScheduledJob in ms.
+        """
+        self._periodMs = periodMs
+        self._jitterMs = jitterMs
+
+    def periodMs(self) -> float:
+        """Returns the mean period.
+
+        Returns:
+            float: The mean period of the ScheduledJob in ms.
+        """
+        return self._periodMs
+
+    def jitterMs(self) -> float:
+        """Returns the mean jitter.
+
+        Returns:
+            float: The mean jitter of the ScheduledJob in ms.
+        """
+        return self._jitterMs
+
+
+class SerialEngine:
+    """
+    The serial communication in the child process.
+
+    Attributes:
+        uart (AsyncUartHelper): The serial communication.
+        samples (SharedRing): The received frames for the GUI process.
+        commands (SharedRing): The commands of the GUI process.
+
+    Methods:
+        run(): Connects and serves the commands until STOP.
+    """
+    _commandInterval = 1E-3
+    _statsInterval = 0.25
+
+    def __init__(self, port: str, checksum: str, settings: list, updateSignals: bool,
+                 samples: SharedRing, commands: SharedRing, events, control, capture: str = None,
+                 catalogue: SignalCatalogue = None, wakeup=None) -> None:
+        """
+        Initialize the SerialEngine class.
+
+        Args:
+            port (str): The serial port to connect to.
+            checksum (str): The frame checksum of the firmware, "xor" or "crc8".
+            settings (list): (index, cyclic, cycleTime) per signal.
+            updateSignals (bool): Read all signals after connection.
+            samples (SharedRing): The sample ring, attached in this process.
+            commands (SharedRing): The command ring, attached in this process.
+            events (multiprocessing.Queue): Events and statistics for the GUI process.
+            control (multiprocessing.Queue): Commands with arguments, announced by a CONTROL command.
+            capture (str, optional): Record the raw serial traffic to this capture file.
+            catalogue (SignalCatalogue, optional): The signal definitions of the GUI process.
+            wakeup (multiprocessing.connection.Connection, optional): Receives a notification per
+                command, so the loop runs the command as soon as it arrives.
+        """
+        from moduls.asyncUartHelper import AsyncUartHelper
+        self.port = port
+        self.updateSignals = updateSignals
+        self.capture = capture
+        self.samples = samples
+        self.commands = commands
+        self._events = events
+        self._control = control
+        self._wakeup = wakeup
+        self._commandReady = None
+        self._writeStamp = None
+        self._publishNow = False
+        self._signals = UARTSignals(catalogue)
+        for signal in self._signals:
+            # the GUI process scales the values, the engine only handles raw payloads
+            signal.isRaw = True
+        for index, cyclic, cycleTime in settings:
+            signal = self._signals.byIndex(index)
+            if signal is not None:
+                signal.cyclic = cyclic
+                signal.cycleTime = cycleTime
+        self.uart = AsyncUartHelper(self._signals, checksum=checksum)
+        self.uart.messageHandler = self._publish
+
+    def _publish(self, messages: list) -> None:
+        self.samples.putMany((message.rxTimestamp, message.payload,
+                              (message.type.value << 6) | _enumValue(message.index)) for message in messages)
+
+    def _readoutFinished(self, readout) -> None:
+        self._events.put(("readout", ReadoutResult(list(readout.answered), list(readout.failed),
+                                                   readout.sent, readout.duration, readout.total)))
+
+    def _publishStatistics(self) -> None:
+        uart = self.uart
+        # the queue pickles in a feeder thread, the snapshot must be taken now
+        with uart.latency._lock:
+            snapshot = pickle.dumps({"histograms": uart.latency.histograms,
+                                     "unmatched": uart.latency.unmatched,
+                                     "jobs": {index: RemoteJob(job.periodMs(), job.jitterMs())
+                                              for index, job in uart.scheduler.jobs.items()},
+                                     "writes": uart.writes.transactions,
+                                     "retransmitted": uart.writes.retransmitted,
+                                     "coalesced": uart.scheduler.coalescedWrites,
+                                     "urgentLatency": uart.urgentLatency,
+                                     "lastUrgentLatency": uart.lastUrgentLatency})
+        self._events.put(("statistics", snapshot))
+
+    def _execute(self, records: list) -> bool:
+        uart = self.uart
+        for value, index, command in records:
+            command = EngineCommand(command)
+            if command == EngineCommand.WRITE:
+                signal = self._signals.byIndex(index)
+                if signal is not None:
+                    signal.newValue = value
+                    signal.valueWritten = True
+                    # the clock is shared on one host, the latency includes the way from the GUI process
+                    signal.lastWritten = self._writeStamp or time.time_ns()
+                    uart._notifyWrite(signal)
+                    # the GUI waits for the latency of the urgent write
+                    self._publishNow = self._publishNow or signal.urgent
+                self._writeStamp = None
+            elif command == EngineCommand.STAMP:
+                self._writeStamp = value
+            elif command == EngineCommand.SCHEDULE:
+                signal = self._signals.byIndex(index)
+                if signal is not None:
+                    signal.cyclic = value > 0
+                    if value > 0:
+                        signal.cycleTime = value
+            elif command == EngineCommand.RESCHEDULE:
+                uart.rescheduleSignals(degrade=False)
+            elif command == EngineCommand.READ_ALL:
+                uart.readAllSignals(self._readoutFinished)
+            elif command == EngineCommand.RESET_LATENCY:
+                uart.latency.reset()
+            elif command == EngineCommand.CONTROL:
+                name, argument = self._control.get()
+                if name == "capture":
+                    if argument is None:
+                        uart.stopCapture()
+                    else:
+                        uart.startCapture(argument)
+            elif command == EngineCommand.STOP:
+                return False
+        return True
+
+    def _onWakeup(self) -> None:
+        # drop the notifications, the commands themselves are in the command ring
+        while self._wakeup.poll():
+            self._wakeup.recv_bytes()
+        self._commandReady.set()
+
+    async def run(self) -> None:
+        """Connects and serves the commands until STOP.
+        """
+        uart = self.uart
+        if self.capture is not None:
+            uart.startCapture(self.capture)
+        try:
+            connected = uart.connect(self.port, self.updateSignals, self._readoutFinished)
+        except Exception as e:
+            logger.error(f"Failed to open serial port {self.port}: {e}")
+            connected = False
+        self._events.put(("connected", connected))
+        if not connected:
+            uart.stopCapture()
+            return
+        loop = asyncio.get_running_loop()
+        self._commandReady = asyncio.Event()
+        polling = self._wakeup is None
+        if not polling:
+            try:
+                loop.add_reader(self._wakeup.fileno(), self._onWakeup)
+            except (NotImplementedError, OSError):
+                # event loops without add_reader poll the command ring instead
+                polling = True
+        nextStatistics = 0.0
+        running = True
+        while running:
+            records = self.commands.get()
+            if records:
+                running = self._execute(records)
+            now = time.monotonic()
+            if now >= nextStatistics or self._publishNow:
+                self._publishNow = False
+                self._publishStatistics()
+                nextStatistics = now + self._statsInterval
+            timeout = nextStatistics - now
+            if polling:
+                if self._wakeup is not None:
+                    self._onWakeup()
+                timeout = min(timeout, self._commandInterval)
+            try:
+                await asyncio.wait_for(self._commandReady.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._commandReady.clear()
+        if not polling:
+            loop.remove_reader(self._wakeup.fileno())
+        uart.disconnect()
+        uart.stopCapture()
+        self._publishStatistics()
+
+    def close(self) -> None:
+        """Detaches from the shared memory.
+        """
+        self.samples.close()
+        self.commands.close()
+
+
+def _engineMain(*args) -> None:
+    logging.basicConfig(level=logging.INFO, format='%(name)-30s - %(levelname)-8s - %(message)s')
+    engine = SerialEngine(*args)
+    try:
+        asyncio.run(engine.run())
+    finally:
+        engine.close()
+
+
+class _RemoteLatency(LatencyTracker):
+    """
+    LatencyTracker which shows the histograms of the SerialEngine, reset() resets them in the engine.
+    """
+
+    def __init__(self, reset) -> None:
+        super().__init__()
+        self._remoteReset = reset
+
+    def reset(self) -> None:
+        super().reset()
+        self.histograms = {}
+        self._remoteReset()
+
+
+class SerialProcess:
+    """
+    Runs the serial communication in a SerialEngine process, with the interface of the UartHelper.
+
+    Attributes:
+    -----------
+    samples : SharedRing
+        The received frames from the engine, None if not connected.
+    commands : SharedRing
+        The commands for the engine, None if not connected.
+    latency : LatencyTracker
+        The latency histograms of the engine, updated a few times per second.
+    scheduler : RequestScheduler
+        Holds a RemoteJob per cyclic signal of the engine, updated a few times per second.
+    writes : WriteTracker
+        The acknowledgement state of the written values of the engine.
+    urgentLatency : LatencyHistogram
+        The latency of the urgent writes in the engine, measured from the write in the GUI process.
+    lastUrgentLatency : int
+        The latency of the last urgent write in ns, None if none was sent.
+    linkBudget : LinkBudget
+        The bandwidth budget of the serial link for the cyclic requests.
+
+    Methods:
+    --------
+    connect(port: str, updateSignals: bool = False, onReadout: callable = None) -> bool:
+        Start the engine process and connect to the serial port.
+
+    disconnect() -> bool:
+        Stop the engine process.
+
+    isConnected() -> bool:
+        Check if the engine is connected.
+
+    listInstances() -> list:
+        List available serial ports.
+
+    getMessages(maxCount: int) -> list:
+        Get the received messages from the engine.
+
+    rescheduleSignals(degrade: bool = True) -> list:
+        Apply changed cyclic and cycleTime settings of the signals in the engine.
+
+    readAllSignals(onComplete: callable = None) -> None:
+        Read all signals from the MCU in the engine.
+
+    startCapture(path: str) -> None:
+        Start recording the raw serial traffic in the engine.
+
+    stopCapture() -> None:
+        Stop recording the raw serial traffic.
+
+    cleanUp() -> None:
+        Stop the engine process.
+    """
+
+    _sampleCapacity = 16384
+    _commandCapacity = 1024
+    _connectTimeout = 5.0
+    _stopTimeout = 2.0
+
+    def __init__(self, uartSignals: UARTSignals, checksum: str = "xor", baudrate: int = 115200) -> None:
+        """
+        Initialize the SerialProcess class.
+
+        Args:
+            uartSignals (UARTSignals): An instance of UARTSignals containing signal definitions.
+            checksum (str): The frame checksum of the firmware, "xor" or "crc8".
+            baudrate (int): The baud rate of the serial link. Defaults to 115200.
+        """
+        self.checksum = checksum
+        self.samples = None
+        self.commands = None
+        self.latency = _RemoteLatency(lambda: self._command(EngineCommand.RESET_LATENCY))
+        self.scheduler = RequestScheduler()
+        self.writes = WriteTracker()
+        self.urgentLatency = LatencyHistogram()
+        self.lastUrgentLatency = None
+        self.linkBudget = LinkBudget(baudrate)
+        self._uartSignals = uartSignals
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._events = None
+        self._control = None
+        self._connected = False
+        self._capture = None
+        self._onReadout = None
+        self._commandLock = threading.Lock()
+        self._wakeup = None
+        logger.info(f"Init version: {__version__}")
+
+    def _command(self, command: EngineCommand, index: int = 0, value: int = 0, stamp: int = None) -> None:
+        if self.commands is None:
+            return
+        records = [(value, index, command.value)]
+        if stamp is not None:
+            records.insert(0, (stamp, index, EngineCommand.STAMP.value))
+        with self._commandLock:
+            # the STAMP and its command are put at once, a full ring drops both
+            if self.commands.capacity - len(self.commands) < len(records):
+                logger.error(f"Command queue full, {command.name} dropped")
+                return
+            self.commands.putMany(records)
+            # wake the engine loop, it does not poll the command ring
+            self._wakeup.send_bytes(b"")
+
+    def _notifyWrite(self, signal) -> None:
+        if not signal.valueWritten:
+            return
+        signal.valueWritten = False
+        signal.lastTransmitted = time.time_ns()
+        self._command(EngineCommand.WRITE, _enumValue(signal.index), int(signal.getRaw()),
+                      stamp=int(signal.lastWritten) if signal.urgent else None)
+
+    def connect(self, port: str, updateSignals: bool = False, onReadout=None) -> bool:
+        """
+        Start the engine process and connect to the serial port.
+
+        Args:
+            port (str): The serial port to connect to.
+            updateSignals (bool): Flag to indicate if all signals should be read after connection.
+            onReadout (callable, optional): Called with the ReadoutResult when all signals were read.
+
+        Returns:
+            bool: True if connection is successful, False otherwise.
+        """
+        if self._process is not None:
+            logger.error("Serial port is already open")
+            return False
+        self.samples = SharedRing(self._sampleCapacity)
+        self.commands = SharedRing(self._commandCapacity)
+        self._events = self._context.Queue()
+        self._control = self._context.Queue()
+        wakeup, self._wakeup = self._context.Pipe(duplex=False)
+        self._onReadout = onReadout
+        settings = [(_enumValue(signal.index), signal.cyclic, signal.cycleTime) for signal in self._uartSignals]
+        self._process = self._context.Process(target=_engineMain, daemon=True, name="SerialEngine",
+                                              args=(port, self.checksum, settings, updateSignals,
+                                                    self.samples, self.commands,
+                                                    self._events, self._control, self._capture,
+                                                    self._uartSignals.catalogue, wakeup))
+        self._process.start()
+        # the engine has its own copy of the reading end
+        wakeup.close()
+        try:
+            name, connected = self._events.get(timeout=self._connectTimeout)
+        except queue.Empty:
+            name, connected = "connected", False
+        if not connected:
+            logger.error(f"Failed to open serial port: {port}")
+            self._stop()
+            return False
+        self._connected = True
+        for signal in self._uartSignals:
+            signal.setWriteListener(self._notifyWrite)
+            self._notifyWrite(signal)
+        logger.info(f"Connecting to: {port} in process {self._process.pid}")
+        return True
+
+    def disconnect(self) -> bool:
+        """
+        Stop the engine process.
+
+        Returns:
+            bool: True if disconnection is successful, False otherwise.
+        """
+        if self._process is None:
+            logger.error("Serial port is not open")
+            return True
+        self._command(EngineCommand.STOP)
+        self._stop()
+        logger.info("Disconnected")
+        return True
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        process.join(self._stopTimeout)
+        if process.is_alive():
+            logger.warning("Engine did not stop, terminating it")
+            process.terminate()
+            process.join()
+        self._connected = False
+        self._handleEvents()
+        for ring in (self.samples, self.commands):
+            ring.close()
+            ring.unlink()
+        self.samples = self.commands = None
+        self._wakeup.close()
+        self._wakeup = None
+        self._events.close()
+        self._control.close()
+
+    def isConnected(self) -> bool:
+        """
+        Check if the engine is connected.
+
+        Returns:
+            bool: True if connected, False otherwise.
+        """
+        return self._connected and self._process is not None and self._process.is_alive()
+
+    def listInstances(self) -> list:
+        """
+        List available serial ports.
+
+        Returns:
+            list: A list of available serial ports.
+        """
+        ret = [port.device for port in serial.tools.list_ports.comports()]
+        logger.info(f"The following instances are available: {ret}")
+        return ret
+
+    def _handleEvents(self) -> None:
+        events = self._events
+        while True:
+            try:
+                name, data = events.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                return
+            if name == "statistics":
+                data = pickle.loads(data)
+                self.latency.histograms = data["histograms"]
+                self.latency.unmatched = data["unmatched"]
+                self.scheduler.jobs = data["jobs"]
+                self.writes.transactions = data["writes"]
+                self.writes.retransmitted = data["retransmitted"]
+                self.scheduler.coalescedWrites = data["coalesced"]
+                self.urgentLatency = data["urgentLatency"]
+                self.lastUrgentLatency = data["lastUrgentLatency"]
+            elif name == "readout":
+                if self._onReadout is not None:
+                    self._onReadout(data)
+
+    def getMessages(self, maxCount: int = None) -> list:
+        """
+        Get the received messages from the engine.
+
+        Args:
+            maxCount (int, optional): The maximum number of messages. Defaults to all.
+
+        Returns:
+            list: The messages in receive order, empty if none were received.
+        """
+        if self.samples is None:
+            return []
+        self._handleEvents()
+        table = MESSAGE_ID_TABLE
+        return [RxMessage(table[id][0], table[id][1], payload, rxTimestamp)
+                for rxTimestamp, payload, id in self.samples.get(maxCount)]
+
+    def rescheduleSignals(self, degrade: bool = True) -> list:
+        """
+        Apply changed cyclic and cycleTime settings of the signals in the engine.
+
+        Args:
+            degrade (bool): Slow down low priority signals if the link budget is exceeded. Defaults to True.
+
+        Returns:
+            list: (signal, old cycleTime, new cycleTime) of every slowed down signal.
+        """
+        changes = self.linkBudget.admit(self._uartSignals) if degrade else []
+        for signal in self._uartSignals:
+            self._command(EngineCommand.SCHEDULE, _enumValue(signal.index), signal.cycleTime if signal.cyclic else 0)
+        self._command(EngineCommand.RESCHEDULE)
+        return changes
+
+    def readAllSignals(self, onComplete=None) -> None:
+        """
+        Read all signals from the MCU in the engine.
+
+        Args:
+            onComplete (callable, optional): Called with the ReadoutResult when all signals were answered or failed.
+        """
+        if onComplete is not None:
+            self._onReadout = onComplete
+        self._command(EngineCommand.READ_ALL)
+
+    def _sendControl(self, name: str, argument) -> None:
+        if self._process is None:
+            return
+        self._control.put((name, argument))
+        self._command(EngineCommand.CONTROL)
+
+    def startCapture(self, path: str) -> None:
+        """
+        Start recording the raw serial traffic in the engine.
+
+        Args:
+            path (str): The path of the capture file.
+        """
+        self._capture = path
+        self._sendControl("capture", path)
+
+    def stopCapture(self) -> None:
+        """
+        Stop recording the raw serial traffic.
+        """
+        self._capture = None
+        self._sendControl("capture", None)
+
+    def cleanUp(self) -> None:
+        """
+        Stop the engine process.
+        """
+        if self._process is not None:
+            self.disconnect()
+        logger.info("Clean up done")
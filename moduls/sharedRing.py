@@ -0,0 +1,202 @@
+""" sharedRing.py
+
+This module provides a fixed size ring of records in shared memory for the
+exchange between two processes. There is exactly one producer and one
+consumer, the producer only moves the write counter and the consumer only
+moves the read counter. The counters are read and moved under a shared lock,
+its acquire and release are memory barriers on every CPU: a record is
+complete before the consumer sees the new write counter, also on ARM.
+The records themselves are copied outside the lock.
+
+Every record holds a 64 bit value, a 16 bit word and an 8 bit code, e.g. the
+receive time, the payload and the message ID of a received frame.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import struct
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+
+logger = logging.getLogger(__name__)
+
+# value, word, code
+RECORD = struct.Struct("<qHB5x")
+# header slots of 8 bytes
+_WRITE = 0
+_READ = 1
+_DROPPED = 2
+_CAPACITY = 3
+_HEADER_SIZE = 64
+
+
+class SharedRing:
+    """
+    Single producer, single consumer ring of records in shared memory.
+
+    A ring passed to a child process, e.g. as argument of multiprocessing.Process,
+    attaches to the same shared memory and lock.
+
+    Attributes:
+        name (str): The name of the shared memory block, used to attach from the other process.
+        capacity (int): The maximum number of records in the ring.
+        lock (multiprocessing.Lock): Orders the counter updates of both processes.
+
+    Methods:
+        __len__(): Returns the number of unread records.
+        dropped() -> int: Returns the number of records dropped because the ring was full.
+        put(value, word, code) -> bool: Adds one record.
+        putMany(records) -> int: Adds several records.
+        get(maxCount) -> list: Takes up to maxCount of the oldest records.
+        close(): Detaches from the shared memory.
+        unlink(): Frees the shared memory, only called by the creator.
+    """
+
+    def __init__(self, capacity: int = 4096, name: str = None, lock=None) -> None:
+        """
+        Initialize the SharedRing class, creates a new ring or attaches to an existing one.
+
+        Args:
+            capacity (int): The maximum number of records of a new ring. Defaults to 4096.
+            name (str, optional): The name of an existing ring to attach to.
+            lock (multiprocessing.Lock, optional): The lock of the existing ring, a new ring creates one.
+
+        Raises:
+            ValueError: If an existing ring is attached without its lock.
+        """
+        if name is not None and lock is None:
+            raise ValueError("Attaching to a shared ring needs its lock")
+        # a spawn lock can be handed to spawned and forked processes
+        self.lock = lock if lock is not None else multiprocessing.get_context("spawn").Lock()
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=_HEADER_SIZE + capacity * RECORD.size)
+        else:
+            # a child process shares the resource tracker of its parent, the creator unlinks the block
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+        self._header = self._shm.buf[:_HEADER_SIZE].cast("Q")
+        if name is None:
+            for slot in range(len(self._header)):
+                self._header[slot] = 0
+            self._header[_CAPACITY] = capacity
+        self.capacity = self._header[_CAPACITY]
+        self._records = self._shm.buf[_HEADER_SIZE:_HEADER_SIZE + self.capacity * RECORD.size]
+
+    def __reduce__(self):
+        # only possible while spawning a process, the lock can not be pickled otherwise
+        return SharedRing, (self.capacity, self.name, self.lock)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self._header[_WRITE] - self._header[_READ]
+
+    def dropped(self) -> int:
+        """Returns the number of records dropped because the ring was full.
+
+        Returns:
+            int: The number of dropped records.
+        """
+        return self._header[_DROPPED]
+
+    def put(self, value: int, word: int, code: int) -> bool:
+        """Adds one record, only called by the producer.
+
+        Args:
+            value (int): The signed 64 bit value.
+            word (int): The unsigned 16 bit word.
+            code (int): The unsigned 8 bit code.
+
+        Returns:
+            bool: False if the ring is full and the record was dropped.
+        """
+        header = self._header
+        with self.lock:
+            write = header[_WRITE]
+            full = write - header[_READ] >= self.capacity
+            if full:
+                header[_DROPPED] += 1
+        if full:
+            return False
+        RECORD.pack_into(self._records, (write % self.capacity) * RECORD.size, value, word, code)
+        # publish the record after it was written, the release orders both stores
+        with self.lock:
+            header[_WRITE] = write + 1
+        return True
+
+    def putMany(self, records) -> int:
+        """Adds several records, only called by the producer.
+
+        Records which do not fit into the ring are dropped.
+
+        Args:
+            records (iterable): (value, word, code) per record.
+
+        Returns:
+            int: The number of added records.
+        """
+        header = self._header
+        with self.lock:
+            write = start = header[_WRITE]
+            free = self.capacity - (write - header[_READ])
+        dropped = 0
+        pack = RECORD.pack_into
+        buffer = self._records
+        capacity = self.capacity
+        size = RECORD.size
+        for value, word, code in records:
+            if write - start >= free:
+                dropped += 1
+                continue
+            pack(buffer, (write % capacity) * size, value, word, code)
+            write += 1
+        # publish the records after they were written, the release orders both stores
+        with self.lock:
+            header[_WRITE] = write
+            header[_DROPPED] += dropped
+        return write - start
+
+    def get(self, maxCount: int = None) -> list:
+        """Takes up to maxCount of the oldest records, only called by the consumer.
+
+        Args:
+            maxCount (int, optional): The maximum number of records. Defaults to all.
+
+        Returns:
+            list: (value, word, code) per record in the order they were added.
+        """
+        header = self._header
+        # the acquire makes the records up to the write counter visible
+        with self.lock:
+            read = header[_READ]
+            count = header[_WRITE] - read
+        if maxCount is not None:
+            count = min(count, maxCount)
+        if count <= 0:
+            return []
+        size = RECORD.size
+        start = (read % self.capacity) * size
+        end = start + count * size
+        if end <= len(self._records):
+            data = bytes(self._records[start:end])
+        else:
+            data = bytes(self._records[start:]) + bytes(self._records[:end - len(self._records)])
+        # the slots are only reused by the producer after they were copied
+        with self.lock:
+            header[_READ] = read + count
+        return list(RECORD.iter_unpack(data))
+
+    def close(self) -> None:
+        """Detaches from the shared memory.
+        """
+        self._header.release()
+        self._records.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Frees the shared memory, only called by the creator after close().
+        """
+        self._shm.unlink()
@@ -0,0 +1,200 @@
+""" signalCatalogue.py
+
+This module loads the signal definitions of the firmware from a catalogue file,
+so new firmware parameters only need a new entry instead of code changes.
+A catalogue is a JSON or TOML file with a list "signals", every entry holds
+the fields of a Signale plus the attribute name "key" under which the signal
+is found in UARTSignals, e.g.
+
+    {"key": "rpm", "name": "RPM", "index": 7, "unite": "1/min", "factor": 1,
+     "allow_negative": false, "cycleTime": 500, "cyclic": true, "priority": 2}
+
+The index is the 6 bit parameter index of the UART frame, it does not need a
+member in MSG_INDEX_PARAM. Missing fields take the defaults of Signale.
+The catalogue is compiled once into tables indexed by the parameter index:
+the scaling of every index and the message IDs the frame decoder accepts.
+JSON is parsed by the C parser of the standard library and is the format of
+the default catalogue, TOML is accepted for hand written catalogues but takes
+about 100 us per entry to parse.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import os
+import json
+import logging
+import numpy as np
+from moduls.uartDefines import MSG_Type, MESSAGE_ID_TABLE, INDEX_COUNT, UpdateRates, _enumValue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOGUE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "resources", "signals.json")
+
+# the fields of a Signale which can be set in a catalogue and their types
+_FIELDS = {"name": str, "value": (int, float), "unite": str, "index": int, "factor": (int, float),
+           "offset": (int, float), "allow_negative": bool, "isRaw": bool, "cycleTime": int, "cyclic": bool,
+           "isPersistent": bool, "noRetransmit": bool, "priority": int, "writeInterval": int, "urgent": bool}
+_REQUIRED = ("key", "name", "index")
+# the message types of a parameter index
+_PARAMETER_TYPES = (MSG_Type.RESPONSE, MSG_Type.WRITE_REQUEST, MSG_Type.READ_REQUEST)
+_RESPONSE_ID = MSG_Type.RESPONSE.value << 6
+
+
+def _tomlParser():
+    """Returns the TOML parser, only TOML catalogues need one.
+
+    Returns:
+        module: tomllib of Python 3.11 or the tomli package.
+
+    Raises:
+        ImportError: If neither is available.
+    """
+    try:
+        import tomllib
+        return tomllib
+    except ImportError:
+        pass
+    try:
+        import tomli
+        return tomli
+    except ImportError:
+        raise ImportError("TOML catalogues need Python 3.11 or the tomli package, "
+                          "use a JSON catalogue or pip install tomli") from None
+
+
+class SignalCatalogue:
+    """
+    The compiled signal definitions of a catalogue file.
+
+    Attributes:
+        path (str): The catalogue file.
+        definitions (tuple): (key, Signale keyword arguments) per signal in file order.
+        factor (np.ndarray): The scaling factor per parameter index, 1 for unused indices.
+        offset (np.ndarray): The offset per parameter index.
+        signed (np.ndarray): True per parameter index whose payload is signed.
+        raw (np.ndarray): True per parameter index whose payload is not scaled.
+        validIds (np.ndarray): True per message ID byte the frame decoder accepts.
+
+    Methods:
+        load(path) -> SignalCatalogue: Loads and compiles a catalogue file, each file only once.
+        fromEntries(entries, path) -> SignalCatalogue: Compiles already parsed entries.
+        require(keys): Checks that the catalogue defines all signals a user accesses by key.
+    """
+
+    _loaded = {}
+
+    def __init__(self, definitions: tuple, path: str = None) -> None:
+        """
+        Initialize the SignalCatalogue class, use load() or fromEntries() instead.
+
+        Args:
+            definitions (tuple): (key, Signale keyword arguments) per signal.
+            path (str, optional): The catalogue file.
+        """
+        self.path = path
+        self.definitions = definitions
+        values = np.array([_enumValue(fields["index"]) for _, fields in definitions], dtype=np.intp)
+        self.factor = np.ones(INDEX_COUNT)
+        self.factor[values] = [fields.get("factor", 1.0) for _, fields in definitions]
+        self.offset = np.zeros(INDEX_COUNT)
+        self.offset[values] = [fields.get("offset", 0.0) for _, fields in definitions]
+        self.signed = np.zeros(INDEX_COUNT, dtype=bool)
+        self.signed[values] = [fields.get("allow_negative", False) for _, fields in definitions]
+        self.raw = np.zeros(INDEX_COUNT, dtype=bool)
+        self.raw[values] = [fields.get("isRaw", False) for _, fields in definitions]
+        self.validIds = np.array([valid for _, _, valid in MESSAGE_ID_TABLE], dtype=bool)
+        for msgType in _PARAMETER_TYPES:
+            self.validIds[(msgType.value << 6) | values] = True
+
+    @classmethod
+    def load(cls, path: str = None) -> "SignalCatalogue":
+        """Loads and compiles a catalogue file, every file is only read once.
+
+        Args:
+            path (str, optional): A .json or .toml catalogue. Defaults to resources/signals.json.
+
+        Returns:
+            SignalCatalogue: The compiled catalogue.
+
+        Raises:
+            ValueError: If an entry is invalid.
+            ImportError: If a TOML catalogue is loaded without a TOML parser.
+        """
+        path = os.path.normpath(path or DEFAULT_CATALOGUE)
+        catalogue = cls._loaded.get(path)
+        if catalogue is None:
+            if path.endswith(".toml"):
+                with open(path, "rb") as file:
+                    content = _tomlParser().load(file)
+            else:
+                with open(path, "r", encoding="utf-8") as file:
+                    content = json.load(file)
+            catalogue = cls._loaded[path] = cls.fromEntries(content.get("signals", []), path)
+            logger.info(f"Loaded {len(catalogue.definitions)} signals from {path}")
+        return catalogue
+
+    @classmethod
+    def fromEntries(cls, entries: list, path: str = None) -> "SignalCatalogue":
+        """Compiles already parsed catalogue entries.
+
+        Args:
+            entries (list): One dict per signal.
+            path (str, optional): The file of the entries, used in error messages.
+
+        Returns:
+            SignalCatalogue: The compiled catalogue.
+
+        Raises:
+            ValueError: If an entry is invalid.
+        """
+        source = path or "catalogue"
+        rates = set(UpdateRates.values())
+        keys = set()
+        indices = set()
+        definitions = []
+        for number, entry in enumerate(entries):
+            where = f"{source}, signal {number} ({entry.get('name', '?')})"
+            missing = [field for field in _REQUIRED if field not in entry]
+            if missing:
+                raise ValueError(f"{where}: missing {', '.join(missing)}")
+            fields = dict(entry)
+            key = fields.pop("key")
+            for field, value in fields.items():
+                expected = _FIELDS.get(field)
+                if expected is None:
+                    raise ValueError(f"{where}: unknown field {field}")
+                # bool is an int, but no int field takes a bool
+                if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+                    raise ValueError(f"{where}: {field} has the wrong type")
+            if not key.isidentifier() or key.startswith("_") or key in keys:
+                raise ValueError(f"{where}: the key {key} is invalid or used twice")
+            index = fields["index"]
+            if not 0 <= index < INDEX_COUNT or index in indices:
+                raise ValueError(f"{where}: the index {index} is out of range or used twice")
+            if fields.get("cycleTime", 1000) not in rates:
+                raise ValueError(f"{where}: the cycleTime is not one of the update rates")
+            keys.add(key)
+            indices.add(index)
+            # the MSG_INDEX_PARAM member, a parameter of a newer firmware stays a plain integer
+            fields["index"] = MESSAGE_ID_TABLE[_RESPONSE_ID | index][1]
+            fields.setdefault("value", 0)
+            fields.setdefault("unite", "")
+            definitions.append((key, fields))
+        return cls(tuple(definitions), path)
+
+    def require(self, keys) -> None:
+        """Checks that the catalogue defines all signals a user accesses by key, e.g. the GUI.
+
+        Args:
+            keys (iterable): The keys of the needed signals.
+
+        Raises:
+            ValueError: If a key is missing.
+        """
+        defined = {key for key, _ in self.definitions}
+        missing = [key for key in keys if key not in defined]
+        if missing:
+            raise ValueError(f"{self.path or 'catalogue'}: missing the signals {', '.join(missing)}")
@@ -0,0 +1,165 @@
+""" signalTable.py
+
+This module stores the received values of the signals column by column.
+The SignalTable has one row per parameter index and keeps the values, the
+receive times and the pending write flags in NumPy arrays, the scaling is the
+compiled table of the SignalCatalogue. A batch of received frames is
+scattered into the table and scaled in one vectorized step instead of one
+Signale.update() call per frame. Every Signale of the UARTSignals is a view on
+its row, so the GUI still reads signal.value.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import logging
+import numpy as np
+from moduls.uartDefines import MSG_Type, MESSAGE_ID_TABLE, INDEX_COUNT, _enumValue
+from moduls.signalCatalogue import SignalCatalogue
+
+logger = logging.getLogger(__name__)
+
+
+class SignalTable:
+    """
+    Columnar storage of the received signal values, one row per parameter index.
+
+    Attributes:
+        catalogue (SignalCatalogue): The catalogue with the scaling of every index.
+        value (np.ndarray): The value in engineering units per index.
+        lastReceived (np.ndarray): The time of the last received value in ns per index.
+        pending (np.ndarray): True per index whose written value is not sent yet,
+            received values do not overwrite it.
+        known (np.ndarray): True per index which has a signal.
+
+    Methods:
+        bind(signal): Makes a signal a view on its row.
+        read(row) -> int | float: Returns the value of a row with the type of the signal.
+        updateRow(row, payload, timestamp): Stores the raw payload of one row.
+        scatter(rows, payloads, timestamps) -> int: Stores and scales the raw payloads of several rows.
+        applyMessages(messages) -> int: Stores the payloads of all RESPONSE messages of a batch.
+    """
+
+    # below this batch size the fixed cost of the NumPy calls is larger than the per row loop
+    _vectorThreshold = 16
+
+    def __init__(self, catalogue: SignalCatalogue) -> None:
+        """
+        Initialize the SignalTable class.
+
+        Args:
+            catalogue (SignalCatalogue): The catalogue with the scaling of every index.
+        """
+        self.catalogue = catalogue
+        self.value = np.zeros(INDEX_COUNT)
+        self.lastReceived = np.zeros(INDEX_COUNT, dtype=np.int64)
+        self.pending = np.zeros(INDEX_COUNT, dtype=bool)
+        self.known = np.zeros(INDEX_COUNT, dtype=bool)
+        # raw rows are scaled with 1 and 0, so every row takes the same multiply and add
+        self._factor = np.where(catalogue.raw, 1.0, catalogue.factor)
+        self._offset = np.where(catalogue.raw, 0.0, catalogue.offset)
+        # plain lists for the per row path, indexing a list is faster than a NumPy scalar
+        self._rowFactor = self._factor.tolist()
+        self._rowOffset = self._offset.tolist()
+        self._rowSigned = catalogue.signed.tolist()
+        # the row of every (type, index) of a received message, INDEX_COUNT if it is no RESPONSE of a signal
+        self._rowOf = {(msgType, index): INDEX_COUNT for msgType, index, _ in MESSAGE_ID_TABLE}
+        self._integral = [True] * INDEX_COUNT
+        for _, fields in catalogue.definitions:
+            # the value keeps the type the scalar scaling would give, e.g. int for the RPM
+            self._integral[_enumValue(fields["index"])] = (fields.get("isRaw", False) or
+                                                           (isinstance(fields.get("factor", 1.0), int) and
+                                                            isinstance(fields.get("offset", 0.0), int)))
+
+    def bind(self, signal) -> None:
+        """Makes a signal a view on its row, the current value is taken over.
+
+        Args:
+            signal (Signale): The signal of the row.
+        """
+        row = _enumValue(signal.index)
+        self.value[row] = signal._value
+        self.lastReceived[row] = signal._lastReceived
+        self.pending[row] = signal._valueWritten
+        self.known[row] = True
+        self._rowOf[MSG_Type.RESPONSE, signal.index] = row
+        signal._table = self
+        signal._row = row
+
+    def read(self, row: int) -> int | float:
+        """Returns the value of a row with the type of the signal.
+
+        Args:
+            row (int): The parameter index.
+
+        Returns:
+            int | float: The value.
+        """
+        value = self.value.item(row)
+        return int(value) if self._integral[row] else value
+
+    def updateRow(self, row: int, payload: int, timestamp: int) -> None:
+        """Stores the raw payload of one row.
+
+        Args:
+            row (int): The parameter index.
+            payload (int): The unsigned payload.
+            timestamp (int): The receive time in ns.
+        """
+        if not self.pending.item(row):
+            if self._rowSigned[row] and payload & 0x8000:
+                payload -= 0x10000
+            self.value[row] = payload * self._rowFactor[row] + self._rowOffset[row]
+        self.lastReceived[row] = timestamp
+
+    def scatter(self, rows: np.ndarray, payloads: np.ndarray, timestamps: np.ndarray) -> int:
+        """Stores and scales the raw payloads of several rows, the last payload of a row wins.
+
+        Args:
+            rows (np.ndarray): The row of every payload, INDEX_COUNT for payloads without a signal.
+            payloads (np.ndarray): The unsigned payloads (uint16).
+            timestamps (np.ndarray): The receive time in ns of every payload (int64).
+
+        Returns:
+            int: The number of rows which received a value.
+        """
+        # position of the last payload per row, -1 for rows without one
+        latest = np.full(INDEX_COUNT + 1, -1, dtype=np.intp)
+        np.maximum.at(latest, rows, np.arange(len(rows)))
+        latest = latest[:INDEX_COUNT]
+        received = latest >= 0
+        if not received.any():
+            return 0
+        # all rows are scaled at once, the rows without a payload are masked afterwards
+        payload = payloads[latest]
+        raw = np.where(self.catalogue.signed, payload.view(np.int16), payload)
+        np.copyto(self.value, raw * self._factor + self._offset, where=received & ~self.pending)
+        np.copyto(self.lastReceived, timestamps[latest], where=received)
+        return int(np.count_nonzero(received))
+
+    def applyMessages(self, messages: list) -> int:
+        """Stores the payloads of all RESPONSE messages of a batch, the receive time of a row
+        is the rxTimestamp of its last message.
+
+        Args:
+            messages (list): The received RxMessage records in receive order.
+
+        Returns:
+            int: The number of rows which received a value.
+        """
+        count = len(messages)
+        if count < self._vectorThreshold:
+            updated = set()
+            rowOf = self._rowOf
+            for message in messages:
+                row = rowOf[message.type, message.index]
+                if row < INDEX_COUNT:
+                    self.updateRow(row, message.payload, message.rxTimestamp)
+                    updated.add(row)
+            return len(updated)
+        types, indices, payloads, timestamps = zip(*messages)
+        rows = np.fromiter(map(self._rowOf.__getitem__, zip(types, indices)), dtype=np.intp, count=count)
+        return self.scatter(rows, np.fromiter(payloads, dtype=np.uint16, count=count),
+                            np.fromiter(timestamps, dtype=np.int64, count=count))
@@ -13,15 +13,23 @@ at specified intervals.
 __version__ = "0.0.2"
 import struct
 from enum import Enum
+from typing import NamedTuple
 import dataclasses
 import time
 import logging
+from moduls.checksum import Checksum, XorChecksum
 
 logger = logging.getLogger(__name__)
 
+# the index is the lower 6 bits of the message ID
+INDEX_COUNT = 64
+
 class MSG_Type(Enum):
     """Enum for the message type.
     """
+    # members are singletons, the identity hash keeps dict lookups in C
+    __hash__ = object.__hash__
+    
     RESPONSE = 0x0
     STATUS_MESSAGE = 0x1
     WRITE_REQUEST = 0x2
@@ -30,6 +38,8 @@ class MSG_Type(Enum):
 class MSG_INDEX_PARAM(Enum):
     """Enum for the message index.
     """
+    __hash__ = object.__hash__
+    
     VALUE_CURRENT_0 = 0x00
     VALUE_CURRENT_A = 0x01
     VALUE_CURRENT_B = 0x02
@@ -53,6 +63,8 @@ class MSG_INDEX_PARAM(Enum):
 class MSG_INDEX_STATUS(Enum):
     """Enum for the message index.
     """
+    __hash__ = object.__hash__
+    
     STATUS_OK = 0x00
     STATUS_READY = 0x01
     STATUS_REMOTE_READY = 0x02
@@ -105,13 +117,39 @@ UpdateRates = {
     "1 min": 60000,
 }
 
+def _buildIdTable() -> tuple:
+    """Builds the lookup table from message ID byte to message fields.
+
+    Returns:
+        tuple: 256 entries of (type, index, isValide). Unknown indices are stored as int.
+    """
+    table = []
+    for id in range(256):
+        msgType = MSG_Type(id >> 6)
+        indices = MSG_INDEX_STATUS if msgType == MSG_Type.STATUS_MESSAGE else MSG_INDEX_PARAM
+        try:
+            table.append((msgType, indices(id & 0x3F), True))
+        except ValueError:
+            table.append((msgType, id & 0x3F, False))
+    return tuple(table)
+
+MESSAGE_ID_TABLE = _buildIdTable()
+_ID_BY_FIELDS = {(msgType, index): id for id, (msgType, index, valid) in enumerate(MESSAGE_ID_TABLE) if valid}
+
+def _enumValue(value) -> int:
+    """Returns the value of an enum member or the value itself for plain integers.
+    """
+    return value._value_ if isinstance(value, Enum) else value
+
 class UART_Message:
     """
     Class for the UART message.
 
     Attributes:
         _format (str): The format string for struct packing/unpacking.
-        _rawPayload (bytes): The raw payload of the message.
+        _struct (struct.Struct): The precompiled struct for _format.
+        _payloadUnsigned (int): The payload as an unsigned integer.
+        _payloadSigned (int): The payload as a signed integer.
         raw (bytes): The raw data of the message.
         type (int): The type of the message.
         index (int): The index of the message.
@@ -120,6 +158,7 @@ class UART_Message:
     Methods:
         __str__(): Returns a string representation of the message.
         __len__(): Returns the length of the message.
+        fromId(id, payload): Creates a message from an ID byte and an unsigned payload.
         setPayloadUnsigned(value): Sets the payload as an unsigned integer.
         setPayloadSigned(value): Sets the payload as a signed integer.
         getPayloadUnsigned(): Gets the payload as an unsigned integer.
@@ -127,8 +166,10 @@ class UART_Message:
         decode(data): Decodes the given data into the message format.
         encode(): Encodes the message into bytes.
     """
-    _format = 'B2s'
-    _rawPayload = b''
+    _format = '>BH'
+    _struct = struct.Struct(_format)
+    _payloadUnsigned = 0
+    _payloadSigned = 0
     raw = b''
     type, index = 0, 0
     isValide = True
@@ -153,10 +194,35 @@ class UART_Message:
         if type(self.type) == MSG_Type and (type(self.index) == MSG_INDEX_PARAM or type(self.index) == MSG_INDEX_STATUS):
             return f"type: {self.type.name}, index: {self.index.name}, payload:{self.getPayloadUnsigned()}"
         else:
-            return f"type: {hex(self.type)}, index: {hex(self.index)}, payload:{self.getPayloadSigned()}"
+            return f"type: {hex(_enumValue(self.type))}, index: {hex(_enumValue(self.index))}, payload:{self.getPayloadSigned()}"
 
     def __len__(self) -> int:
-        return struct.calcsize(self._format)
+        return self._struct.size
+
+    @classmethod
+    def fromId(cls, id, payload):
+        """Creates a message from an ID byte and an unsigned payload.
+
+        Args:
+            id (int): The ID byte (type and index) of the message.
+            payload (int): The unsigned payload of the message.
+
+        Returns:
+            UART_Message: The new message.
+        """
+        message = cls()
+        message.type, message.index, message.isValide = MESSAGE_ID_TABLE[id]
+        message._setPayload(payload)
+        return message
+
+    def _setPayload(self, unsigned):
+        """Stores the unsigned payload and its signed view.
+
+        Args:
+            unsigned (int): The payload as an unsigned 16 bit integer.
+        """
+        self._payloadUnsigned = unsigned
+        self._payloadSigned = unsigned - 0x10000 if unsigned & 0x8000 else unsigned
 
     def setPayloadUnsigned(self, value):
         """Sets the payload as an unsigned integer.
@@ -164,7 +230,9 @@ class UART_Message:
         Args:
             value (int): The unsigned integer value to set as the payload.
         """
-        self._rawPayload = struct.pack('>H', value)
+        if not 0 <= value <= 0xFFFF:
+            raise struct.error("'H' format requires 0 <= number <= 65535")
+        self._setPayload(value & 0xFFFF)
 
     def setPayloadSigned(self, value):
         """Sets the payload as a signed integer.
@@ -172,7 +240,9 @@ class UART_Message:
         Args:
             value (int): The signed integer value to set as the payload.
         """
-        self._rawPayload = struct.pack('>h', value)
+        if not -0x8000 <= value <= 0x7FFF:
+            raise struct.error("'h' format requires -32768 <= number <= 32767")
+        self._setPayload(value & 0xFFFF)
 
     def getPayloadUnsigned(self):
         """Gets the payload as an unsigned integer.
@@ -180,9 +250,7 @@ class UART_Message:
         Returns:
             int: The unsigned integer payload.
         """
-        if len(self._rawPayload) == 0:
-            return 0
-        return struct.unpack('>H', self._rawPayload)[0]
+        return self._payloadUnsigned
 
     def getPayloadSigned(self):
         """Gets the payload as a signed integer.
@@ -190,9 +258,7 @@ class UART_Message:
         Returns:
             int: The signed integer payload.
         """
-        if len(self._rawPayload) == 0:
-            return 0
-        return struct.unpack('>h', self._rawPayload)[0]
+        return self._payloadSigned
 
     def decode(self, data):
         """Decodes the given data into the message format.
@@ -201,16 +267,11 @@ class UART_Message:
             data (bytes): The data to decode.
         """
         self.raw = data
-        id, self._rawPayload = struct.unpack(self._format, data)
-        self.type = MSG_Type(id >> 6)
-        try:
-            if self.type == MSG_Type.STATUS_MESSAGE:
-                self.index = MSG_INDEX_STATUS(id & 0x3F)
-            else:
-                self.index = MSG_INDEX_PARAM(id & 0x3F)
-        except ValueError:
+        id, payload = self._struct.unpack(data)
+        self.type, self.index, self.isValide = MESSAGE_ID_TABLE[id]
+        if not self.isValide:
             logger.error(f"Invalid message index: {hex(id & 0x3F)}")
-            self.isValide = False
+        self._setPayload(payload)
 
     def encode(self):
         """Encodes the message into bytes.
@@ -218,15 +279,57 @@ class UART_Message:
         Returns:
             bytes: The encoded message.
         """
-        if type(self.type) == MSG_Type:
-            self.type = self.type.value
-        if type(self.index) == MSG_INDEX_PARAM:
-            self.index = self.index.value
-        if type(self.index) == MSG_INDEX_STATUS:
-            self.index = self.index.value
+        id = _ID_BY_FIELDS.get((self.type, self.index))
+        if id is None:
+            id = (_enumValue(self.type) << 6) | (_enumValue(self.index) & 0x3F)
+        return self._struct.pack(id, self._payloadUnsigned)
 
-        id = (self.type << 6) | (self.index & 0x3F)
-        return struct.pack(self._format, id, self._rawPayload)
+
+class RxMessage(NamedTuple):
+    """
+    Immutable record of a received UART message.
+
+    The batch decoder creates one record per valid frame, so it can be handed to
+    the App without copying.
+
+    Attributes:
+        type (MSG_Type): The type of the message.
+        index (MSG_INDEX_PARAM | MSG_INDEX_STATUS | int): The index of the message, an integer
+            for parameter indices without a MSG_INDEX_PARAM member.
+        payload (int): The payload as an unsigned integer.
+        rxTimestamp (int): The receive time in nanoseconds.
+
+    Methods:
+        __str__(): Returns a string representation of the message.
+        getPayloadUnsigned(): Gets the payload as an unsigned integer.
+        getPayloadSigned(): Gets the payload as a signed integer.
+    """
+    type: MSG_Type
+    index: MSG_INDEX_PARAM | MSG_INDEX_STATUS | int
+    payload: int
+    rxTimestamp: int = 0
+
+    def __str__(self):
+        if isinstance(self.index, Enum):
+            return f"type: {self.type.name}, index: {self.index.name}, payload:{self.payload}"
+        # an index of a newer firmware without a MSG_INDEX_PARAM member
+        return f"type: {self.type.name}, index: {hex(_enumValue(self.index))}, payload:{self.payload}"
+
+    def getPayloadUnsigned(self) -> int:
+        """Gets the payload as an unsigned integer.
+
+        Returns:
+            int: The unsigned integer payload.
+        """
+        return self.payload
+
+    def getPayloadSigned(self) -> int:
+        """Gets the payload as a signed integer.
+
+        Returns:
+            int: The signed integer payload.
+        """
+        return self.payload - 0x10000 if self.payload & 0x8000 else self.payload
 
 
 class UART_Message_Frame:
@@ -235,53 +338,68 @@ class UART_Message_Frame:
 
     Attributes:
         _format (str): The format string for struct packing/unpacking.
+        _struct (struct.Struct): The precompiled struct for _format.
         start_byte (int): The start byte of the frame.
         message_raw (bytes): The raw message data.
-        crc (int): The CRC-8 checksum of the message.
+        crc (int): The checksum of the message.
+        checksum (Checksum): The checksum used to protect the message (default is XorChecksum).
         end_byte (int): The end byte of the frame.
         EOL (int): The end-of-line byte.
         _start_byte_Default (int): The default start byte.
         _end_byte_Default (int): The default end byte.
         _eol_Default (int): The default end-of-line byte.
         _newMessage (bool): Flag indicating if a new message is available.
+        _crcValide (bool): Flag indicating if the received checksum matches the message.
         message (UART_Message): The UART message.
 
     Methods:
         __str__(): Returns a string representation of the message frame.
         __len__(): Returns the length of the message frame.
-        _crc8(data): Calculates the CRC-8 checksum for the given data.
+        _crc8(data): Calculates the checksum for the given data.
         decode(data): Decodes the given data into the message frame format.
         encode(): Encodes the message frame into bytes.
+        encodeInto(buffer, offset): Encodes the message frame directly into a buffer.
         isValide(): Checks if the message frame is valid by verifying the CRC.
         isAvailable(): Checks if a new valid message is available.
     """
     _format = 'B3sBBB'
+    _struct = struct.Struct(_format)
     start_byte, message_raw, crc, end_byte, EOL = None, None, None, None, None
     _start_byte_Default = 0x3A
     _end_byte_Default = 0x3B
     _eol_Default = 0x0A
     _newMessage = False
-    message = UART_Message()
+    _crcValide = False
+    checksum = XorChecksum()
+
+    def __init__(self, message: UART_Message = None, checksum: Checksum = None):
+        """
+        Initialize the UART_Message_Frame class.
+
+        Args:
+            message (UART_Message, optional): The message to frame. Defaults to a new empty message.
+            checksum (Checksum, optional): The checksum to use. Defaults to XorChecksum.
+        """
+        self.message = message if message is not None else UART_Message()
+        if checksum is not None:
+            self.checksum = checksum
 
     def __str__(self):
         return f"Start: {hex(self.start_byte)}, {self.message}, CRC: {hex(self.crc)}, End: {hex(self.end_byte)}, EOL: {hex(self.EOL)}"
 
     def __len__(self) -> int:
-        return struct.calcsize(self._format)
+        return self._struct.size
 
     def _crc8(self, data) -> int:
-        """Calculates the CRC-8 checksum for the given data.
+        """Calculates the checksum for the given data.
 
         Args:
             data (bytes): The data to calculate the checksum for.
 
         Returns:
-            int: The CRC-8 checksum.
+            int: The checksum.
         """
-        crc = 0
-        for byte in data:
-            crc ^= byte
-        return crc
+        return self.checksum.compute(data)
 
     def decode(self, data):
         """Decodes the given data into the message frame format.
@@ -289,7 +407,8 @@ class UART_Message_Frame:
         Args:
             data (bytes): The data to decode.
         """
-        self.start_byte, self.message_raw, self.crc, self.end_byte, self.EOL = struct.unpack(self._format, data)
+        self.start_byte, self.message_raw, self.crc, self.end_byte, self.EOL = self._struct.unpack(data)
+        self._crcValide = self.checksum.compute(self.message_raw) == self.crc
         self.message.decode(self.message_raw)
         self._newMessage = True
 
@@ -307,17 +426,35 @@ class UART_Message_Frame:
             self.EOL = self._eol_Default
         if self.message_raw is None:
             self.message_raw = self.message.encode()
-        self.crc = self._crc8(self.message_raw)
-        return struct.pack(self._format, self.start_byte, self.message_raw, self.crc, self.end_byte, self.EOL)
+        self.crc = self.checksum.compute(self.message_raw)
+        self._crcValide = True
+        return self._struct.pack(self.start_byte, self.message_raw, self.crc, self.end_byte, self.EOL)
+
+    def encodeInto(self, buffer, offset: int = 0) -> int:
+        """Encodes the message frame directly into a buffer, e.g. to send several frames at once.
+
+        Args:
+            buffer (bytearray): The writable buffer.
+            offset (int): The position of the frame in the buffer.
+
+        Returns:
+            int: The number of written bytes.
+        """
+        raw = self.message.encode()
+        self._struct.pack_into(buffer, offset, self._start_byte_Default, raw, self.checksum.compute(raw),
+                               self._end_byte_Default, self._eol_Default)
+        return self._struct.size
 
     def isValide(self):
-        """Checks if the message frame is valid by verifying the CRC.
+        """Checks if the message frame is valid by verifying the start and end byte and the CRC.
+
+        The checksum itself is only calculated once in decode(), the EOL byte is not checked.
 
         Returns:
             bool: True if the message frame is valid, False otherwise.
         """
-        crc = self._crc8(self.message_raw)
-        return self.start_byte == self._start_byte_Default and self.end_byte == self._end_byte_Default and self.crc == crc and self.message.isValide
+        return (self.start_byte == self._start_byte_Default and self.end_byte == self._end_byte_Default
+                and self._crcValide and self.message.isValide)
 
     def isAvailable(self):
         """Checks if a new valid message is available.
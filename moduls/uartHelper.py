@@ -19,6 +19,17 @@ import time
 from copy import deepcopy
 from moduls.uartDefines import UART_Message, UART_Message_Frame, MSG_Type, CyclicSend
 from moduls.dataClasses import Signale, UARTSignals
+from moduls.frameDecoder import FrameDecoder, FRAME_SIZE
+from moduls.checksum import getChecksum
+from moduls.captureRecorder import CaptureRecorder, DIRECTION_RX, DIRECTION_TX
+from moduls.ringBuffer import RingBuffer
+from moduls.messageQueue import MessageQueue, DropPolicy
+from moduls.latencyHistogram import LatencyTracker, LatencyHistogram
+from moduls.requestScheduler import RequestScheduler
+from moduls.linkBudget import LinkBudget
+from moduls.frameBatch import FrameBatch
+from moduls.parameterReadout import ParameterReadout
+from moduls.writeTransaction import WriteTracker
 
 logger = logging.getLogger(__name__)
 
@@ -34,26 +45,47 @@ class UartHelper:
 
     Attributes:
     -----------
-    rxMessage : UART_Message_Frame
-        A frame to hold the received UART message.
-    _cyclicSend : list
-        A list to hold cyclic send messages.
-    _cyclicSendLock : threading.Lock
-        A lock to manage access to the cyclic send list.
     _cyclicSendThread : threading.Thread
         A thread to handle cyclic sending of messages.
     _read_thread : threading.Thread
         A thread to handle reading from the serial port.
     ser : serial.Serial
-        The serial port object.
+        The serial port object or a stand-in transport.
     read_thread : threading.Thread
         The thread used for reading from the serial port.
     reading : bool
         A flag to indicate if reading from the serial port is active.
-    buffer : bytearray
-        A buffer to hold incoming data from the serial port.
-    message_stack : list
-        A stack to hold received messages.
+    blockingRead : bool
+        A flag to indicate if the reader blocks on the port instead of polling.
+    checksum : Checksum
+        The checksum used to protect sent and received frames.
+    recorder : CaptureRecorder
+        The recorder for the raw serial traffic, None if not recording.
+    rxBuffer : RingBuffer
+        A fixed size buffer to hold incoming data from the serial port.
+    message_stack : MessageQueue
+        A bounded queue to hold received messages.
+    rxFrames : int
+        The number of decoded frames since the reader was started.
+    rxFinished : threading.Event
+        Set by the reader when a finite transport, e.g. a ReplaySerial, has no data
+        left and its last data was decoded and handed on.
+    latency : LatencyTracker
+        The request -> response latency per signal.
+    scheduler : RequestScheduler
+        The deadline scheduler for cyclic requests, CyclicSend messages and written values.
+    linkBudget : LinkBudget
+        The bandwidth budget of the serial link for the cyclic requests.
+    txBatch : FrameBatch
+        The transmit buffer of the cyclic send thread.
+    readout : ParameterReadout
+        The last parameter readout, None if no readout was started.
+    writes : WriteTracker
+        The acknowledgement state of the written values.
+    urgentLatency : LatencyHistogram
+        The time from the write of an urgent signal until its frame was handed to the serial port.
+    lastUrgentLatency : int
+        The latency of the last urgent write in ns, None if none was sent.
     _uartSignals : UARTSignals
         An instance of UARTSignals containing signal definitions.
     isSending : bool
@@ -64,7 +96,7 @@ class UartHelper:
     cleanUp() -> None:
         Clean up resources by stopping reading and cyclic send threads.
     
-    connect(port: str) -> bool:
+    connect(port: str, updateSignals: bool = False, onReadout: callable = None) -> bool:
         Connect to the specified serial port and start reading and cyclic send threads.
     
     disconnect() -> bool:
@@ -76,12 +108,30 @@ class UartHelper:
     send(message: UART_Message) -> None:
         Send a UART message.
     
+    sendBatch(batch: FrameBatch) -> None:
+        Send all frames of a batch with one write and empty it.
+    
+    sendUrgent(signal: Signale) -> None:
+        Send the written value of a signal immediately, ahead of the scheduled requests.
+    
     getMessage():
         Get the next message from the message stack.
     
+    getMessages(maxCount: int) -> list:
+        Get all or up to maxCount messages from the message stack.
+    
     addCyclicSend(message: UART_Message, interval: int) -> None:
         Add a message to be sent cyclically.
     
+    rescheduleSignals(degrade: bool = True) -> list:
+        Apply changed cyclic and cycleTime settings of the signals.
+    
+    startCapture(path: str) -> None:
+        Start recording the raw serial traffic to a capture file.
+    
+    stopCapture() -> None:
+        Stop recording the raw serial traffic.
+    
     _start_reading() -> None:
         Start the reading thread.
     
@@ -94,33 +144,73 @@ class UartHelper:
     _stop_cyclic_send() -> None:
         Stop the cyclic send thread.
     
-    _updateSignals() -> None:
-        Update the signals by sending read requests.
+    _stop_readout() -> None:
+        Stop a running parameter readout.
+    
+    readAllSignals(onComplete: callable = None) -> ParameterReadout:
+        Read all signals from the MCU with a pipelined readout.
     
     _read_from_port() -> None:
         Read data from the serial port.
     
+    _decode(decoder: FrameDecoder, read: int) -> list:
+        Decode the frames in the receive buffer after new data was read into it.
+    
+    _checkFinished() -> None:
+        Set rxFinished when the transport has no data left.
+    
     _send_cyclic() -> None:
         Send cyclic messages.
+    
+    _transmit(written: list, due: list) -> None:
+        Send the written values, the repeated writes and the due cyclic messages.
     """
 
-    rxMessage = UART_Message_Frame()
-    _cyclicSend = []
-    _cyclicSendLock = threading.Lock()
-    _cyclicSendThread = threading.Thread()
-    _read_thread = threading.Thread()
+    _rxBufferSize = 4096
+    _rxQueueSize = 4096
+    _readTimeout = 0.5
+    _readoutWindow = 8
+    _readoutTimeout = 0.2
+    _readoutRetries = 2
     
-    def __init__(self, uartSignals: UARTSignals) -> None:
+    def __init__(self, uartSignals: UARTSignals, blockingRead: bool = True,
+                 rxDropPolicy: DropPolicy = DropPolicy.COALESCE, checksum: str = "xor",
+                 transport=None) -> None:
         """
         Initialize the UartHelper class.
 
         Args:
             uartSignals (UARTSignals): An instance of UARTSignals containing signal definitions.
-        """
-        self.ser = serial.Serial(baudrate=115200, timeout=1)
+            blockingRead (bool): Block on the serial port instead of polling in_waiting.
+            rxDropPolicy (DropPolicy): What to drop when the App does not keep up with the received messages.
+            checksum (str): The frame checksum of the firmware, "xor" or "crc8".
+            transport (optional): A stand-in for serial.Serial, e.g. a ReplaySerial. Defaults to a serial port.
+        """
+        if transport is None:
+            transport = serial.Serial(baudrate=115200, timeout=self._readTimeout)
+        self.ser = transport
+        self.blockingRead = blockingRead
+        self.checksum = getChecksum(checksum)
+        self.recorder = None
         self.read_thread = None
+        self._read_thread = threading.Thread()
+        self._cyclicSendThread = threading.Thread()
         self.reading = False
-        self.message_stack = []
+        self.message_stack = MessageQueue(self._rxQueueSize, rxDropPolicy)
+        self.rxBuffer = RingBuffer(self._rxBufferSize)
+        self.rxFrames = 0
+        self.rxFinished = threading.Event()
+        self.latency = LatencyTracker()
+        self.scheduler = RequestScheduler()
+        self.linkBudget = LinkBudget(getattr(transport, "baudrate", 115200))
+        self.txBatch = FrameBatch(self.checksum)
+        self.readout = None
+        self.writes = WriteTracker()
+        self.urgentLatency = LatencyHistogram()
+        self.lastUrgentLatency = None
+        self._urgentBatch = FrameBatch(self.checksum)
+        # the send thread, the readout and urgent writes share the port
+        self._txLock = threading.RLock()
         self._uartSignals = uartSignals
         self.isSending = False
         logger.info(f"Init version: {__version__}")
@@ -129,17 +219,20 @@ class UartHelper:
         """
         Clean up resources by stopping reading and cyclic send threads.
         """
+        self._stop_readout()
         self._stop_reading()
         self._stop_cyclic_send()
+        self.stopCapture()
         logger.info("Clean up done")
         
-    def connect(self, port: str, updateSignals:bool=False) -> bool:
+    def connect(self, port: str, updateSignals:bool=False, onReadout=None) -> bool:
         """
         Connect to the specified serial port and start reading and cyclic send threads.
 
         Args:
             port (str): The serial port to connect to.
-            updateSignals (bool): Flag to indicate if signals should be updated after connection.
+            updateSignals (bool): Flag to indicate if all signals should be read after connection.
+            onReadout (callable, optional): Called with the ParameterReadout when all signals were read.
 
         Returns:
             bool: True if connection is successful, False otherwise.
@@ -154,14 +247,14 @@ class UartHelper:
             return False
         self.ser.reset_input_buffer()
         self.ser.reset_output_buffer()
+        self.writes.clear()
         self._start_reading()
         self._start_cyclic_send()
         logger.info(f"Connecting to: {port}")
         if updateSignals:
-            self._updateSignals()
+            self.readAllSignals(onReadout)
         else:
             logger.info("No signal update requested")
-        self._updateSignals()
         return True
     
     def disconnect(self) -> bool:
@@ -171,6 +264,7 @@ class UartHelper:
         Returns:
             bool: True if disconnection is successful, False otherwise.
         """
+        self._stop_readout()
         self._stop_reading()
         self._stop_cyclic_send()
         if not self.ser.is_open:
@@ -196,6 +290,11 @@ class UartHelper:
         Returns:
             list: A list of available serial ports.
         """
+        if not isinstance(self.ser, serial.Serial):
+            # a stand-in transport only provides itself
+            ret = [self.ser.port]
+            logger.info(f"The following instances are available: {ret}")
+            return ret
         ports = serial.tools.list_ports.comports()
         ret = [port.device for port in ports]
         logger.info(f"The following instances are available: {ret}")
@@ -211,21 +310,97 @@ class UartHelper:
         if not self.ser.is_open:
             logger.error("Serial port is not open")
             return
-        buf = UART_Message_Frame()
-        buf.message = message
-        self.ser.write(buf.encode())
+        buf = UART_Message_Frame(message, self.checksum)
+        data = buf.encode()
+        # the request times and the capture keep the order of the frames on the wire
+        with self._txLock:
+            self.ser.write(data)
+            if message.type in (MSG_Type.READ_REQUEST, MSG_Type.WRITE_REQUEST):
+                self.latency.requestSent(message.index, time.time_ns())
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.record(DIRECTION_TX, data)
         logger.debug(f"Send: {buf}")
+    
+    def sendBatch(self, batch: FrameBatch) -> None:
+        """
+        Send all frames of a batch with one write and empty it.
+
+        Args:
+            batch (FrameBatch): The frames to send.
+        """
+        if not batch.count:
+            return
+        if not self.ser.is_open:
+            logger.error("Serial port is not open")
+            batch.clear()
+            return
+        data = batch.data()
+        # the readout thread and the send thread send their batches concurrently,
+        # the request times and the capture keep the order of the frames on the wire
+        with self._txLock:
+            self.ser.write(data)
+            timestamp = time.time_ns()
+            requestSent = self.latency.requestSent
+            for msgType, index in batch.requests:
+                if msgType in (MSG_Type.READ_REQUEST, MSG_Type.WRITE_REQUEST):
+                    requestSent(index, timestamp)
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.record(DIRECTION_TX, data)
+        logger.debug(f"Send {batch.count} frames")
+        batch.clear()
+        
+    def sendUrgent(self, signal: Signale) -> None:
+        """
+        Send the written value of a signal immediately, ahead of the scheduled requests.
+        The frame is written from the calling thread, a repeat of an unacknowledged
+        write is sent by the scheduler.
+
+        Args:
+            signal (Signale): The written signal.
+        """
+        if not signal.valueWritten:
+            return
+        if not self.ser.is_open:
+            logger.error("Serial port is not open")
+            return
+        msg = UART_Message(type=MSG_Type.WRITE_REQUEST, index=signal.index)
+        msg.setPayloadSigned(signal.getRaw())
+        signal.valueWritten = False
+        self.writes.started(signal.index, msg.getPayloadSigned(), self.latency.outstanding(signal.index))
+        batch = self._urgentBatch
+        with self._txLock:
+            batch.add(msg)
+            self.sendBatch(batch)
+        signal.lastTransmitted = time.time_ns()
+        latency = signal.lastTransmitted - signal.lastWritten
+        self.lastUrgentLatency = latency
+        self.urgentLatency.record(latency)
+        logger.info(f"Urgent write {signal.name} = {signal.newValue}: on the wire {latency / 1e3:.0f} us after the write")
+        # the send thread waits for the repeat of the write
+        self.scheduler.wake()
         
     def getMessage(self):
         """
         Get the next message from the message stack.
 
         Returns:
-            UART_Message: The next message from the message stack, or None if the stack is empty.
+            RxMessage: The next message from the message stack, or None if the stack is empty.
         """
-        if self.message_stack:
-            return self.message_stack.pop(0)
-        return None
+        return self.message_stack.get()
+    
+    def getMessages(self, maxCount: int = None) -> list:
+        """
+        Get all or up to maxCount messages from the message stack.
+
+        Args:
+            maxCount (int, optional): The maximum number of messages. Defaults to all.
+
+        Returns:
+            list: The messages in receive order, empty if the stack is empty.
+        """
+        return self.message_stack.getMessages(maxCount)
     
     def addCyclicSend(self, message: UART_Message, interval: int) -> None:
         """
@@ -235,12 +410,42 @@ class UartHelper:
             message (UART_Message): The UART message to send cyclically.
             interval (int): The interval in milliseconds between each send.
         """
-        self._stop_cyclic_send()
         cyclic = CyclicSend(deepcopy(message), interval)
-        self._cyclicSend.append(cyclic)
-        self._start_cyclic_send()
+        self.scheduler.addCyclicSend(cyclic)
         logger.debug(f"Added cyclic send: {cyclic}")
     
+    def rescheduleSignals(self, degrade: bool = True) -> list:
+        """
+        Apply changed cyclic and cycleTime settings of the signals, all cyclic signals are requested immediately.
+
+        Args:
+            degrade (bool): Slow down low priority signals if the link budget is exceeded. Defaults to True.
+
+        Returns:
+            list: (signal, old cycleTime, new cycleTime) of every slowed down signal.
+        """
+        changes = self.linkBudget.admit(self._uartSignals) if degrade else []
+        self.scheduler.scheduleSignals(self._uartSignals)
+        return changes
+    
+    def startCapture(self, path: str) -> None:
+        """
+        Start recording the raw serial traffic to a capture file.
+
+        Args:
+            path (str): The path of the capture file.
+        """
+        self.stopCapture()
+        self.recorder = CaptureRecorder(path)
+    
+    def stopCapture(self) -> None:
+        """
+        Stop recording the raw serial traffic.
+        """
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+    
     def _start_reading(self) -> None:
         """
         Start the reading thread.
@@ -249,6 +454,8 @@ class UartHelper:
             logger.error("Serial port is not open")
             return
         self.reading = True
+        self.rxFrames = 0
+        self.rxFinished.clear()
         self._read_thread = threading.Thread(target=self._read_from_port)
         self._read_thread.start()
     
@@ -258,6 +465,9 @@ class UartHelper:
         """
         self.reading = False
         if self._read_thread.is_alive():
+            if self.ser.is_open:
+                # wake up a reader blocked in ser.read()
+                self.ser.cancel_read()
             self._read_thread.join()
     
     def _start_cyclic_send(self) -> None:
@@ -268,84 +478,174 @@ class UartHelper:
             logger.error("Serial port is not open")
             return
         self.isSending = True
+        for signal in self._uartSignals:
+            signal.setWriteListener(self._notifyWrite)
+        self.scheduler.scheduleSignals(self._uartSignals)
         self._cyclicSendThread = threading.Thread(target=self._send_cyclic)
         self._cyclicSendThread.start()
         
+    def _notifyWrite(self, signal: Signale) -> None:
+        if signal.urgent:
+            self.sendUrgent(signal)
+        else:
+            self.scheduler.notifyWrite(signal)
+    
     def _stop_cyclic_send(self) -> None:
         """
         Stop the cyclic send thread.
         """
         self.isSending = False
         if self._cyclicSendThread.is_alive():
+            self.scheduler.wake()
             self._cyclicSendThread.join()
             
-    def _updateSignals(self) -> None:
+    def readAllSignals(self, onComplete=None) -> ParameterReadout:
         """
-        Update the signals by sending read requests.
+        Read all signals from the MCU with a pipelined readout.
+
+        Args:
+            onComplete (callable, optional): Called with the readout when all signals were answered or failed.
+
+        Returns:
+            ParameterReadout: The running readout, None if the port is not open.
         """
         if not self.ser.is_open:
             logger.error("Serial port is not open")
-            return
-        for signal in self._uartSignals:
-            message = UART_Message(type=MSG_Type.READ_REQUEST, index=signal.index)
-            signal.lastTransmitted = time.time_ns()
-            self.send(message)
-            time.sleep(0.01)
+            return None
+        self._stop_readout()
+        readout = ParameterReadout(self.sendBatch, self._uartSignals, window=self._readoutWindow,
+                                   timeout=self._readoutTimeout, retries=self._readoutRetries,
+                                   onComplete=onComplete, checksum=self.checksum)
+        self.readout = readout
+        readout.start()
+        return readout
+    
+    def _stop_readout(self) -> None:
+        """
+        Stop a running parameter readout.
+        """
+        if self.readout is not None:
+            self.readout.cancel()
     
     def _read_from_port(self) -> None:
         """
         Read data from the serial port.
         """
-        frame_size = len(self.rxMessage)
+        frame_size = FRAME_SIZE
         self.ser.reset_input_buffer()
-        append = self.message_stack.append
-        buffer = bytearray()
-        message = UART_Message_Frame()
+        putMany = self.message_stack.putMany
+        decode = self._decode
+        decoder = FrameDecoder(self.checksum, self._uartSignals.catalogue.validIds)
+        ring = self.rxBuffer
+        ring.clear()
         while self.reading:
-            if self.ser.in_waiting > 0:
-                data = self.ser.read(self.ser.in_waiting)
-                buffer += data
-
-                while len(buffer) >= frame_size:
-                    start_index = buffer.find(0x3A)
-                    if start_index == -1:
-                        break
-
-                    end_index = start_index + frame_size
-                    if end_index > len(buffer):
-                        break
-
-                    frame_data = buffer[start_index:end_index]
-                    try:
-                        message.decode(frame_data)
-                        logging.debug(f"Frame: {message}")
-                    except Exception as e:
-                        logger.error(f"Error unpacking frame: {e}")
-
-                    if message.isValide():
-                        append(deepcopy(message.message))
-                        buffer = buffer[end_index:]
-                    else:
-                        logging.debug("Invalid frame")
-                        buffer = buffer[start_index+1:]
+            if self.blockingRead:
+                # block until at least one frame arrived, then drain the rest
+                waiting = max(frame_size - len(ring), self.ser.in_waiting)
+            else:
+                waiting = self.ser.in_waiting
+            if waiting > 0:
+                messages = decode(decoder, ring.readFrom(self.ser, waiting))
+                if messages:
+                    putMany(messages)
+            self._checkFinished()
+
+    def _checkFinished(self) -> None:
+        """
+        Set rxFinished when the transport has no data left, called after the read data was handed on.
+        """
+        # a serial port never finishes, a replay has no data left after its last read
+        finished = getattr(self.ser, "isFinished", None)
+        if finished is not None and not self.rxFinished.is_set() and finished():
+            self.rxFinished.set()
+
+    def _decode(self, decoder: FrameDecoder, read: int) -> list:
+        """
+        Decode the frames in the receive buffer after new data was read into it.
+
+        The responses are passed to the latency tracker, the write tracker and a running readout.
+
+        Args:
+            decoder (FrameDecoder): The decoder of the reader.
+            read (int): The number of bytes just read into the receive buffer.
+
+        Returns:
+            list: The decoded messages, empty if no complete frame is buffered.
+        """
+        ring = self.rxBuffer
+        recorder = self.recorder
+        if recorder is not None and read:
+            recorder.record(DIRECTION_RX, ring.data()[len(ring) - read:])
+        if len(ring) < FRAME_SIZE:
+            return []
+        frames = decoder.decode(ring.data())
+        ring.consume(frames.consumed, frames.discarded)
+        if frames.discarded:
+            logger.debug(f"Discarded {frames.discarded} bytes")
+        messages = frames.messages(time.time_ns())
+        self.rxFrames += len(messages)
+        responseReceived = self.latency.responseReceived
+        writeResponse = self.writes.responseReceived
+        readout = self.readout
+        RESPONSE = MSG_Type.RESPONSE
+        for message in messages:
+            if message.type == RESPONSE:
+                responseReceived(message.index, message.rxTimestamp)
+                writeResponse(message.index, message.getPayloadSigned())
+                if readout is not None:
+                    readout.responseReceived(message.index)
+        return messages
     
     def _send_cyclic(self) -> None:
         """
-        Send cyclic messages.
+        Send the written values and the due cyclic messages, sleeps until the next deadline.
         """
-        send = self.send
-        time_ns = time.time_ns
+        wait = self.scheduler.wait
+        writes = self.writes
         while self.isSending:
-            current_time = time_ns()
-            for signal in self._uartSignals:
-                if signal.valueWritten:
-                    msg = UART_Message(type=MSG_Type.WRITE_REQUEST, index=signal.index)
-                    msg.setPayloadSigned(signal.getRaw())
-                    signal.valueWritten = False
-                    signal.lastTransmitted = current_time
-                    send(msg)
-                elif signal.cyclic and signal.lastTransmitted + (signal.cycleTime * 1000000) < current_time:
-                    msg = UART_Message(type=MSG_Type.READ_REQUEST, index=signal.index)
-                    signal.lastTransmitted = current_time
-                    send(msg)
-            time.sleep(0.002)
\ No newline at end of file
+            written, due = wait(writes.nextDeadline())
+            self._transmit(written, due)
+
+    def _transmit(self, written: list, due: list) -> None:
+        """
+        Send the written values, the repeated writes and the due cyclic messages.
+        All frames are sent with a single write. Unacknowledged writes are repeated
+        and cyclic reads of a signal pause until its write is acknowledged.
+
+        Args:
+            written (list): The written signals from the scheduler.
+            due (list): The due ScheduledJobs from the scheduler.
+        """
+        sendBatch = self.sendBatch
+        batch = self.txBatch
+        writes = self.writes
+        outstanding = self.latency.outstanding
+
+        def add(message):
+            if not batch.add(message):
+                sendBatch(batch)
+                batch.add(message)
+
+        current_time = time.time_ns()
+        for signal in written:
+            if signal.valueWritten:
+                msg = UART_Message(type=MSG_Type.WRITE_REQUEST, index=signal.index)
+                msg.setPayloadSigned(signal.getRaw())
+                signal.valueWritten = False
+                signal.lastTransmitted = current_time
+                writes.started(signal.index, msg.getPayloadSigned(), outstanding(signal.index))
+                add(msg)
+        for transaction in writes.due(time.monotonic_ns(), outstanding):
+            add(UART_Message(type=MSG_Type.WRITE_REQUEST, index=transaction.index, payload=transaction.payload))
+        for job in due:
+            if job.signal is not None:
+                if writes.isPending(job.signal.index):
+                    continue
+                job.signal.lastTransmitted = current_time
+                if not batch.addReadRequest(job.signal.index):
+                    sendBatch(batch)
+                    batch.addReadRequest(job.signal.index)
+            else:
+                job.cyclicSend.lastSend = current_time
+                add(job.cyclicSend.message)
+        sendBatch(batch)
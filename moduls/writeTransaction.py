@@ -0,0 +1,191 @@
+""" writeTransaction.py
+
+This module tracks the WRITE_REQUESTs until the MCU acknowledges them.
+The MCU answers every request of an index in order, so the RESPONSE to a write
+is the first response of its index after all requests which were already
+outstanding when the write was sent. A response which echoes the written value
+acknowledges the write as well, so lost responses to earlier requests do not
+delay the acknowledgement. Writes without a response are repeated with an
+increasing timeout and marked as failed after the last retry.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+__version__ = "0.0.2"
+
+import threading
+import time
+import logging
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class WriteState(Enum):
+    """Enum for the state of the last write of a signal.
+    """
+    PENDING = 0
+    ACKED = 1
+    FAILED = 2
+
+
+class WriteTransaction:
+    """
+    The outstanding write of one signal.
+
+    Attributes:
+        index (MSG_INDEX_PARAM): The index of the written signal.
+        payload (int): The signed payload of the write.
+        state (WriteState): The state of the write.
+        attempts (int): The number of sent WRITE_REQUESTs.
+        deadline (int): The monotonic time in ns when the write is repeated.
+        ahead (int): The number of responses which belong to earlier requests.
+    """
+    __slots__ = ("index", "payload", "state", "attempts", "deadline", "ahead")
+
+    def __init__(self, index, payload: int) -> None:
+        self.index = index
+        self.payload = payload
+        self.state = WriteState.PENDING
+        self.attempts = 0
+        self.deadline = 0
+        self.ahead = 0
+
+
+class WriteTracker:
+    """
+    Tracks the outstanding writes per index and repeats them on timeout.
+
+    Attributes:
+        timeout (float): Seconds until the first repetition.
+        backoff (float): The factor of the timeout per repetition.
+        retries (int): The number of repetitions before a write has failed.
+        transactions (dict): The last WriteTransaction per index.
+        retransmitted (int): The number of repeated writes.
+
+    Methods:
+        started(index, payload, outstanding): Registers a sent write.
+        responseReceived(index, payload): Acknowledges the write if the response belongs to it.
+        isPending(index) -> bool: Checks if a write of the index is not acknowledged yet.
+        state(index) -> WriteState: Returns the state of the last write of an index.
+        nextDeadline() -> int: Returns the earliest repetition time.
+        due(now, outstanding) -> list: Returns the writes to repeat now.
+        clear(): Forgets all writes.
+    """
+
+    def __init__(self, timeout: float = 0.1, backoff: float = 2.0, retries: int = 3) -> None:
+        """
+        Initialize the WriteTracker class.
+
+        Args:
+            timeout (float): Seconds until the first repetition. Defaults to 0.1.
+            backoff (float): The factor of the timeout per repetition. Defaults to 2.
+            retries (int): The number of repetitions. Defaults to 3.
+        """
+        self.timeout = timeout
+        self.backoff = backoff
+        self.retries = retries
+        self.transactions = {}
+        self.retransmitted = 0
+        self._lock = threading.Lock()
+
+    def _sent(self, transaction: WriteTransaction, outstanding: int, now: int) -> None:
+        # requests of this write which are still unanswered do not come before it
+        transaction.ahead = max(outstanding - transaction.attempts, 0)
+        transaction.attempts += 1
+        transaction.deadline = now + int(self.timeout * self.backoff ** (transaction.attempts - 1) * 1e9)
+
+    def started(self, index, payload: int, outstanding: int = 0) -> None:
+        """Registers a sent write, an older write of the same index is replaced.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the written signal.
+            payload (int): The signed payload of the write.
+            outstanding (int): The number of unanswered requests of the index before this write.
+        """
+        transaction = WriteTransaction(index, payload)
+        with self._lock:
+            self._sent(transaction, outstanding, time.monotonic_ns())
+            self.transactions[index] = transaction
+
+    def responseReceived(self, index, payload: int = None) -> None:
+        """Acknowledges the write of the index if the response belongs to it.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the received RESPONSE.
+            payload (int, optional): The signed payload of the RESPONSE.
+        """
+        with self._lock:
+            transaction = self.transactions.get(index)
+            if transaction is None or transaction.state != WriteState.PENDING:
+                return
+            if transaction.ahead and payload != transaction.payload:
+                transaction.ahead -= 1
+                return
+            transaction.state = WriteState.ACKED
+
+    def isPending(self, index) -> bool:
+        """Checks if a write of the index is not acknowledged yet.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the signal.
+
+        Returns:
+            bool: True if the last write is pending.
+        """
+        transaction = self.transactions.get(index)
+        return transaction is not None and transaction.state == WriteState.PENDING
+
+    def state(self, index) -> WriteState | None:
+        """Returns the state of the last write of an index.
+
+        Args:
+            index (MSG_INDEX_PARAM): The index of the signal.
+
+        Returns:
+            WriteState | None: The state, None if the signal was never written.
+        """
+        transaction = self.transactions.get(index)
+        return transaction.state if transaction is not None else None
+
+    def nextDeadline(self) -> int | None:
+        """Returns the earliest repetition time.
+
+        Returns:
+            int | None: The monotonic time in ns, None if no write is pending.
+        """
+        with self._lock:
+            deadlines = [transaction.deadline for transaction in self.transactions.values()
+                         if transaction.state == WriteState.PENDING]
+        return min(deadlines) if deadlines else None
+
+    def due(self, now: int, outstanding) -> list:
+        """Returns the writes to repeat now, writes without retries left are marked as failed.
+
+        Args:
+            now (int): The current monotonic time in ns.
+            outstanding (callable): Returns the number of unanswered requests of an index.
+
+        Returns:
+            list: The WriteTransactions to send again.
+        """
+        repeat = []
+        with self._lock:
+            for transaction in self.transactions.values():
+                if transaction.state != WriteState.PENDING or transaction.deadline > now:
+                    continue
+                if transaction.attempts > self.retries:
+                    transaction.state = WriteState.FAILED
+                    logger.warning(f"Write of {transaction.index} failed after {transaction.attempts} attempts")
+                    continue
+                self._sent(transaction, outstanding(transaction.index), now)
+                self.retransmitted += 1
+                repeat.append(transaction)
+        return repeat
+
+    def clear(self) -> None:
+        """Forgets all writes.
+        """
+        with self._lock:
+            self.transactions.clear()
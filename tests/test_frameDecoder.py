@@ -0,0 +1,116 @@
+""" test_frameDecoder.py
+
+Tests that the FrameDecoder finds exactly the messages of the per frame
+receive path of UartHelper._read_from_port() before the batch decoder, below
+and above the size where it switches from the frame by frame scan to NumPy.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+import random
+import pytest
+from moduls.frameDecoder import FrameDecoder, FRAME_SIZE
+from moduls.checksum import XorChecksum
+from moduls.uartDefines import UART_Message_Frame, MESSAGE_ID_TABLE
+
+_START_BYTE = UART_Message_Frame._start_byte_Default
+_END_BYTE = UART_Message_Frame._end_byte_Default
+_EOL = UART_Message_Frame._eol_Default
+_VALID_IDS = [id for id, (_, _, valid) in enumerate(MESSAGE_ID_TABLE) if valid]
+_INVALID_IDS = [id for id, (_, _, valid) in enumerate(MESSAGE_ID_TABLE) if not valid]
+
+
+def _perFrame(buffer: bytearray) -> tuple:
+    """The receive loop of _read_from_port() before the FrameDecoder.
+
+    Returns:
+        tuple: The (type, index, payload) per valid frame and the bytes kept for the next read.
+    """
+    messages = []
+    while len(buffer) >= FRAME_SIZE:
+        start_index = buffer.find(_START_BYTE)
+        if start_index == -1:
+            break
+        end_index = start_index + FRAME_SIZE
+        if end_index > len(buffer):
+            break
+        # the checks of UART_Message_Frame.isValide() of the baseline, the EOL byte is not checked
+        start, id, high, low, crc, end, _ = buffer[start_index:end_index]
+        msgType, index, valid = MESSAGE_ID_TABLE[id]
+        if start == _START_BYTE and end == _END_BYTE and crc == id ^ high ^ low and valid:
+            messages.append((msgType, index, (high << 8) | low))
+            buffer = buffer[end_index:]
+        else:
+            buffer = buffer[start_index + 1:]
+    return messages, bytes(buffer)
+
+
+def _decode(decoder: FrameDecoder, data: bytes) -> tuple:
+    frames = decoder.decode(data)
+    messages = [(message.type, message.index, message.payload) for message in frames.messages()]
+    return messages, data[frames.consumed:]
+
+
+def _frame(rand: random.Random, id: int) -> bytearray:
+    """A correct frame with a random payload, also for IDs without a message."""
+    payload = rand.randrange(0x10000)
+    raw = bytes((id, payload >> 8, payload & 0xFF))
+    return bytearray((_START_BYTE, *raw, XorChecksum().compute(raw), _END_BYTE, _EOL))
+
+
+def _stream(rand: random.Random, count: int) -> bytes:
+    """Valid frames mixed with garbage, bad checksums, bad framing, unknown IDs and split frames."""
+    data = bytearray()
+    for _ in range(count):
+        kind = rand.random()
+        frame = _frame(rand, rand.choice(_VALID_IDS))
+        if kind < 0.1:
+            frame[4] ^= 1 << rand.randrange(8)
+        elif kind < 0.15:
+            frame[6] = rand.randrange(256)
+        elif kind < 0.2:
+            frame[5] = rand.randrange(256)
+        elif kind < 0.25:
+            frame = _frame(rand, rand.choice(_INVALID_IDS))
+        elif kind < 0.35:
+            # garbage, often with start bytes in it
+            frame = bytearray(rand.choice((_START_BYTE, rand.randrange(256))) for _ in range(rand.randrange(1, 12)))
+        elif kind < 0.4:
+            # a frame cut off by a lost byte
+            del frame[rand.randrange(1, FRAME_SIZE)]
+        data += frame
+    # end with a partial frame
+    return bytes(data + _frame(rand, rand.choice(_VALID_IDS))[:rand.randrange(FRAME_SIZE)])
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 5, 12, 23, 30, 64, 200])
+def test_same_messages_as_per_frame_path(count):
+    rand = random.Random(count)
+    decoder = FrameDecoder()
+    for _ in range(50):
+        data = _stream(rand, count)
+        expected, leftover = _perFrame(bytearray(data))
+        messages, pending = _decode(decoder, data)
+        assert messages == expected
+        # the per frame path also kept the bytes before the first start byte, they never start a frame
+        start = leftover.find(_START_BYTE)
+        assert pending == (leftover[start:] if start >= 0 else b"")
+
+
+def test_same_messages_in_chunks():
+    rand = random.Random(1)
+    data = _stream(rand, 2000)
+    decoder = FrameDecoder()
+    expected, _ = _perFrame(bytearray(data))
+    messages = []
+    buffer = b""
+    position = 0
+    while position < len(data):
+        # short reads take the frame by frame scan, long reads the NumPy path
+        size = rand.choice((1, 3, FRAME_SIZE, 40, 300, 1000))
+        buffer += data[position:position + size]
+        position += size
+        decoded, buffer = _decode(decoder, buffer)
+        messages += decoded
+    assert messages == expected
@@ -0,0 +1,42 @@
+""" test_mcuSimulator.py
+
+Tests of the fault statuses of the MCU simulator, without a pseudo terminal.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+import argparse
+import pytest
+from moduls.mcuSimulator import McuSimulator, _parseFault
+from moduls.uartDefines import MSG_INDEX_PARAM, MSG_INDEX_STATUS
+
+
+def test_parse_fault():
+    assert _parseFault("STOP_OVER_TEMP@5s") == (5.0, MSG_INDEX_STATUS.STOP_OVER_TEMP, 0)
+    assert _parseFault("status_error=0x3@0.5") == (0.5, MSG_INDEX_STATUS.STATUS_ERROR, 3)
+    for text in ("STOP_OVER_TEMP", "UNKNOWN@1", "STOP_OVER_TEMP@later"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            _parseFault(text)
+
+
+def test_stop_status_drops_enable():
+    simulator = McuSimulator()
+    simulator.registers[MSG_INDEX_PARAM.VALUE_ENABLE] = 1
+    simulator.fault(MSG_INDEX_STATUS.STATUS_ERROR, 3)
+    assert simulator.registers[MSG_INDEX_PARAM.VALUE_ENABLE] == 1
+    simulator.fault(MSG_INDEX_STATUS.STOP_OVER_TEMP)
+    assert simulator.registers[MSG_INDEX_PARAM.VALUE_ENABLE] == 0
+    assert len(simulator._outgoing) == 2
+
+
+def test_over_current_stops_the_inverter():
+    simulator = McuSimulator(amplitude=5.0, overCurrent=2.0)
+    simulator.registers[MSG_INDEX_PARAM.VALUE_ENABLE] = 1
+    simulator.registers[MSG_INDEX_PARAM.VALUE_PWM] = 20
+    simulator._readRegister(MSG_INDEX_PARAM.VALUE_CURRENT_A)
+    assert simulator.registers[MSG_INDEX_PARAM.VALUE_ENABLE] == 1
+    simulator.registers[MSG_INDEX_PARAM.VALUE_PWM] = 80
+    assert simulator._readRegister(MSG_INDEX_PARAM.VALUE_CURRENT_A) == 0
+    assert simulator.registers[MSG_INDEX_PARAM.VALUE_ENABLE] == 0
+    assert len(simulator._outgoing) == 1
@@ -0,0 +1,47 @@
+""" test_requestScheduler.py
+
+Tests that the statistics of the RequestScheduler only list the signals which
+are polled cyclically.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+import time
+from moduls.dataClasses import UARTSignals
+from moduls.requestScheduler import RequestScheduler
+
+
+def _cyclic(signals) -> set:
+    return {signal.index for signal in signals if signal.cyclic}
+
+
+def test_non_cyclic_job_is_removed_when_due():
+    signals = UARTSignals()
+    scheduler = RequestScheduler()
+    signals.rpm.cyclic = True
+    signals.rpm.cycleTime = 1
+    scheduler.scheduleSignals(signals)
+    assert set(scheduler.jobs) == _cyclic(signals)
+    _, due, _ = scheduler.poll()
+    assert signals.rpm.index in {job.signal.index for job in due}
+
+    signals.rpm.cyclic = False
+    time.sleep(0.005)
+    _, due, _ = scheduler.poll()
+    assert signals.rpm.index not in {job.signal.index for job in due}
+    assert signals.rpm.index not in scheduler.jobs
+    assert signals.rpm.name not in scheduler.statistics()
+
+
+def test_reschedule_drops_non_cyclic_signals():
+    signals = UARTSignals()
+    scheduler = RequestScheduler()
+    for signal in signals:
+        signal.cyclic = True
+    scheduler.scheduleSignals(signals)
+    signals.rpm.cyclic = False
+    signals.pwm.cyclic = False
+    scheduler.scheduleSignals(signals)
+    assert set(scheduler.jobs) == _cyclic(signals)
+    assert signals.rpm.name not in scheduler.statistics()
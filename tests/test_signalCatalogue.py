@@ -0,0 +1,83 @@
+""" test_signalCatalogue.py
+
+Tests of the signal catalogue with a parameter index which has no
+MSG_INDEX_PARAM member, the case of a newer firmware, and of the TOML
+catalogues, which need a TOML parser only when they are loaded.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+import sys
+import json
+import pytest
+from moduls.app import App
+from moduls.signalCatalogue import SignalCatalogue, DEFAULT_CATALOGUE
+from moduls.frameDecoder import FrameDecoder
+from moduls.uartDefines import UART_Message, UART_Message_Frame, MSG_Type, MSG_INDEX_PARAM
+
+
+def _catalogue(tmp_path) -> str:
+    with open(DEFAULT_CATALOGUE, "r", encoding="utf-8") as file:
+        signals = json.load(file)["signals"]
+    signals.append({"key": "new_param", "name": "New Param", "index": 20, "unite": "V", "factor": 0.5})
+    path = tmp_path / "signals.json"
+    path.write_text(json.dumps({"signals": signals}), encoding="utf-8")
+    return str(path)
+
+
+def test_unknown_index_is_decoded_and_dispatched(tmp_path):
+    app = App(headless=True, signals=_catalogue(tmp_path))
+    try:
+        signals = app._SystemData.uartSignals
+        assert not isinstance(signals.new_param.index, MSG_INDEX_PARAM)
+        frame = UART_Message_Frame(UART_Message(type=MSG_Type.RESPONSE, index=20, payload=10)).encode()
+
+        # the default IDs drop the frame, the IDs of the catalogue accept it
+        assert len(FrameDecoder().decode(frame)) == 0
+        messages = FrameDecoder(validIds=signals.catalogue.validIds).decode(frame).messages(rxTimestamp=1)
+        assert len(messages) == 1
+        assert messages[0].index == 20
+        assert "index: 0x14" in str(messages[0])
+
+        app.handleMessages(messages)
+        assert signals.new_param.value == 5.0
+        assert signals.byIndex(20) is signals.new_param
+    finally:
+        app.cleanUp()
+
+
+def test_catalogue_without_gui_signal_is_rejected(tmp_path):
+    with open(DEFAULT_CATALOGUE, "r", encoding="utf-8") as file:
+        signals = [signal for signal in json.load(file)["signals"] if signal["key"] != "rpm"]
+    path = tmp_path / "signals.json"
+    path.write_text(json.dumps({"signals": signals}), encoding="utf-8")
+    with pytest.raises(ValueError, match="rpm"):
+        App(headless=True, signals=str(path))
+
+
+_TOML = """
+[[signals]]
+key = "rpm"
+name = "RPM"
+index = 7
+factor = 1
+"""
+
+
+def test_toml_catalogue(tmp_path):
+    path = tmp_path / "signals.toml"
+    path.write_text(_TOML, encoding="utf-8")
+    catalogue = SignalCatalogue.load(str(path))
+    assert [key for key, _ in catalogue.definitions] == ["rpm"]
+
+
+def test_toml_catalogue_without_parser(tmp_path, monkeypatch):
+    # Python 3.10 without tomli, a JSON catalogue does not need a TOML parser
+    monkeypatch.setitem(sys.modules, "tomllib", None)
+    monkeypatch.setitem(sys.modules, "tomli", None)
+    path = tmp_path / "signals.toml"
+    path.write_text(_TOML, encoding="utf-8")
+    with pytest.raises(ImportError, match="tomli"):
+        SignalCatalogue.load(str(path))
+    assert SignalCatalogue.load(DEFAULT_CATALOGUE).definitions
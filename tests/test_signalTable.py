@@ -0,0 +1,28 @@
+""" test_signalTable.py
+
+Tests of the SignalTable, the per row and the vectorized path of a received
+batch must store the same values and receive times.
+
+@Author: Philipp Eilmann
+@copyright: 2025 Philipp Eilmann
+"""
+
+import pytest
+from moduls.dataClasses import UARTSignals
+from moduls.uartDefines import RxMessage, MSG_Type, MSG_INDEX_PARAM
+
+
+@pytest.mark.parametrize("repeat", [1, 20])
+def test_last_receive_time_per_row(repeat):
+    signals = UARTSignals()
+    table = signals.table
+    messages = []
+    for number in range(repeat):
+        messages.append(RxMessage(MSG_Type.RESPONSE, MSG_INDEX_PARAM.VALUE_RPM, 100 + number, 1000 + number))
+        messages.append(RxMessage(MSG_Type.RESPONSE, MSG_INDEX_PARAM.VALUE_PWM, 10, 5000 + number))
+    assert (len(messages) >= table._vectorThreshold) == (repeat > 1)
+    assert table.applyMessages(messages) == 2
+    assert signals.rpm.value == 100 + repeat - 1
+    assert signals.rpm.lastReceived == 1000 + repeat - 1
+    assert signals.pwm.lastReceived == 5000 + repeat - 1
+    assert signals.bat_voltage.lastReceived == 0